@@ -0,0 +1,2 @@
+# Raiz dos testes (pytest a partir deste diretório): o pytest põe este
+# diretório no sys.path, então o pacote mrdca é importado da própria árvore
@@ -0,0 +1,51 @@
+"""
+Implementação vetorizada do algoritmo MRDCA-RWL.
+"""
+from .backends import CondensedViews, DenseViews, as_backend, precision_report
+from .engine import (
+    assign_objects,
+    cluster_members,
+    clusters_to_labels,
+    compute_lambdas,
+    fit,
+    labels_to_clusters,
+    normalize_lambdas,
+    product_one_lambdas,
+    stack_views,
+)
+from .kmeans import fit_kmeans
+from .lazy import LazyViews
+from .minibatch import fit_minibatch
+from .model import FittedModel
+from .outofcore import MemmapViews, memory_report, peak_rss_mb
+from .partition import Partition
+from .telemetry import Recorder, stop_when
+from .views import ViewSpec, build_views
+
+__all__ = [
+    'CondensedViews',
+    'DenseViews',
+    'FittedModel',
+    'LazyViews',
+    'MemmapViews',
+    'Partition',
+    'Recorder',
+    'ViewSpec',
+    'as_backend',
+    'assign_objects',
+    'build_views',
+    'cluster_members',
+    'clusters_to_labels',
+    'compute_lambdas',
+    'fit',
+    'fit_kmeans',
+    'fit_minibatch',
+    'labels_to_clusters',
+    'memory_report',
+    'normalize_lambdas',
+    'peak_rss_mb',
+    'precision_report',
+    'product_one_lambdas',
+    'stack_views',
+    'stop_when',
+]
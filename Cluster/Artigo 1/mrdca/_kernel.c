@@ -0,0 +1,91 @@
+/*
+ * Núcleo compilado do MRDCA-RWL (pesos lambda, alocação e medoides).
+ *
+ * Generaliza calculate_lambda de "Artigo 1.c" / calculateLambda de
+ * Artigo1.cpp para n, p e K arbitrários sobre os buffers NumPy das visões,
+ * com OpenMP sobre os objetos. Carregado por mrdca/kernel.py via ctypes;
+ * compilar com:
+ *
+ *     cc -O3 -fopenmp -shared -fPIC -o _kernel.so _kernel.c
+ */
+#include <math.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#define REAL double
+#define SUFFIX f64
+#include "_kernel_impl.h"
+#undef REAL
+#undef SUFFIX
+
+#define REAL float
+#define SUFFIX f32
+#include "_kernel_impl.h"
+#undef REAL
+#undef SUFFIX
+
+/*
+ * Medoide ponderado de cada cluster a partir das somas (p, n, K):
+ * argmin_{i em C_k} soma_j lambda_kj * sums[j, i, k], com o menor índice
+ * em caso de empate. Clusters vazios ficam com protótipo 0 e custo 0.
+ */
+void select_medoids(const double *sums, int64_t p, int64_t n, const int64_t *labels,
+                    int64_t n_clusters, const double *lambdas,
+                    int64_t *prototypes, double *costs) {
+    double *scores = malloc(sizeof(double) * n);
+    #pragma omp parallel for schedule(static)
+    for (int64_t i = 0; i < n; ++i) {
+        int64_t k = labels[i];
+        double score = 0.0;
+        for (int64_t j = 0; j < p; ++j) {
+            score += lambdas[k * p + j] * sums[(j * n + i) * n_clusters + k];
+        }
+        scores[i] = score;
+    }
+
+    for (int64_t k = 0; k < n_clusters; ++k) {
+        prototypes[k] = -1;
+        costs[k] = 0.0;
+    }
+    for (int64_t i = 0; i < n; ++i) {
+        int64_t k = labels[i];
+        if (prototypes[k] < 0 || scores[i] < costs[k]) {
+            prototypes[k] = i;
+            costs[k] = scores[i];
+        }
+    }
+    for (int64_t k = 0; k < n_clusters; ++k) {
+        if (prototypes[k] < 0) {
+            prototypes[k] = 0;
+        }
+    }
+    free(scores);
+}
+
+/* Limita as threads das próximas regiões paralelas (processos de um pool) */
+void set_kernel_threads(int threads) {
+#ifdef _OPENMP
+    omp_set_num_threads(threads > 0 ? threads : 1);
+#else
+    (void)threads;
+#endif
+}
+
+/* Threads usadas pelo OpenMP (1 se compilado sem OpenMP) */
+int kernel_threads(void) {
+#ifdef _OPENMP
+    int threads = 1;
+    #pragma omp parallel
+    {
+        #pragma omp single
+        threads = omp_get_num_threads();
+    }
+    return threads;
+#else
+    return 1;
+#endif
+}
@@ -0,0 +1,95 @@
+/*
+ * Passos do MRDCA-RWL para um tipo de visão (incluído por _kernel.c com
+ * REAL = double/float e SUFFIX = f64/f32).
+ *
+ * As visões são p matrizes n x n contíguas e simétricas, passadas como um
+ * vetor de ponteiros para os buffers NumPy (sem cópia). A coluna de um
+ * objeto é lida como a linha correspondente, em acesso contíguo.
+ */
+
+#define CONCAT_(name, suffix) name##_##suffix
+#define CONCAT(name, suffix) CONCAT_(name, suffix)
+
+/* T[k, j] = soma_{i em C_k} d_j(i, g_k) */
+void CONCAT(cluster_totals, SUFFIX)(const REAL **views, int64_t p, int64_t n,
+                                    const int64_t *labels, const int64_t *prototypes,
+                                    int64_t n_clusters, double *totals) {
+    memset(totals, 0, sizeof(double) * n_clusters * p);
+    #pragma omp parallel
+    {
+        double *local = calloc(n_clusters * p, sizeof(double));
+        #pragma omp for schedule(static)
+        for (int64_t i = 0; i < n; ++i) {
+            int64_t k = labels[i];
+            for (int64_t j = 0; j < p; ++j) {
+                local[k * p + j] += views[j][prototypes[k] * n + i];
+            }
+        }
+        #pragma omp critical
+        for (int64_t t = 0; t < n_clusters * p; ++t) {
+            totals[t] += local[t];
+        }
+        free(local);
+    }
+}
+
+/* Cada objeto no protótipo de menor distância ponderada (primeiro em caso de empate) */
+void CONCAT(assign_objects, SUFFIX)(const REAL **views, int64_t p, int64_t n,
+                                    const int64_t *prototypes, int64_t n_clusters,
+                                    const double *lambdas, int64_t *labels) {
+    #pragma omp parallel for schedule(static)
+    for (int64_t i = 0; i < n; ++i) {
+        double best = INFINITY;
+        int64_t best_k = 0;
+        for (int64_t k = 0; k < n_clusters; ++k) {
+            double distance = 0.0;
+            for (int64_t j = 0; j < p; ++j) {
+                distance += lambdas[k * p + j] * views[j][prototypes[k] * n + i];
+            }
+            if (distance < best) {
+                best = distance;
+                best_k = k;
+            }
+        }
+        labels[i] = best_k;
+    }
+}
+
+/* sums[j, i, k] = soma_{o em C_k} d_j(i, o), uma passada por linha */
+void CONCAT(cluster_sums, SUFFIX)(const REAL **views, int64_t p, int64_t n,
+                                  const int64_t *labels, int64_t n_clusters, double *sums) {
+    #pragma omp parallel for schedule(static)
+    for (int64_t i = 0; i < n; ++i) {
+        for (int64_t j = 0; j < p; ++j) {
+            const REAL *row = views[j] + i * n;
+            double *out = sums + (j * n + i) * n_clusters;
+            for (int64_t k = 0; k < n_clusters; ++k) {
+                out[k] = 0.0;
+            }
+            for (int64_t o = 0; o < n; ++o) {
+                out[labels[o]] += row[o];
+            }
+        }
+    }
+}
+
+/* Move m objetos de old_labels para new_labels nas somas, O(p * n * m) */
+void CONCAT(update_sums, SUFFIX)(const REAL **views, int64_t p, int64_t n,
+                                 const int64_t *moved, int64_t m,
+                                 const int64_t *old_labels, const int64_t *new_labels,
+                                 int64_t n_clusters, double *sums) {
+    #pragma omp parallel for schedule(static)
+    for (int64_t i = 0; i < n; ++i) {
+        for (int64_t j = 0; j < p; ++j) {
+            double *out = sums + (j * n + i) * n_clusters;
+            for (int64_t t = 0; t < m; ++t) {
+                double value = views[j][moved[t] * n + i];
+                out[old_labels[moved[t]]] -= value;
+                out[new_labels[moved[t]]] += value;
+            }
+        }
+    }
+}
+
+#undef CONCAT
+#undef CONCAT_
@@ -0,0 +1,309 @@
+"""
+Armazenamento das visões de dissimilaridade para o MRDCA-RWL.
+
+O algoritmo só precisa de três operações sobre as visões: colunas de
+alguns objetos (protótipos e objetos que mudaram de cluster), blocos
+linhas x colunas (custos de medoides candidatos) e somas por cluster
+(visões multiplicadas pela matriz indicadora da partição). Cada backend
+implementa essas operações sobre um formato de armazenamento diferente:
+
+- DenseViews: matrizes n x n completas (float64, float32 ou uint16)
+- CondensedViews: só o triângulo superior, como scipy.spatial.distance.pdist
+  (metade da memória), também em float64, float32 ou uint16
+
+Em uint16 cada visão é quantizada com uma escala própria
+(valor = código * escala) e as contas são feitas em float32.
+precision_report mede quanto partições, critério e pesos se afastam da
+execução de referência em float64.
+"""
+import numpy as np
+
+PRECISIONS = (np.float64, np.float32, np.uint16)
+
+# Linhas processadas por vez ao expandir visões condensadas ou quantizadas
+TILE_ROWS = 256
+
+
+def quantize(matrix, dtype):
+    """
+    Converte uma visão para o tipo de armazenamento
+
+    Args:
+        matrix: Dissimilaridades (qualquer shape)
+        dtype: float64, float32 ou uint16
+
+    Returns:
+        Tupla (array armazenado, escala); a escala é 1 para tipos float
+    """
+    if dtype != np.uint16:
+        return np.asarray(matrix, dtype=dtype), 1.0
+    top = float(np.max(matrix)) if np.size(matrix) else 0.0
+    scale = top / np.iinfo(np.uint16).max if top > 0 else 1.0
+    return np.rint(np.asarray(matrix) / scale).astype(np.uint16), scale
+
+
+def condensed_index(rows, cols, n_objects):
+    """
+    Posição de d(i, j) no vetor condensado (triângulo superior sem diagonal)
+
+    Args:
+        rows: Índices i (com broadcasting)
+        cols: Índices j (com broadcasting)
+        n_objects: Número de objetos
+
+    Returns:
+        Tupla (posições, máscara da diagonal)
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    low = np.minimum(rows, cols)
+    high = np.maximum(rows, cols)
+    diagonal = low == high
+    index = low * n_objects - low * (low + 1) // 2 + (high - low - 1)
+    return np.where(diagonal, 0, index), diagonal
+
+
+class ViewBackend:
+    """
+    Interface comum dos backends de visões
+
+    Subclasses definem n_views, n_objects, scales, storage_dtype e
+    raw_block(view, rows, cols). incremental_sums indica se somas por
+    cluster sobre todas as linhas são baratas o bastante para a busca
+    incremental de medoides.
+    """
+
+    incremental_sums = True
+
+    @property
+    def dtype(self):
+        """Tipo usado nas contas (float32 para visões quantizadas)"""
+        return np.float32 if self.storage_dtype == np.uint16 else self.storage_dtype
+
+    @property
+    def shape(self):
+        return (self.n_views, self.n_objects, self.n_objects)
+
+    def decode(self, view, raw):
+        """Converte valores armazenados de uma visão em dissimilaridades"""
+        if self.storage_dtype != np.uint16:
+            return raw
+        return raw.astype(np.float32) * np.float32(self.scales[view])
+
+    def block(self, rows, cols):
+        """
+        Bloco de dissimilaridades em todas as visões
+
+        Args:
+            rows: Índices das linhas
+            cols: Índices das colunas
+
+        Returns:
+            Array (p, len(rows), len(cols))
+        """
+        return np.stack([self.decode(view, self.raw_block(view, rows, cols))
+                         for view in range(self.n_views)])
+
+    def columns(self, index):
+        """
+        Colunas de alguns objetos em todas as visões
+
+        Args:
+            index: Índices das colunas
+
+        Returns:
+            Array (p, n, len(index))
+        """
+        return self.block(np.arange(self.n_objects), index)
+
+    def cluster_sums(self, indicator):
+        """
+        Soma das dissimilaridades de cada objeto a cada cluster
+
+        Args:
+            indicator: Matriz indicadora da partição (n, K)
+
+        Returns:
+            Array float64 (p, n, K)
+        """
+        indicator = indicator.astype(self.dtype)
+        sums = np.empty((self.n_views, self.n_objects, indicator.shape[1]))
+        for start in range(0, self.n_objects, TILE_ROWS):
+            rows = np.arange(start, min(start + TILE_ROWS, self.n_objects))
+            # Visões simétricas: as linhas do bloco são as colunas transpostas
+            sums[:, rows, :] = self.columns(rows).transpose(0, 2, 1) @ indicator
+        return sums
+
+
+class DenseViews(ViewBackend):
+    """
+    Visões armazenadas como matrizes n x n completas
+
+    Args:
+        d_matrices: Lista de matrizes n x n ou array (p, n, n)
+        dtype: Tipo de armazenamento (float64, float32 ou uint16)
+    """
+
+    def __init__(self, d_matrices, dtype=np.float64):
+        self.storage_dtype = np.dtype(dtype).type
+        if self.storage_dtype not in PRECISIONS:
+            raise ValueError(f"Precisão não suportada: {dtype}")
+        self.views = []
+        self.scales = []
+        for matrix in d_matrices:
+            stored, scale = quantize(matrix, self.storage_dtype)
+            self.views.append(stored)
+            self.scales.append(scale)
+        self.n_views = len(self.views)
+        self.n_objects = self.views[0].shape[0]
+
+    @property
+    def nbytes(self):
+        return sum(view.nbytes for view in self.views)
+
+    def raw_block(self, view, rows, cols):
+        return self.views[view][np.ix_(rows, cols)]
+
+    def columns(self, index):
+        return np.stack([self.decode(view, matrix[:, index])
+                         for view, matrix in enumerate(self.views)])
+
+    def cluster_sums(self, indicator):
+        if self.storage_dtype == np.uint16:
+            return super().cluster_sums(indicator)
+        indicator = indicator.astype(self.dtype)
+        return np.stack([matrix @ indicator for matrix in self.views]).astype(np.float64)
+
+
+class CondensedViews(ViewBackend):
+    """
+    Visões armazenadas só pelo triângulo superior (n(n-1)/2 valores)
+
+    As métricas são simétricas e com diagonal nula, então a matriz
+    completa pode ser reconstruída sob demanda.
+
+    Args:
+        d_matrices: Lista de matrizes n x n (ou None com condensed)
+        dtype: Tipo de armazenamento (float64, float32 ou uint16)
+        condensed: Vetores já condensados (ex.: saída de pdist)
+    """
+
+    def __init__(self, d_matrices=None, dtype=np.float64, condensed=None):
+        self.storage_dtype = np.dtype(dtype).type
+        if self.storage_dtype not in PRECISIONS:
+            raise ValueError(f"Precisão não suportada: {dtype}")
+        if condensed is None:
+            condensed = (self.condense(matrix) for matrix in d_matrices)
+        self.views = []
+        self.scales = []
+        for vector in condensed:
+            stored, scale = quantize(vector, self.storage_dtype)
+            self.views.append(stored)
+            self.scales.append(scale)
+        self.n_views = len(self.views)
+        self.n_objects = int(round((1 + np.sqrt(1 + 8 * len(self.views[0]))) / 2))
+
+    @staticmethod
+    def condense(matrix):
+        """Extrai o triângulo superior linha a linha, sem índices auxiliares n^2"""
+        matrix = np.asarray(matrix)
+        n_objects = matrix.shape[0]
+        vector = np.empty(n_objects * (n_objects - 1) // 2, dtype=matrix.dtype)
+        start = 0
+        for row in range(n_objects - 1):
+            length = n_objects - row - 1
+            vector[start:start + length] = matrix[row, row + 1:]
+            start += length
+        return vector
+
+    @classmethod
+    def from_data(cls, data, metrics=('euclidean', 'cityblock'), dtype=np.float64):
+        """
+        Calcula as visões condensadas direto dos dados com pdist
+
+        Args:
+            data: Dados de entrada (n, d)
+            metrics: Métricas de cada visão
+            dtype: Tipo de armazenamento
+
+        Returns:
+            CondensedViews
+        """
+        from scipy.spatial.distance import pdist
+
+        # Gerador: cada visão é convertida antes de a próxima ser calculada
+        return cls(dtype=dtype, condensed=(pdist(data, metric=metric) for metric in metrics))
+
+    @property
+    def nbytes(self):
+        return sum(view.nbytes for view in self.views)
+
+    def raw_block(self, view, rows, cols):
+        index, diagonal = condensed_index(np.asarray(rows)[:, None],
+                                          np.asarray(cols)[None, :], self.n_objects)
+        values = self.views[view][index]
+        values[diagonal] = 0
+        return values
+
+
+def as_backend(d_matrices):
+    """
+    Garante um backend de visões (matrizes comuns viram DenseViews float64)
+
+    Args:
+        d_matrices: Backend, lista de matrizes n x n ou array (p, n, n)
+
+    Returns:
+        ViewBackend
+    """
+    if isinstance(d_matrices, ViewBackend):
+        return d_matrices
+    return DenseViews(d_matrices)
+
+
+def precision_report(d_matrices, n_clusters, backends, seeds=range(42, 52),
+                     true_labels=None, **fit_params):
+    """
+    Compara execuções em backends compactos com a referência em float64
+
+    Args:
+        d_matrices: Lista de matrizes de dissimilaridade (referência)
+        n_clusters: Número de clusters
+        backends: Dicionário nome -> ViewBackend a comparar
+        seeds: Seeds usadas em cada comparação
+        true_labels: Labels verdadeiros (opcional, para a variação do ARI)
+        **fit_params: Parâmetros repassados a engine.fit
+
+    Returns:
+        Dicionário nome -> estatísticas da diferença para float64
+    """
+    from sklearn.metrics import adjusted_rand_score
+
+    from .engine import fit
+
+    reference_views = DenseViews(d_matrices)
+    reference = {seed: fit(reference_views, n_clusters, random_state=seed, **fit_params)
+                 for seed in seeds}
+
+    report = {}
+    for name, backend in backends.items():
+        agreement, objective_gap, lambda_gap, ari_gap = [], [], [], []
+        for seed, (labels, lambdas, _, _, objectives) in reference.items():
+            result = fit(backend, n_clusters, random_state=seed, **fit_params)
+            agreement.append(adjusted_rand_score(labels, result[0]))
+            objective_gap.append(abs(result[4][-1] - objectives[-1]) / objectives[-1])
+            lambda_gap.append(np.abs(result[1] - lambdas).max())
+            if true_labels is not None:
+                ari_gap.append(adjusted_rand_score(true_labels, result[0])
+                               - adjusted_rand_score(true_labels, labels))
+        report[name] = {
+            'Memoria_MB': backend.nbytes / 2 ** 20,
+            'Memoria_Relativa': backend.nbytes / reference_views.nbytes,
+            'Particoes_Iguais': float(np.mean(np.isclose(agreement, 1.0))),
+            'ARI_vs_float64': float(np.mean(agreement)),
+            'Delta_Objetivo_Rel_Max': float(np.max(objective_gap)),
+            'Delta_Lambda_Max': float(np.max(lambda_gap)),
+        }
+        if true_labels is not None:
+            report[name]['Delta_ARI_Medio'] = float(np.mean(ari_gap))
+    return report
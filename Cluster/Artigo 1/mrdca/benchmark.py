@@ -0,0 +1,422 @@
+"""
+Benchmark reprodutível do MRDCA-RWL com relatório de escalonamento.
+
+Cada caso (Iris, Wine, Digits completo ou dados sintéticos multi-visão
+com n, p e K configuráveis) mede o tempo de cada fase em várias
+repetições com seeds fixas, sempre pelos pontos de entrada de
+mrdca.pipeline:
+
+- Dissimilaridades: create_dissimilarity_matrices com o cache vazio (cada
+  repetição recalcula as visões, sem tocar o cache em disco do usuário)
+- Agrupamento: mrdca_rwl (iterações até a convergência; o critério J vem
+  da telemetria da última iteração)
+- Metricas: calculate_metrics (ARI, NMI e silhouette na primeira visão)
+
+Por padrão cada caso roda em um processo novo, então o pico de RSS
+(ru_maxrss, que só cresce) é o do caso e não o dos anteriores. O
+relatório é um JSON com o ambiente (versões, núcleos, núcleo compilado,
+commit) e os resultados; compare() confronta dois relatórios e aponta
+regressões de tempo, memória, iterações e qualidade:
+
+    python -m mrdca.benchmark run --output base.json
+    python -m mrdca.benchmark run --output atual.json
+    python -m mrdca.benchmark compare base.json atual.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from . import kernel, pipeline
+from .cache import DissimilarityCache
+from .outofcore import peak_rss_mb
+from .telemetry import Recorder
+from .views import ViewSpec
+
+# Versão do formato do relatório JSON
+SCHEMA = 1
+
+DATASETS = ('Iris', 'Wine', 'Digits')
+PHASES = ('Dissimilaridades', 'Agrupamento', 'Metricas')
+
+# Tempos abaixo disso (s) são ruído demais para apontar regressões
+MIN_SECONDS = 0.01
+
+
+def synthetic_dataset(n_objects, n_views=2, n_clusters=5, n_features=4,
+                      random_state=0):
+    """
+    Dados sintéticos multi-visão com relevância diferente por visão
+
+    Cada visão é a distância euclidiana sobre um bloco próprio de
+    n_features atributos. Os centros dos clusters ficam mais próximos a
+    cada visão (separação de 4 até 1 desvio), então as visões têm
+    relevâncias diferentes e os pesos lambda não são triviais.
+
+    Args:
+        n_objects: Número de objetos
+        n_views: Número de visões (p)
+        n_clusters: Número de clusters (K)
+        n_features: Atributos por visão
+        random_state: Seed para reprodutibilidade
+
+    Returns:
+        Tupla (dados (n, p * n_features), labels verdadeiros, lista de ViewSpec)
+    """
+    rng = np.random.default_rng(random_state)
+    truth = rng.integers(0, n_clusters, n_objects)
+    blocks, specs = [], []
+    for view, separation in enumerate(np.linspace(4, 1, n_views)):
+        centers = rng.normal(scale=separation, size=(n_clusters, n_features))
+        blocks.append(centers[truth] + rng.normal(size=(n_objects, n_features)))
+        features = np.arange(view * n_features, (view + 1) * n_features)
+        specs.append(ViewSpec('euclidean', features, name=f'visao_{view}'))
+    return np.hstack(blocks), truth, specs
+
+
+def load_case(case):
+    """
+    Dados de um caso do benchmark
+
+    Args:
+        case: Dicionário com 'Dataset' ('Iris', 'Wine', 'Digits' ou
+            'Sintetico'); casos sintéticos também têm 'N', 'P' e 'K'
+
+    Returns:
+        Tupla (dados, labels verdadeiros, visões, número de clusters)
+    """
+    name = case['Dataset']
+    if name == 'Sintetico':
+        data, truth, specs = synthetic_dataset(case['N'], case['P'], case['K'])
+        return data, truth, specs, case['K']
+    from sklearn.datasets import load_digits, load_iris, load_wine
+    loaders = {'Iris': load_iris, 'Wine': load_wine, 'Digits': load_digits}
+    if name not in loaders:
+        raise ValueError(f"Conjunto de dados desconhecido: {name}")
+    bunch = loaders[name]()
+    return bunch.data, bunch.target, ['euclidean', 'cityblock'], len(np.unique(bunch.target))
+
+
+def case_key(case):
+    """Identificação de um caso, estável entre execuções"""
+    if case['Dataset'] == 'Sintetico':
+        return f"Sintetico(n={case['N']}, p={case['P']}, K={case['K']})"
+    return case['Dataset']
+
+
+def default_cases(sizes=(1000, 2000, 4000), n_views=(2, 4), n_clusters=(5,),
+                  datasets=DATASETS):
+    """
+    Casos padrão: conjuntos reais e uma grade de dados sintéticos
+
+    Args:
+        sizes: Valores de n dos casos sintéticos
+        n_views: Valores de p dos casos sintéticos
+        n_clusters: Valores de K dos casos sintéticos
+        datasets: Conjuntos reais incluídos
+
+    Returns:
+        Lista de casos
+    """
+    cases = [{'Dataset': name} for name in datasets]
+    cases += [{'Dataset': 'Sintetico', 'N': n, 'P': p, 'K': k}
+              for p in n_views for k in n_clusters for n in sizes]
+    return cases
+
+
+def run_case(case, repeats=3, random_state=0, use_kernel=None):
+    """
+    Executa um caso e mede cada fase
+
+    Args:
+        case: Caso (ver load_case)
+        repeats: Repetições; a repetição r usa a seed random_state + r
+        random_state: Seed inicial
+        use_kernel: Núcleo compilado no agrupamento (ver engine.fit)
+
+    Returns:
+        Dicionário com os tempos de cada fase por repetição, iterações,
+        critério J, métricas de qualidade e memória
+    """
+    # Carrega o sklearn (usado nas visões e nas métricas) antes dos relógios
+    import sklearn.metrics  # noqa: F401
+
+    initial_rss = peak_rss_mb()
+    data, truth, specs, n_clusters = load_case(case)
+    times = {phase: [] for phase in PHASES}
+    result = {**case, 'Caso': case_key(case), 'N': len(data), 'P': len(specs),
+              'K': n_clusters, 'Iteracoes': [], 'Objetivo': [], 'ARI': [], 'NMI': [],
+              'Silhouette': []}
+
+    previous_cache = pipeline.dissimilarity_cache
+    try:
+        for repeat in range(repeats):
+            pipeline.dissimilarity_cache = DissimilarityCache()
+            start = time.perf_counter()
+            views = pipeline.create_dissimilarity_matrices(data, specs)
+            times['Dissimilaridades'].append(time.perf_counter() - start)
+
+            recorder = Recorder()
+            start = time.perf_counter()
+            clusters, _, iterations = pipeline.mrdca_rwl(views, n_clusters,
+                                                         random_state=random_state + repeat,
+                                                         use_kernel=use_kernel,
+                                                         callback=recorder)
+            times['Agrupamento'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            ari, nmi, silhouette = pipeline.calculate_metrics(clusters, truth, data, views[0])
+            times['Metricas'].append(time.perf_counter() - start)
+
+            result['Iteracoes'].append(iterations)
+            result['Objetivo'].append(float(recorder.summary()['Objetivo']))
+            result['ARI'].append(float(ari))
+            result['NMI'].append(float(nmi))
+            result['Silhouette'].append(float(silhouette))
+            del views
+    finally:
+        pipeline.dissimilarity_cache = previous_cache
+
+    result['Tempos'] = times
+    result['Tempo_Mediano'] = {phase: statistics.median(values) for phase, values in times.items()}
+    result['RSS_Inicial_MB'] = initial_rss
+    result['Pico_RSS_MB'] = peak_rss_mb()
+    return result
+
+
+def environment():
+    """Descrição do ambiente de execução (para comparar relatórios)"""
+    import scipy
+    import sklearn
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(__file__),
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'Data': datetime.now().isoformat(timespec='seconds'),
+        'Python': platform.python_version(),
+        'NumPy': np.__version__,
+        'SciPy': scipy.__version__,
+        'Sklearn': sklearn.__version__,
+        'Plataforma': platform.platform(),
+        'Processador': platform.processor() or platform.machine(),
+        'Nucleos': os.cpu_count(),
+        'Nucleo_Compilado': kernel.available(),
+        'Threads_Nucleo': kernel.n_threads(),
+        'Commit': commit,
+    }
+
+
+def run_benchmark(cases=None, repeats=3, random_state=0, use_kernel=None, isolate=True,
+                  output=None, verbose=True):
+    """
+    Executa todos os casos e monta o relatório
+
+    Args:
+        cases: Lista de casos (padrão: default_cases())
+        repeats: Repetições por caso
+        random_state: Seed inicial de cada caso
+        use_kernel: Núcleo compilado no agrupamento (ver engine.fit)
+        isolate: Se True, cada caso roda em um processo novo (pico de RSS
+            por caso); se False, no processo atual
+        output: Caminho do JSON de saída (opcional)
+        verbose: Se True, imprime uma linha por caso
+
+    Returns:
+        Relatório (dicionário serializável em JSON)
+    """
+    cases = default_cases() if cases is None else cases
+    results = []
+    for case in cases:
+        if isolate:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_case, case, repeats, random_state, use_kernel).result()
+        else:
+            result = run_case(case, repeats, random_state, use_kernel)
+        results.append(result)
+        if verbose:
+            phases = ', '.join(f"{phase} {seconds:.3f}s"
+                               for phase, seconds in result['Tempo_Mediano'].items())
+            print(f"{result['Caso']}: {phases}, iterações {result['Iteracoes']}, "
+                  f"pico RSS {result['Pico_RSS_MB']:.0f} MB")
+
+    report = {
+        'Versao': SCHEMA,
+        'Ambiente': environment(),
+        'Parametros': {'Repeticoes': repeats, 'Seed': random_state,
+                       'Nucleo_Compilado': use_kernel, 'Isolado': isolate},
+        'Resultados': results,
+    }
+    report['Escalonamento'] = scaling(report)
+    if output is not None:
+        save_report(report, output)
+    return report
+
+
+def save_report(report, path):
+    """Grava o relatório em JSON"""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+def load_report(path):
+    """Lê um relatório gravado por save_report"""
+    with open(path, encoding='utf-8') as file:
+        report = json.load(file)
+    if report.get('Versao') != SCHEMA:
+        raise ValueError(f"Versão de relatório não suportada: {report.get('Versao')}")
+    return report
+
+
+def scaling(report, phases=PHASES):
+    """
+    Expoente de escalonamento do tempo com n nos casos sintéticos
+
+    Ajusta log(tempo) = a + b log(n) para cada (p, K) e fase; b perto de
+    2 indica custo quadrático (visões n x n).
+
+    Args:
+        report: Relatório de run_benchmark
+        phases: Fases avaliadas
+
+    Returns:
+        Lista de dicionários com P, K, Fase, os valores de n e o expoente b
+    """
+    groups = {}
+    for result in report['Resultados']:
+        if result['Dataset'] == 'Sintetico':
+            groups.setdefault((result['P'], result['K']), []).append(result)
+    rows = []
+    for (p, k), results in sorted(groups.items()):
+        sizes = np.array([result['N'] for result in results], dtype=np.float64)
+        if len(np.unique(sizes)) < 2:
+            continue
+        for phase in phases:
+            seconds = np.array([result['Tempo_Mediano'][phase] for result in results])
+            exponent = np.polyfit(np.log(sizes), np.log(np.maximum(seconds, 1e-9)), 1)[0]
+            rows.append({'P': p, 'K': k, 'Fase': phase, 'N': sizes.astype(int).tolist(),
+                         'Expoente': float(exponent)})
+    return rows
+
+
+def compare(baseline, current, time_tolerance=0.10, memory_tolerance=0.10,
+            quality_tolerance=0.01, min_seconds=MIN_SECONDS):
+    """
+    Compara dois relatórios caso a caso
+
+    Tempos são comparados pela mediana das repetições; diferenças em
+    tempos abaixo de min_seconds não contam como regressão. Iterações e
+    qualidade (ARI médio) dependem só das seeds e do código, então
+    qualquer piora acima da tolerância é apontada.
+
+    Args:
+        baseline: Relatório de referência (dicionário ou caminho do JSON)
+        current: Relatório novo (dicionário ou caminho do JSON)
+        time_tolerance: Aumento relativo de tempo tolerado
+        memory_tolerance: Aumento relativo do pico de RSS tolerado
+        quality_tolerance: Queda absoluta de ARI tolerada
+        min_seconds: Tempo mínimo para considerar uma regressão de tempo
+
+    Returns:
+        Lista de dicionários (Caso, Metrica, Base, Atual, Razao, Regressao);
+        casos presentes em só um dos relatórios são ignorados
+    """
+    if not isinstance(baseline, dict):
+        baseline = load_report(baseline)
+    if not isinstance(current, dict):
+        current = load_report(current)
+    previous = {result['Caso']: result for result in baseline['Resultados']}
+
+    rows = []
+
+    def add(case, metric, base, new, regression):
+        rows.append({'Caso': case, 'Metrica': metric, 'Base': base, 'Atual': new,
+                     'Razao': new / base if base else float('nan'),
+                     'Regressao': bool(regression)})
+
+    for result in current['Resultados']:
+        case = result['Caso']
+        if case not in previous:
+            continue
+        old = previous[case]
+        for phase in PHASES:
+            base, new = old['Tempo_Mediano'][phase], result['Tempo_Mediano'][phase]
+            add(case, f'Tempo_{phase}', base, new,
+                new > base * (1 + time_tolerance) and new >= min_seconds)
+        base, new = old['Pico_RSS_MB'], result['Pico_RSS_MB']
+        add(case, 'Pico_RSS_MB', base, new, new > base * (1 + memory_tolerance))
+        base, new = float(np.mean(old['Iteracoes'])), float(np.mean(result['Iteracoes']))
+        add(case, 'Iteracoes', base, new, new > base)
+        base, new = float(np.mean(old['ARI'])), float(np.mean(result['ARI']))
+        add(case, 'ARI', base, new, new < base - quality_tolerance)
+    return rows
+
+
+def print_comparison(rows, baseline=None, current=None):
+    """Imprime a comparação, com aviso se os ambientes diferirem"""
+    if baseline is not None and current is not None:
+        for field in ('Nucleos', 'Processador', 'Nucleo_Compilado', 'NumPy'):
+            before, after = baseline['Ambiente'].get(field), current['Ambiente'].get(field)
+            if before != after:
+                print(f"Aviso: ambientes diferentes em {field} ({before} -> {after})")
+    for row in rows:
+        flag = 'REGRESSÃO' if row['Regressao'] else ''
+        print(f"{row['Caso']:<36} {row['Metrica']:<26} {row['Base']:>12.4f} "
+              f"{row['Atual']:>12.4f} {row['Razao']:>7.2f} {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do MRDCA-RWL")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Executa o benchmark")
+    run.add_argument('--output', default=f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    run.add_argument('--repeats', type=int, default=3)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--sizes', type=int, nargs='*', default=[1000, 2000, 4000])
+    run.add_argument('--views', type=int, nargs='*', default=[2, 4])
+    run.add_argument('--clusters', type=int, nargs='*', default=[5])
+    run.add_argument('--datasets', nargs='*', default=list(DATASETS))
+    run.add_argument('--no-kernel', action='store_true', help="Usa só NumPy no agrupamento")
+    run.add_argument('--no-isolate', action='store_true', help="Roda tudo no mesmo processo")
+
+    check = commands.add_parser('compare', help="Compara dois relatórios")
+    check.add_argument('baseline')
+    check.add_argument('current')
+    check.add_argument('--time-tolerance', type=float, default=0.10)
+    check.add_argument('--memory-tolerance', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        cases = default_cases(args.sizes, args.views, args.clusters, args.datasets)
+        report = run_benchmark(cases, args.repeats, args.seed,
+                               use_kernel=False if args.no_kernel else None,
+                               isolate=not args.no_isolate, output=args.output)
+        for row in report['Escalonamento']:
+            print(f"p={row['P']} K={row['K']} {row['Fase']}: tempo ~ n^{row['Expoente']:.2f}")
+        print(f"Relatório salvo em {args.output}")
+        return 0
+
+    baseline, current = load_report(args.baseline), load_report(args.current)
+    rows = compare(baseline, current, args.time_tolerance, args.memory_tolerance)
+    print_comparison(rows, baseline, current)
+    regressions = sum(row['Regressao'] for row in rows)
+    print(f"{regressions} regressões")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
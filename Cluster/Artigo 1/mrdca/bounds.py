@@ -0,0 +1,250 @@
+"""
+Alocação com poda por desigualdade triangular (limites de Elkan e Hamerly).
+
+Para cada cluster k a distância ponderada D_k(x, y) = soma_j lambda_kj *
+d_j(x, y) é uma métrica quando todas as visões são métricas (euclidiana,
+cityblock, ...). Se o protótipo de C_k passa de g para g' e os pesos de
+lambda para lambda', então para todo objeto i:
+
+    D'_k(i, g') <= r_max * D_k(i, g) + delta_k
+    D'_k(i, g') >= r_min * D_k(i, g) - delta_k
+
+com r_max e r_min a maior e a menor razão lambda'_kj / lambda_kj e
+delta_k = soma_j lambda'_kj * d_j(g, g'). Cada objeto guarda um limite
+superior da distância ao seu protótipo e limites inferiores, atualizados
+só com essas K quantidades:
+
+- 'elkan': um limite inferior por objeto e cluster (n x K de memória);
+  só os pares (objeto, cluster) cujo limite não descarta o cluster são
+  calculados
+- 'hamerly': um único limite inferior por objeto (distância ao segundo
+  protótipo mais próximo), atualizado com o pior caso entre os clusters;
+  O(n) de memória, mas poda menos quando os pesos mudam muito
+
+Quando o limite superior fica abaixo dos inferiores o objeto continua no
+mesmo cluster sem calcular nenhuma distância; senão o limite superior é
+apertado com a distância exata ao próprio protótipo (p valores) e, só se
+ainda necessário, o objeto é comparado com os demais protótipos.
+
+O resultado é o mesmo de engine.assign_objects (incluindo o desempate
+pelo menor índice), desde que as visões satisfaçam a desigualdade
+triangular; com dissimilaridades que não a satisfazem (ex.: 'cosine' ou
+distâncias quadráticas) a poda pode errar e a alocação exata deve ser
+usada.
+"""
+import numpy as np
+
+METHODS = ('elkan', 'hamerly')
+
+# Folga relativa da poda, contra erros de arredondamento dos limites
+SLACK = 1e-9
+
+# Em backends que calculam as distâncias sob demanda (ex.: LazyViews), a
+# partir desta fração de n objetos a coluna inteira do protótipo (em cache
+# no backend) sai mais barata que o bloco só com os objetos pedidos
+COLUMN_FRACTION = 0.1
+
+
+class BoundedAssignment:
+    """
+    Alocação ao protótipo mais próximo com limites mantidos entre iterações
+
+    Depois de cada chamada, n_evaluated guarda quantos objetos foram
+    comparados com outros protótipos além do próprio, n_tightened quantos
+    tiveram o limite superior recalculado e n_distances quantas distâncias
+    ponderadas (objeto, protótipo) foram calculadas.
+
+    Args:
+        method: 'elkan' ou 'hamerly'
+    """
+
+    def __init__(self, method='elkan'):
+        if method not in METHODS:
+            raise ValueError(f"Limites desconhecidos: {method}")
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        """Descarta os limites (necessário ao trocar de visões)"""
+        self.labels = None
+        self.prototypes = None
+        self.lambdas = None
+        self.upper = None
+        self.lower = None
+        self.n_evaluated = 0
+        self.n_tightened = 0
+        self.n_distances = 0
+
+    def distances(self, views, rows, prototypes, lambdas):
+        """
+        Distâncias ponderadas de alguns objetos a todos os protótipos
+
+        Args:
+            views: Backend de visões (simétricas)
+            rows: Índices dos objetos
+            prototypes: Vetor com o protótipo de cada cluster
+            lambdas: Pesos (K, p)
+
+        Returns:
+            Array (len(rows), K)
+        """
+        # Visões simétricas: as linhas dos protótipos são contíguas
+        self.n_distances += len(rows) * len(prototypes)
+        return np.einsum('kj,jkm->mk', lambdas, views.block(prototypes, rows))
+
+    def evaluate(self, views, rows, prototypes, lambdas):
+        """
+        Rótulos, distância ao mais próximo e ao segundo mais próximo
+
+        A distância ao próprio protótipo é o limite superior recém-apertado,
+        então só as K - 1 restantes são calculadas (por grupo de objetos do
+        mesmo cluster).
+        """
+        own = self.labels[rows]
+        everything = np.arange(len(prototypes))
+        distances = np.empty((len(rows), len(prototypes)))
+        for k in np.unique(own):
+            positions = np.flatnonzero(own == k)
+            others = np.delete(everything, k)
+            distances[np.ix_(positions, others)] = self.distances(
+                views, rows[positions], prototypes[others], lambdas[others])
+            distances[positions, k] = self.upper[rows[positions]]
+        labels = distances.argmin(axis=1)
+        index = np.arange(len(rows))
+        nearest = distances[index, labels]
+        distances[index, labels] = np.inf
+        second = distances.min(axis=1) if distances.shape[1] > 1 else np.full(len(rows), np.inf)
+        return labels, nearest, second
+
+    def prototype_distances(self, views, prototype, rows, weights):
+        """Distância ponderada de alguns objetos a um protótipo"""
+        self.n_distances += len(rows)
+        if not views.incremental_sums and len(rows) > COLUMN_FRACTION * views.n_objects:
+            return weights @ views.columns([prototype])[:, rows, 0]
+        return weights @ views.block([prototype], rows)[:, 0, :]
+
+    def own_distances(self, views, rows, labels, prototypes, lambdas):
+        """Distância ponderada exata de cada objeto ao protótipo do seu cluster"""
+        distances = np.empty(len(rows))
+        order = np.argsort(labels, kind='stable')
+        bounds = np.cumsum(np.bincount(labels, minlength=len(prototypes)))
+        start = 0
+        for k, stop in enumerate(bounds):
+            if stop > start:
+                positions = order[start:stop]
+                distances[positions] = self.prototype_distances(views, prototypes[k],
+                                                                rows[positions], lambdas[k])
+            start = stop
+        return distances
+
+    def assign(self, views, prototypes, lambdas):
+        """
+        Aloca cada objeto ao protótipo de menor distância ponderada
+
+        Args:
+            views: Backend de visões (simétricas, métricas)
+            prototypes: Vetor com o protótipo de cada cluster
+            lambdas: Pesos (K, p), com produto 1 como em engine.fit
+
+        Returns:
+            Vetor de rótulos (0..K-1)
+        """
+        prototypes = np.asarray(prototypes, dtype=np.intp)
+        lambdas = np.asarray(lambdas, dtype=np.float64)
+        self.n_distances = 0
+        if self.labels is None or len(self.prototypes) != len(prototypes):
+            self.initialize(views, prototypes, lambdas)
+        else:
+            self.update_bounds(views, prototypes, lambdas)
+            # Aperta o limite superior com a distância exata ao próprio protótipo
+            candidates = np.flatnonzero(self.upper >= self.nearest_lower() * (1 - SLACK))
+            self.n_tightened = len(candidates)
+            if len(candidates):
+                self.upper[candidates] = self.own_distances(views, candidates,
+                                                            self.labels[candidates],
+                                                            prototypes, lambdas)
+                if self.method == 'elkan':
+                    self.lower[candidates, self.labels[candidates]] = self.upper[candidates]
+                candidates = candidates[self.upper[candidates]
+                                        >= self.nearest_lower(candidates) * (1 - SLACK)]
+            self.n_evaluated = len(candidates)
+            if len(candidates):
+                if self.method == 'elkan':
+                    self.compare_pairs(views, candidates, prototypes, lambdas)
+                else:
+                    labels, self.upper[candidates], self.lower[candidates] = self.evaluate(
+                        views, candidates, prototypes, lambdas)
+                    self.labels[candidates] = labels
+        self.prototypes, self.lambdas = prototypes.copy(), lambdas.copy()
+        return self.labels.copy()
+
+    def initialize(self, views, prototypes, lambdas):
+        """Primeira alocação: todas as distâncias, que viram os limites exatos"""
+        everyone = np.arange(views.n_objects)
+        distances = self.distances(views, everyone, prototypes, lambdas)
+        self.labels = distances.argmin(axis=1)
+        self.upper = distances[everyone, self.labels]
+        if self.method == 'elkan':
+            self.lower = distances
+        else:
+            distances[everyone, self.labels] = np.inf
+            self.lower = (distances.min(axis=1) if distances.shape[1] > 1
+                          else np.full(len(everyone), np.inf))
+        self.n_evaluated, self.n_tightened = len(everyone), 0
+
+    def update_bounds(self, views, prototypes, lambdas):
+        """Afrouxa os limites pelo deslocamento dos protótipos e dos pesos"""
+        ratios = lambdas / self.lambdas
+        growth, shrink = ratios.max(axis=1), ratios.min(axis=1)
+        moved = np.flatnonzero(prototypes != self.prototypes)
+        drift = np.zeros(len(prototypes))
+        if len(moved):
+            pairs = views.block(self.prototypes[moved], prototypes[moved])
+            drift[moved] = np.einsum('kj,jk->k', lambdas[moved],
+                                     pairs[:, np.arange(len(moved)), np.arange(len(moved))])
+        labels = self.labels
+        self.upper = growth[labels] * self.upper + drift[labels]
+        if self.method == 'elkan':
+            self.lower *= shrink
+            self.lower -= drift
+            np.maximum(self.lower, 0.0, out=self.lower)
+        else:
+            # Limite único: pior caso entre os outros clusters
+            largest = int(np.argmax(drift))
+            other_drift = np.where(labels == largest,
+                                   np.max(np.delete(drift, largest), initial=0.0),
+                                   drift[largest])
+            self.lower = np.maximum(shrink.min() * self.lower - other_drift, 0.0)
+
+    def nearest_lower(self, rows=None):
+        """Menor limite inferior entre os outros clusters de cada objeto"""
+        if self.method == 'hamerly':
+            return self.lower if rows is None else self.lower[rows]
+        lower = self.lower if rows is None else self.lower[rows]
+        labels = self.labels if rows is None else self.labels[rows]
+        index = np.arange(len(lower))
+        own = lower[index, labels].copy()
+        lower[index, labels] = np.inf
+        nearest = lower.min(axis=1) if lower.shape[1] > 1 else np.full(len(lower), np.inf)
+        lower[index, labels] = own
+        return nearest
+
+    def compare_pairs(self, views, rows, prototypes, lambdas):
+        """
+        Calcula só os pares (objeto, cluster) que os limites não descartam
+
+        Os clusters são percorridos em ordem crescente e empates ficam com o
+        menor índice, como em engine.assign_objects.
+        """
+        needed = self.lower[rows] <= self.upper[rows, None] * (1 + SLACK)
+        needed[np.arange(len(rows)), self.labels[rows]] = False
+        for k in np.flatnonzero(needed.any(axis=0)):
+            subset = rows[needed[:, k]]
+            distance = self.prototype_distances(views, prototypes[k], subset, lambdas[k])
+            self.lower[subset, k] = distance
+            current = self.labels[subset]
+            better = (distance < self.upper[subset]) | ((distance == self.upper[subset])
+                                                        & (k < current))
+            winners = subset[better]
+            self.labels[winners] = k
+            self.upper[winners] = distance[better]
@@ -0,0 +1,217 @@
+"""
+Cache de matrizes de dissimilaridade.
+
+As matrizes são identificadas por uma impressão digital dos dados
+(conteúdo, shape e dtype) mais a lista de métricas. A camada em memória
+é um LRU com poucas entradas; a camada em disco guarda um arquivo .npy
+por visão, reaberto com np.load(mmap_mode='r') sem custo de leitura
+antecipada, de modo que reinícios, execuções e processos diferentes
+reutilizam as mesmas matrizes. Em caso de falta, as visões são
+calculadas em blocos por mrdca.views.build_views, direto nos arquivos
+finais quando há camada em disco.
+
+A camada em disco fica em um diretório por usuário (default_directory) e
+pode ter um limite de tamanho (max_bytes): ao gravar uma base nova, as
+bases usadas há mais tempo são apagadas até o total caber no limite.
+clear(disk=True) apaga todas.
+"""
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+
+import numpy as np
+
+from .views import BLOCK_ROWS, allocate_views, as_view_specs, build_views
+
+# Limite padrão da camada em disco do cache do pipeline (bytes)
+MAX_DISK_BYTES = 4 * 1024 ** 3
+
+
+def default_directory():
+    """
+    Diretório por usuário da camada em disco
+
+    Returns:
+        $MRDCA_CACHE_DIR, ou mrdca dentro de $XDG_CACHE_HOME (padrão ~/.cache)
+    """
+    directory = os.environ.get('MRDCA_CACHE_DIR')
+    if directory:
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'mrdca')
+
+
+def fingerprint(data, metrics):
+    """
+    Calcula a chave de cache de uma base de dados e lista de métricas
+
+    Args:
+        data: Dados de entrada (n, d)
+        metrics: Descrição das visões (ViewSpec ou equivalente), uma por visão
+
+    Returns:
+        String hexadecimal que identifica dados e métricas
+    """
+    data = np.ascontiguousarray(data)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((data.shape, data.dtype.str, list(metrics))).encode())
+    digest.update(memoryview(data).cast('B'))
+    return digest.hexdigest()
+
+
+class DissimilarityCache:
+    """
+    Cache em dois níveis (memória LRU e disco) de matrizes de dissimilaridade
+
+    Args:
+        directory: Diretório da camada em disco (None desativa o disco)
+        max_items: Número de bases mantidas na camada em memória
+        block_rows: Linhas por bloco na construção das visões
+        n_jobs: Threads na construção das visões (None = todos os núcleos)
+        max_bytes: Tamanho máximo da camada em disco (None = sem limite)
+    """
+
+    def __init__(self, directory=None, max_items=4, block_rows=BLOCK_ROWS, n_jobs=1,
+                 max_bytes=None):
+        self.directory = directory
+        self.max_items = max_items
+        self.block_rows = block_rows
+        self.n_jobs = n_jobs
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key, view):
+        """Arquivo .npy de uma visão na camada em disco"""
+        return os.path.join(self.directory, key, f'view_{view}.npy')
+
+    def load(self, key, n_views):
+        """Reabre as visões do disco em modo memory-map (None se ausentes)"""
+        if self.directory is None:
+            return None
+        paths = [self.path(key, view) for view in range(n_views)]
+        if not all(os.path.exists(path) for path in paths):
+            return None
+        # Data de uso da base, usada na remoção das menos recentes
+        os.utime(os.path.join(self.directory, key))
+        return [np.load(path, mmap_mode='r') for path in paths]
+
+    def entries(self):
+        """
+        Bases completas na camada em disco
+
+        Returns:
+            Lista de tuplas (último uso, bytes, chave), da menos recente
+            para a mais recente
+        """
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for key in os.listdir(self.directory):
+            folder = os.path.join(self.directory, key)
+            if not os.path.isdir(folder):
+                continue
+            names = os.listdir(folder)
+            # Bases ainda sendo gravadas (arquivos .tmp) não são contadas
+            if any(name.endswith('.tmp') for name in names):
+                continue
+            size = sum(os.path.getsize(os.path.join(folder, name)) for name in names)
+            entries.append((os.path.getmtime(folder), size, key))
+        return sorted(entries)
+
+    def disk_usage(self):
+        """Bytes ocupados pela camada em disco"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """
+        Apaga as bases usadas há mais tempo até a camada em disco caber em max_bytes
+
+        Args:
+            keep: Chave que nunca é apagada (ex.: a base recém-gravada)
+
+        Returns:
+            Lista das chaves apagadas
+        """
+        if self.max_bytes is None:
+            return []
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            self.memory.pop(key, None)
+            total -= size
+            removed.append(key)
+        return removed
+
+    def build(self, key, data, specs):
+        """
+        Calcula as visões; com camada em disco, escreve direto em arquivos
+        temporários que só substituem os finais quando completos
+
+        Returns:
+            Lista de matrizes de dissimilaridade
+        """
+        if self.directory is None:
+            return build_views(data, specs, block_rows=self.block_rows, n_jobs=self.n_jobs)
+        suffix = f'.{os.getpid()}.tmp'
+        out, paths = allocate_views(len(data), len(specs), np.float64,
+                                    os.path.join(self.directory, key), suffix)
+        build_views(data, specs, out=out, block_rows=self.block_rows, n_jobs=self.n_jobs)
+        del out
+        for path in paths:
+            os.replace(path, path[:-len(suffix)])
+        self.evict(keep=key)
+        return self.load(key, len(specs))
+
+    def get(self, data, metrics=('euclidean', 'cityblock')):
+        """
+        Retorna as matrizes de dissimilaridade, calculando-as só se necessário
+
+        Args:
+            data: Dados de entrada (n, d)
+            metrics: Visões: nomes de métricas, tuplas (atributos, métrica)
+                ou ViewSpec (ver mrdca.views)
+
+        Returns:
+            Lista de matrizes de dissimilaridade (somente leitura)
+        """
+        specs = as_view_specs(metrics)
+        key = fingerprint(data, specs)
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+
+        matrices = self.load(key, len(specs))
+        if matrices is None:
+            self.misses += 1
+            matrices = self.build(key, data, specs)
+            for matrix in matrices:
+                matrix.flags.writeable = False
+        else:
+            self.hits += 1
+
+        self.memory[key] = matrices
+        if len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+        return matrices
+
+    def clear(self, disk=False):
+        """
+        Esvazia a camada em memória
+
+        Args:
+            disk: Se True, apaga também todas as bases da camada em disco
+        """
+        self.memory.clear()
+        if disk:
+            for _, _, key in self.entries():
+                shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
@@ -0,0 +1,159 @@
+"""
+Linha de comando dos experimentos do MRDCA-RWL (Artigo 1).
+
+Executa os testes múltiplos em Iris, Wine e Digits, gravando cada teste
+no store SQLite (mrdca.store) assim que termina, e gera os relatórios
+Excel/TXT a partir dele ao final:
+
+    python -m mrdca.cli [--datasets Iris Wine] [--tests 50] [--jobs 4]
+    python -m mrdca.cli --report            # só os relatórios da última execução
+    python -m mrdca.cli --auto-k [--k-max 15]  # K escolhido por varredura
+    python -m mrdca.cli --build-kernel      # compila o núcleo C/OpenMP (mrdca.kernel)
+
+Dependências (scikit-learn e, para os relatórios, pandas e openpyxl) são
+verificadas aqui, sem instalação automática.
+"""
+import argparse
+import importlib.util
+import os
+import random
+import subprocess
+
+import numpy as np
+
+from . import kernel
+from .pipeline import run_multiple_tests, select_n_clusters
+from .reporting import RESULTS_DIRECTORY, STORE_FILENAME, export_reports
+from .store import ResultsStore
+
+DATASETS = ('Iris', 'Wine', 'Digits')
+
+
+def load_datasets(names=DATASETS):
+    """
+    Carrega as bases de dados do scikit-learn
+
+    Args:
+        names: Bases desejadas ('Iris', 'Wine', 'Digits')
+
+    Returns:
+        Lista de tuplas (dados, labels, número de clusters, nome)
+    """
+    from sklearn.datasets import load_digits, load_iris, load_wine
+
+    loaders = {'Iris': (load_iris, 3), 'Wine': (load_wine, 3), 'Digits': (load_digits, 10)}
+    datasets = []
+    for name in names:
+        loader, n_clusters = loaders[name]
+        bunch = loader()
+        datasets.append((bunch.data, bunch.target, n_clusters, name))
+    return datasets
+
+
+def main(argv=None):
+    """Função principal do programa"""
+    parser = argparse.ArgumentParser(description="Experimentos do MRDCA-RWL")
+    parser.add_argument('--datasets', nargs='*', default=list(DATASETS), choices=DATASETS)
+    parser.add_argument('--tests', type=int, default=50, help="Testes por base")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Processos (padrão: todos os núcleos; 1 = sequencial)")
+    parser.add_argument('--output', default=RESULTS_DIRECTORY, help="Diretório de saída")
+    parser.add_argument('--store', default=None,
+                        help=f"Arquivo SQLite dos resultados (padrão: <output>/{STORE_FILENAME})")
+    parser.add_argument('--no-reports', action='store_true',
+                        help="Não gera os relatórios Excel/TXT ao final")
+    parser.add_argument('--auto-k', action='store_true',
+                        help="Escolhe K de cada base por varredura (mrdca.selection)")
+    parser.add_argument('--k-max', type=int, default=None,
+                        help="Maior K da varredura (padrão: raiz de n)")
+    parser.add_argument('--report', nargs='?', const='', default=None, metavar='EXECUCAO',
+                        help="Só gera os relatórios de uma execução gravada (padrão: a última)")
+    parser.add_argument('--build-kernel', nargs='?', const=kernel.LIBRARY, default=None,
+                        metavar='CAMINHO',
+                        help="Só compila o núcleo C/OpenMP (padrão: dentro do pacote)")
+    args = parser.parse_args(argv)
+
+    if args.build_kernel is not None:
+        try:
+            path = kernel.build_kernel(output=args.build_kernel)
+        except (OSError, subprocess.CalledProcessError) as error:
+            print(f"Erro ao compilar o núcleo: {error}")
+            return 1
+        library = kernel.load(path)
+        if library is None:
+            print(f"Núcleo compilado em {path}, mas não pôde ser carregado")
+            return 1
+        print(f"Núcleo compilado em {path} ({library.kernel_threads()} threads)")
+        if os.path.abspath(path) != os.path.abspath(kernel.LIBRARY):
+            print(f"Para usá-lo: export MRDCA_KERNEL_LIBRARY={path}")
+        return 0
+
+    # Só verifica (sem importar) o que este modo vai usar
+    required = [] if args.report is not None else ['sklearn']
+    if args.report is not None or not args.no_reports:
+        required += ['pandas', 'openpyxl']
+    missing = [package for package in required if importlib.util.find_spec(package) is None]
+    if missing:
+        print(f"Erro ao importar bibliotecas: {', '.join(missing)}")
+        print("Execute: pip install pandas scikit-learn openpyxl")
+        return 1
+
+    store = ResultsStore(args.store or os.path.join(args.output, STORE_FILENAME))
+
+    if args.report is not None:
+        resumo_filename = export_reports(store, args.report or None, args.output)
+        if resumo_filename is None:
+            print("Nenhum resultado gravado para esta execução")
+            return 1
+        print(f"Resumo executivo salvo em: {resumo_filename}")
+        return 0
+
+    # Fixar seed para reprodutibilidade
+    np.random.seed(42)
+    random.seed(42)
+
+    # Carregando as bases de dados
+    print("Carregando bases de dados...")
+    try:
+        datasets = load_datasets(args.datasets)
+    except Exception as e:
+        print(f"Erro ao carregar bases de dados: {e}")
+        return 1
+
+    # Execução no store (o identificador é o timestamp dos nomes de arquivo)
+    run_id = store.start_run(parameters={'Bases': args.datasets, 'Testes': args.tests,
+                                         'Processos': args.jobs, 'K_Automatico': args.auto_k})
+
+    for data, labels, n_clusters, name in datasets:
+        print(f"\n{'='*50}")
+        print(f"PROCESSANDO BASE: {name}")
+        print(f"{'='*50}")
+
+        try:
+            if args.auto_k:
+                selection = select_n_clusters(data, k_max=args.k_max, verbose=True)
+                print(f"K escolhido por {selection['Criterio']}: {selection['K']} "
+                      f"({selection['Ajustes']} ajustes em {selection['Segundos']:.2f}s; "
+                      f"K de referência: {n_clusters})")
+                n_clusters = selection['K']
+
+            # Executar testes (cada teste é gravado no store ao terminar)
+            run_multiple_tests(data, labels, n_clusters, name, args.tests,
+                               n_jobs=args.jobs, store=store, run_id=run_id)
+        except Exception as e:
+            print(f"Erro ao processar base {name}: {e}")
+            continue
+
+    print(f"\n{'='*50}")
+    print("EXECUÇÃO CONCLUÍDA!")
+    print(f"{'='*50}")
+    print(f"Resultados gravados em: {store.path} (execução {run_id})")
+    if not args.no_reports:
+        resumo_filename = export_reports(store, run_id, args.output)
+        print(f"Resumo executivo salvo em: {resumo_filename}")
+        print(f"Todos os arquivos foram salvos na pasta '{args.output}/'")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,369 @@
+"""
+Consenso de agrupamentos (clustering ensembles) em escala.
+
+As m partições base ficam em um array (m, n) de rótulos inteiros. A
+matriz de co-associação S = H H^T / m, onde H (n x soma dos k_q) é a
+matriz esparsa de pertinência de todos os clusters de todas as
+partições, nunca precisa ser formada inteira:
+
+- objetos com o mesmo vetor de rótulos nas m partições são indistinguíveis
+  para o consenso, então tudo é calculado sobre os u vetores distintos
+  (hashing de rótulos), com pesos iguais às multiplicidades
+- 'cspa' (grafo de co-associação) e 'hgpa' (hipergrafo dos clusters) são
+  particionados espectralmente: os autovetores vêm da matriz de Gram
+  pequena (soma k_q x soma k_q) de H normalizada, sem nenhum produto n x n
+- 'mcla' agrupa os próprios clusters (hiperarestas) pela similaridade de
+  Jaccard e aloca cada objeto ao meta-cluster de maior associação
+- 'best' escolhe, entre os três, o consenso de maior ANMI (NMI médio com
+  as partições base), como em Strehl e Ghosh
+
+coassociation calcula blocos de linhas de S quando a matriz explícita é
+necessária, e benchmark mede tempo e memória de cada método conforme n
+cresce.
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from .partition import Partition
+
+METHODS = ('cspa', 'hgpa', 'mcla', 'best')
+
+
+def as_label_matrix(partitions):
+    """
+    Converte partições base em um array (m, n) de rótulos 0..k_q-1
+
+    Args:
+        partitions: Array (m, n), lista de vetores de rótulos, de
+            mrdca.partition.Partition ou de partições no formato
+            [[objetos do cluster 1], ...]
+
+    Returns:
+        Array int32 (m, n)
+    """
+    rows = []
+    for partition in partitions:
+        if isinstance(partition, Partition):
+            partition = partition.labels
+        elif len(partition) and np.ndim(partition[0]) > 0:
+            n_objects = sum(len(cluster) for cluster in partition)
+            labels = np.empty(n_objects, dtype=np.int64)
+            for k, cluster in enumerate(partition):
+                labels[np.asarray(cluster, dtype=np.intp)] = k
+            partition = labels
+        rows.append(np.unique(np.asarray(partition), return_inverse=True)[1])
+    return np.asarray(rows, dtype=np.int32)
+
+
+def membership_matrix(labels):
+    """
+    Matriz esparsa de pertinência H (objetos x clusters de todas as partições)
+
+    Args:
+        labels: Array (m, n) de rótulos 0..k_q-1
+
+    Returns:
+        scipy.sparse.csr_matrix (n, soma dos k_q)
+    """
+    from scipy.sparse import csr_matrix
+
+    m, n_objects = labels.shape
+    widths = labels.max(axis=1).astype(np.int64) + 1
+    offsets = np.concatenate([[0], np.cumsum(widths)[:-1]])
+    # Cada objeto pertence a exatamente um cluster por partição: m entradas por linha
+    indices = (labels.T + offsets[None, :].astype(labels.dtype)).ravel()
+    indptr = np.arange(0, n_objects * m + 1, m, dtype=np.int64)
+    return csr_matrix((np.ones(n_objects * m), indices, indptr),
+                      shape=(n_objects, int(widths.sum())))
+
+
+def hash_labels(labels):
+    """
+    Agrupa objetos com vetores de rótulos idênticos
+
+    Cada vetor de rótulos vira uma chave de 64 bits (combinação linear com
+    multiplicadores aleatórios, módulo 2^64); colisões são verificadas e,
+    se ocorrerem, o agrupamento é refeito comparando os vetores inteiros.
+
+    Args:
+        labels: Array (m, n)
+
+    Returns:
+        Tupla (vetores distintos (m, u), índice do vetor de cada objeto,
+        multiplicidade de cada vetor)
+    """
+    multipliers = np.random.default_rng(0).integers(1, 2 ** 63, size=len(labels),
+                                                    dtype=np.uint64) | np.uint64(1)
+    keys = np.zeros(labels.shape[1], dtype=np.uint64)
+    for row, multiplier in zip(labels, multipliers):
+        keys += row.astype(np.uint64) * multiplier
+    _, first, inverse, counts = np.unique(keys, return_index=True, return_inverse=True,
+                                          return_counts=True)
+    unique = np.ascontiguousarray(labels[:, first])
+    if all(np.array_equal(row, representative[inverse])
+           for row, representative in zip(labels, unique)):
+        return unique, inverse.ravel(), counts
+    unique, inverse, counts = np.unique(labels.T, axis=0, return_inverse=True,
+                                        return_counts=True)
+    return np.ascontiguousarray(unique.T), inverse.ravel(), counts
+
+
+def coassociation(labels, rows=None):
+    """
+    Linhas da matriz de co-associação S = H H^T / m
+
+    Args:
+        labels: Array (m, n)
+        rows: Objetos cujas linhas serão calculadas (padrão: todos;
+            use blocos de linhas para n grande)
+
+    Returns:
+        Array float32 (len(rows), n)
+    """
+    labels = np.asarray(labels)
+    membership = membership_matrix(labels)
+    block = membership if rows is None else membership[rows]
+    return (block @ membership.T).toarray().astype(np.float32) / len(labels)
+
+
+def spectral_labels(membership, counts, n_clusters, row_scale=None, column_scale=None,
+                    random_state=None):
+    """
+    Particionamento espectral de A = N N^T, com N = D_r H D_c (vetores distintos)
+
+    Os autovetores de A (n x n) vêm da decomposição da matriz de Gram
+    N^T C N (soma k_q x soma k_q), com C = multiplicidades. Como cada linha
+    do embedding é normalizada no fim (Ng, Jordan e Weiss), a escala das
+    linhas é aplicada junto com sqrt(C) diretamente em H, sem cópias.
+
+    Args:
+        membership: Matriz de pertinência H dos vetores distintos (alterada)
+        counts: Multiplicidade de cada vetor distinto
+        n_clusters: Número de clusters do consenso
+        row_scale: Escala de cada linha (D_r; padrão: 1)
+        column_scale: Escala de cada coluna (D_c; padrão: 1)
+        random_state: Seed do k-means final
+
+    Returns:
+        Rótulos de cada vetor distinto
+    """
+    from sklearn.cluster import KMeans
+
+    scale = np.sqrt(counts) if row_scale is None else np.sqrt(counts) * row_scale
+    membership.data *= np.repeat(scale, np.diff(membership.indptr))
+    if column_scale is not None:
+        membership.data *= column_scale[membership.indices]
+    gram = (membership.T @ membership).toarray()
+    values, vectors = np.linalg.eigh(gram)
+    top = np.argsort(values)[::-1][:n_clusters]
+    embedding = membership @ (vectors[:, top] / np.sqrt(np.maximum(values[top], 1e-12)))
+    embedding /= np.maximum(np.linalg.norm(embedding, axis=1, keepdims=True), 1e-12)
+    kmeans = KMeans(n_clusters=n_clusters, n_init=10, random_state=random_state)
+    return kmeans.fit_predict(embedding, sample_weight=counts)
+
+
+def cspa(labels, n_clusters, random_state=None):
+    """
+    CSPA: corte normalizado do grafo de co-associação
+
+    Args:
+        labels: Array (m, n)
+        n_clusters: Número de clusters do consenso
+        random_state: Seed do k-means final
+
+    Returns:
+        Rótulos do consenso (n,)
+    """
+    unique, inverse, counts = hash_labels(labels)
+    membership = membership_matrix(unique)
+    # Grau de cada objeto em A = H H^T: soma dos tamanhos dos seus clusters
+    degree = membership @ (membership.T @ counts)
+    return spectral_labels(membership, counts, n_clusters, row_scale=1 / np.sqrt(degree),
+                           random_state=random_state)[inverse]
+
+
+def hgpa(labels, n_clusters, random_state=None):
+    """
+    HGPA: corte normalizado do hipergrafo cujas hiperarestas são os clusters
+
+    Args:
+        labels: Array (m, n)
+        n_clusters: Número de clusters do consenso
+        random_state: Seed do k-means final
+
+    Returns:
+        Rótulos do consenso (n,)
+    """
+    unique, inverse, counts = hash_labels(labels)
+    membership = membership_matrix(unique)
+    # Hipergrafo normalizado: D_v^-1/2 H D_e^-1/2; D_v = m é constante e
+    # desaparece com a normalização das linhas
+    sizes = membership.T @ counts
+    return spectral_labels(membership, counts, n_clusters, column_scale=1 / np.sqrt(sizes),
+                           random_state=random_state)[inverse]
+
+
+def mcla(labels, n_clusters):
+    """
+    MCLA: agrupa os clusters (Jaccard + ligação média) e aloca cada objeto
+    ao meta-cluster com maior fração de pertinência
+
+    Args:
+        labels: Array (m, n)
+        n_clusters: Número de meta-clusters
+
+    Returns:
+        Rótulos do consenso (n,)
+    """
+    from scipy.cluster.hierarchy import fcluster, linkage
+    from scipy.spatial.distance import squareform
+
+    unique, inverse, counts = hash_labels(labels)
+    membership = membership_matrix(unique)
+    # Linhas escaladas por sqrt(multiplicidade): H^T C H sem cópias, e o
+    # argmax da associação de cada linha não muda
+    membership.data *= np.repeat(np.sqrt(counts), np.diff(membership.indptr))
+    overlap = (membership.T @ membership).toarray()
+    sizes = np.diag(overlap)
+    jaccard = overlap / (sizes[:, None] + sizes[None, :] - overlap)
+    distances = 1 - jaccard
+    np.fill_diagonal(distances, 0)
+    meta = fcluster(linkage(squareform(distances, checks=False), method='average'),
+                    n_clusters, criterion='maxclust') - 1
+
+    n_meta = meta.max() + 1
+    grouping = np.zeros((len(meta), n_meta))
+    grouping[np.arange(len(meta)), meta] = 1 / np.bincount(meta, minlength=n_meta)[meta]
+    association = membership @ grouping
+    consensus = association.argmax(axis=1)
+    return np.unique(consensus, return_inverse=True)[1].ravel()[inverse]
+
+
+def anmi(labels, consensus_labels):
+    """
+    NMI médio entre o consenso e as partições base
+
+    Args:
+        labels: Array (m, n)
+        consensus_labels: Rótulos do consenso (n,)
+
+    Returns:
+        ANMI
+    """
+    from sklearn.metrics import normalized_mutual_info_score
+
+    return float(np.mean([normalized_mutual_info_score(partition, consensus_labels,
+                                                       average_method='geometric')
+                          for partition in labels]))
+
+
+def consensus(partitions, n_clusters, method='best', random_state=None):
+    """
+    Partição de consenso das partições base
+
+    Args:
+        partitions: Array (m, n) de rótulos (ex.: as partições de
+            run_multiple_tests) ou qualquer formato aceito por as_label_matrix
+        n_clusters: Número de clusters do consenso
+        method: 'cspa', 'hgpa', 'mcla' ou 'best' (maior ANMI entre os três)
+        random_state: Seed do k-means dos métodos espectrais
+
+    Returns:
+        Rótulos do consenso (n,)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método de consenso desconhecido: {method}")
+    labels = as_label_matrix(partitions)
+    if method == 'cspa':
+        return cspa(labels, n_clusters, random_state)
+    if method == 'hgpa':
+        return hgpa(labels, n_clusters, random_state)
+    if method == 'mcla':
+        return mcla(labels, n_clusters)
+    candidates = [cspa(labels, n_clusters, random_state),
+                  hgpa(labels, n_clusters, random_state),
+                  mcla(labels, n_clusters)]
+    return max(candidates, key=lambda candidate: anmi(labels, candidate))
+
+
+def dense_consensus(labels, n_clusters, random_state=None):
+    """Esquema original: k-means sobre as linhas da co-associação densa"""
+    from sklearn.cluster import KMeans
+
+    kmeans = KMeans(n_clusters=n_clusters, n_init=10, random_state=random_state)
+    return kmeans.fit_predict(coassociation(labels))
+
+
+def synthetic_partitions(n_objects, n_partitions, n_clusters, noise=0.2, random_state=None):
+    """
+    Partições base sintéticas: cópias ruidosas de uma partição verdadeira
+
+    Args:
+        n_objects: Número de objetos
+        n_partitions: Número de partições base
+        n_clusters: Número de clusters
+        noise: Fração de objetos com rótulo sorteado em cada partição
+        random_state: Seed para reprodutibilidade
+
+    Returns:
+        Tupla (partições (m, n), rótulos verdadeiros)
+    """
+    rng = np.random.default_rng(random_state)
+    truth = rng.integers(n_clusters, size=n_objects)
+    labels = np.empty((n_partitions, n_objects), dtype=np.int32)
+    for q in range(n_partitions):
+        row = rng.permutation(n_clusters)[truth]
+        noisy = rng.random(n_objects) < noise
+        row[noisy] = rng.integers(n_clusters, size=noisy.sum())
+        labels[q] = row
+    return labels, truth
+
+
+def benchmark(sizes=(1000, 4000, 16000, 64000), n_partitions=50, n_clusters=10,
+              methods=('cspa', 'hgpa', 'mcla', 'densa'), dense_limit=4000,
+              noise=0.2, random_state=0):
+    """
+    Tempo e memória de pico de cada método de consenso conforme n cresce
+
+    Args:
+        sizes: Números de objetos avaliados
+        n_partitions: Partições base por conjunto
+        n_clusters: Número de clusters
+        methods: Métodos ('densa' é o k-means sobre a co-associação n x n)
+        dense_limit: Maior n avaliado com o método denso
+        noise: Ruído das partições sintéticas
+        random_state: Seed para reprodutibilidade
+
+    Returns:
+        Lista de dicionários (um por n e método)
+    """
+    from sklearn.metrics import adjusted_rand_score
+
+    report = []
+    for n_objects in sizes:
+        labels, truth = synthetic_partitions(n_objects, n_partitions, n_clusters,
+                                             noise, random_state)
+        for method in methods:
+            if method == 'densa' and n_objects > dense_limit:
+                continue
+            tracemalloc.start()
+            start = time.perf_counter()
+            if method == 'densa':
+                result = dense_consensus(labels, n_clusters, random_state)
+            else:
+                result = consensus(labels, n_clusters, method, random_state)
+            seconds = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.append({
+                'N_Objetos': n_objects,
+                'Metodo': method,
+                'Segundos': seconds,
+                'Objetos_Por_Segundo': n_objects / seconds,
+                'Memoria_Pico_MB': peak / 2 ** 20,
+                'ARI_Verdadeiro': adjusted_rand_score(truth, result),
+                'ANMI': anmi(labels, result),
+            })
+    return report
@@ -0,0 +1,360 @@
+"""
+Núcleo vetorizado do algoritmo MRDCA-RWL.
+
+As p visões de dissimilaridade são acessadas por um backend
+(mrdca.backends) e a partição é representada por um vetor de rótulos
+inteiros (0..K-1). Cada passo do algoritmo (pesos lambda, alocação e
+seleção de protótipos) é feito com poucas operações em lote do NumPy ou,
+para visões densas em float64/float32, pelo núcleo compilado em C com
+OpenMP (mrdca.kernel), quando disponível.
+"""
+import time
+
+import numpy as np
+
+from . import kernel
+from .backends import as_backend
+from .bounds import BoundedAssignment
+from .initialization import initialize
+from .medoids import MedoidSearch
+from .partition import Partition
+
+# Modos da alocação (ver mrdca.bounds)
+ASSIGNMENTS = ('exact', 'elkan', 'hamerly')
+
+
+def stack_views(d_matrices):
+    """
+    Empilha as matrizes de dissimilaridade em um tensor (p, n, n)
+
+    Args:
+        d_matrices: Lista de matrizes n x n ou array (p, n, n)
+
+    Returns:
+        Array float64 contíguo com shape (p, n, n)
+    """
+    if isinstance(d_matrices, np.ndarray) and d_matrices.ndim == 3:
+        return np.ascontiguousarray(d_matrices, dtype=np.float64)
+    return np.stack([np.asarray(d, dtype=np.float64) for d in d_matrices])
+
+
+def cluster_members(labels, n_clusters):
+    """
+    Lista os objetos de cada cluster em ordem crescente de índice
+
+    Args:
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters
+
+    Returns:
+        Lista com um array de índices por cluster
+    """
+    return Partition(labels, n_clusters).member_lists()
+
+
+def labels_to_clusters(labels, n_clusters):
+    """
+    Converte o vetor de rótulos no dicionário {cluster_id: [objetos]}
+
+    Args:
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters
+
+    Returns:
+        Dicionário com clusters numerados a partir de 1
+    """
+    return Partition(labels, n_clusters).to_clusters()
+
+
+def clusters_to_labels(clusters, n_objects):
+    """
+    Converte o dicionário {cluster_id: [objetos]} em vetor de rótulos
+
+    Args:
+        clusters: Dicionário de clusters numerados a partir de 1
+        n_objects: Número de objetos
+
+    Returns:
+        Vetor de rótulos (0..K-1)
+    """
+    return Partition.from_clusters(clusters, n_objects).labels.astype(np.intp)
+
+
+def prototype_columns(views, prototypes):
+    """
+    Extrai as colunas dos protótipos em todas as visões
+
+    Args:
+        views: Backend de visões
+        prototypes: Vetor com o protótipo de cada cluster
+
+    Returns:
+        Array (p, n, K) com d_j(objeto, protótipo_k)
+    """
+    return views.columns(prototypes)
+
+
+def cluster_totals(columns, labels, n_clusters):
+    """
+    Soma das dissimilaridades dos membros ao protótipo, por cluster e visão
+
+    Args:
+        columns: Colunas dos protótipos (p, n, K)
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters
+
+    Returns:
+        Array (K, p) com T_kj = soma_{i em C_k} d_j(i, g_k)
+    """
+    p, n, _ = columns.shape
+    own = columns[:, np.arange(n), labels]
+    # Soma por (visão, cluster) em um único bincount
+    index = labels[None, :] + n_clusters * np.arange(p)[:, None]
+    return np.bincount(index.ravel(), weights=own.ravel(),
+                       minlength=n_clusters * p).reshape(p, n_clusters).T
+
+
+def lambda_weights(total_d):
+    """
+    Pesos lambda a partir das somas T_kj de cada cluster
+
+    Os pesos seguem a restrição do MRDCA-RWL (produto igual a 1 em cada
+    cluster): lambda_kj = (prod_h T_kh)^(1/p) / T_kj. Como os pesos não
+    mudam se T_k for multiplicado por uma constante, médias por membro
+    servem tanto quanto somas.
+
+    Args:
+        total_d: Somas (ou médias) T_kj, array (K, p)
+
+    Returns:
+        Array (K, p) com os pesos de cada cluster
+    """
+    # Evitar divisão por zero: pesos iguais para clusters degenerados
+    degenerate = np.any(total_d <= 0, axis=1)
+    safe = np.where(degenerate[:, None], 1.0, total_d)
+    log_d = np.log(safe)
+    lambdas = np.exp(log_d.mean(axis=1, keepdims=True) - log_d)
+    lambdas[degenerate] = 1.0
+    return lambdas
+
+
+def compute_lambdas(columns, labels, n_clusters):
+    """
+    Calcula os pesos lambda de todos os clusters de uma vez
+
+    Args:
+        columns: Colunas dos protótipos (p, n, K)
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters
+
+    Returns:
+        Array (K, p) com os pesos de cada cluster (produto 1 por cluster)
+    """
+    return lambda_weights(cluster_totals(columns, labels, n_clusters))
+
+
+def normalize_lambdas(lambdas):
+    """
+    Normaliza os pesos de cada cluster para soma 1 (formato dos relatórios)
+
+    Args:
+        lambdas: Pesos (K, p)
+
+    Returns:
+        Array (K, p) com linhas somando 1
+    """
+    return lambdas / lambdas.sum(axis=1, keepdims=True)
+
+
+def product_one_lambdas(lambdas):
+    """
+    Converte pesos normalizados (soma 1) de volta para a restrição de produto 1
+
+    Args:
+        lambdas: Pesos (K, p) positivos, ex.: os normalizados de fit
+
+    Returns:
+        Array (K, p) com produto 1 por cluster (os pesos usados na alocação)
+    """
+    return lambdas / np.exp(np.log(lambdas).mean(axis=1, keepdims=True))
+
+
+def assign_objects(columns, lambdas):
+    """
+    Aloca cada objeto ao protótipo de menor distância ponderada
+
+    Args:
+        columns: Colunas dos protótipos (p, n, K)
+        lambdas: Pesos (K, p)
+
+    Returns:
+        Vetor de rótulos (0..K-1)
+    """
+    distances = np.einsum('kj,jnk->nk', lambdas, columns)
+    return distances.argmin(axis=1)
+
+
+def fit(views, n_clusters, max_iter=30, verbose=False, random_state=None,
+        medoid_search=None, tol=1e-4, init='random', init_labels=None,
+        init_prototypes=None, use_kernel=None, callback=None, assignment='exact'):
+    """
+    Executa o MRDCA-RWL sobre o tensor de visões
+
+    Cada iteração calcula os pesos lambda, aloca os objetos e escolhe os
+    protótipos que minimizam o critério ponderado pelos lambdas. O critério
+    J = soma_k soma_j lambda_kj * soma_{i em C_k} d_j(i, g_k) não cresce entre
+    iterações, e a convergência é declarada quando sua redução relativa
+    fica abaixo de tol.
+
+    As iterações são incrementais: os totais T_kj dos pesos vêm das somas
+    por cluster mantidas pela busca de medoides (atualizadas só com os
+    objetos movidos), as colunas dos protótipos só são relidas para os
+    protótipos que mudaram e a busca só refaz os clusters alterados (ver
+    mrdca.medoids). MedoidSearch(incremental=False) recalcula tudo a cada
+    iteração. Com assignment='elkan' ou 'hamerly' a alocação também é
+    podada: limites por objeto (mrdca.bounds) evitam calcular as
+    distâncias que certamente não mudam o cluster de um objeto.
+
+    Com callback, ao fim de cada iteração é passado um dicionário com a
+    telemetria da iteração (ver mrdca.telemetry): 'Iteracao', 'Tempos'
+    e 'Inicios' de cada passo ('Lambdas', 'Alocacao', 'Prototipos'),
+    'Tempo_Total', 'Objetivo', 'Objetivo_Anterior', 'Movidos' (objetos
+    que mudaram de cluster), 'Recalculados' (clusters cujo medoide foi
+    buscado de novo), 'Distancias' (distâncias ponderadas objeto x
+    protótipo calculadas na alocação), 'Lambdas' (K, p, normalizados) e
+    'Prototipos'. Se o callback retornar True o ajuste para após essa
+    iteração. Sem callback só os relógios dos passos são lidos.
+
+    Args:
+        views: Backend de visões (mrdca.backends), tensor (p, n, n) ou
+            lista de matrizes de dissimilaridade
+        n_clusters: Número de clusters
+        max_iter: Número máximo de iterações
+        verbose: Se True, imprime informações detalhadas
+        random_state: Seed para reprodutibilidade
+        medoid_search: MedoidSearch usado na seleção de protótipos
+            (padrão: busca exata incremental)
+        tol: Redução relativa mínima do critério para continuar iterando
+        init: Estratégia de inicialização: 'random', 'kmedoids++' ou 'build'
+            (ver mrdca.initialization)
+        init_labels: Partição inicial (0..K-1) para partida a quente
+        init_prototypes: Protótipos iniciais para partida a quente
+        use_kernel: Núcleo compilado (mrdca.kernel): None usa se disponível
+            e suportado pelo backend, True exige e False usa só NumPy
+        callback: Função (registro) -> bool chamada a cada iteração; True
+            interrompe o ajuste
+        assignment: 'exact' compara todos os objetos com todos os
+            protótipos; 'elkan' e 'hamerly' podam pela desigualdade
+            triangular (mesmo resultado se todas as visões forem métricas,
+            ver mrdca.bounds)
+
+    Returns:
+        Tupla (labels, lambdas, prototypes, iterations, objectives), com
+        lambdas normalizados para soma 1 e o critério J de cada iteração
+    """
+    if assignment not in ASSIGNMENTS:
+        raise ValueError(f"Alocação desconhecida: {assignment}")
+    started = time.perf_counter()
+    views = as_backend(views)
+    compiled = kernel.bind(views) if use_kernel is not False else None
+    if use_kernel and compiled is None:
+        raise RuntimeError("Núcleo compilado indisponível para estas visões")
+    if medoid_search is None:
+        medoid_search = MedoidSearch() if compiled is None else kernel.CompiledSearch(compiled)
+    medoid_search.reset()
+    bounded = BoundedAssignment(assignment) if assignment != 'exact' else None
+
+    labels, members, prototypes = initialize(views, n_clusters, init, random_state,
+                                             init_labels, init_prototypes)
+
+    # Critério inicial com pesos iguais (lambda = 1 em todas as visões)
+    columns = column_prototypes = None
+    if prototypes is None:
+        if members is None:
+            members = cluster_members(labels, n_clusters)
+        prototypes = medoid_search.select(views, labels, n_clusters, members)
+        objective = medoid_search.costs.sum()
+    else:
+        columns = prototype_columns(views, prototypes)
+        column_prototypes = prototypes.copy()
+        objective = columns.sum(axis=0)[np.arange(len(labels)), labels].sum()
+    objectives = []
+
+    iterations = 0
+    for iteration in range(max_iter):
+        iterations = iteration + 1
+        if verbose:
+            print(f"\nIteração {iteration + 1}:")
+
+        lambdas_start = time.perf_counter()
+        totals = medoid_search.cluster_totals(labels, prototypes)
+        if compiled is None and (bounded is None or totals is None):
+            # Só as colunas dos protótipos que mudaram são relidas
+            if columns is None:
+                columns = prototype_columns(views, prototypes)
+            else:
+                stale = np.flatnonzero(prototypes != column_prototypes)
+                if len(stale):
+                    columns[:, :, stale] = prototype_columns(views, prototypes[stale])
+            column_prototypes = prototypes.copy()
+        if totals is None and compiled is None:
+            totals = cluster_totals(columns, labels, n_clusters)
+        elif totals is None:
+            totals = compiled.cluster_totals(labels, prototypes, n_clusters)
+        lambdas = lambda_weights(totals)
+        lambdas_end = time.perf_counter()
+        if verbose:
+            sizes = np.bincount(labels, minlength=n_clusters)
+            for k in np.flatnonzero(sizes):
+                print(f"Lambdas para Cluster {k + 1}: {normalize_lambdas(lambdas)[k].tolist()}")
+
+        assign_start = time.perf_counter()
+        previous = labels
+        if bounded is not None:
+            labels = bounded.assign(views, prototypes, lambdas)
+        elif compiled is None:
+            labels = assign_objects(columns, lambdas)
+        else:
+            labels = compiled.assign_objects(prototypes, lambdas)
+        search_start = time.perf_counter()
+        prototypes = medoid_search.select(views, labels, n_clusters,
+                                          cluster_members(labels, n_clusters), lambdas)
+        search_end = time.perf_counter()
+
+        new_objective = medoid_search.costs.sum()
+        objectives.append(new_objective)
+        if verbose:
+            print(f"Critério J: {new_objective:.6f}")
+
+        stop = False
+        if callback is not None:
+            stop = bool(callback({
+                'Iteracao': iterations,
+                'Inicios': {'Lambdas': lambdas_start, 'Alocacao': assign_start,
+                            'Prototipos': search_start},
+                'Tempos': {'Lambdas': lambdas_end - lambdas_start,
+                           'Alocacao': search_start - assign_start,
+                           'Prototipos': search_end - search_start},
+                'Tempo_Total': search_end - started,
+                'Objetivo': float(new_objective),
+                'Objetivo_Anterior': float(objective),
+                'Movidos': int(np.count_nonzero(labels != previous)),
+                'Recalculados': medoid_search.n_changed,
+                'Distancias': (len(labels) * n_clusters if bounded is None
+                               else bounded.n_distances),
+                'Lambdas': normalize_lambdas(lambdas),
+                'Prototipos': prototypes.copy(),
+            }))
+
+        converged = objective - new_objective <= tol * abs(objective)
+        objective = new_objective
+        if converged:
+            if verbose:
+                print("Convergiu!")
+            break
+        if stop:
+            if verbose:
+                print("Interrompido pelo callback")
+            break
+
+    return labels, normalize_lambdas(lambdas), prototypes, iterations, objectives
@@ -0,0 +1,243 @@
+"""
+Estratégias de inicialização do MRDCA-RWL.
+
+- 'random': embaralha os objetos e distribui em rodízio (esquema original)
+- 'kmedoids++': sementes sorteadas com probabilidade proporcional ao
+  quadrado da distância (soma das visões ponderada) à semente mais próxima
+- 'build': fase BUILD do PAM, gulosa: cada novo medoide é o objeto que
+  mais reduz a soma das distâncias ao medoide mais próximo
+
+Também é possível partir de uma partição (labels) ou de um conjunto de
+protótipos fornecidos. compare_initializations mede quantas iterações,
+segundos e reinícios cada estratégia economiza em relação à aleatória.
+"""
+import random
+import time
+
+import numpy as np
+
+STRATEGIES = ('random', 'kmedoids++', 'build')
+
+# Candidatos avaliados por vez na fase BUILD
+BUILD_CHUNK = 256
+
+
+def summed_columns(views, index, weights=None):
+    """
+    Colunas da soma ponderada das visões
+
+    Args:
+        views: Backend de visões
+        index: Índices das colunas
+        weights: Peso de cada visão (padrão: 1)
+
+    Returns:
+        Array (n, len(index))
+    """
+    if weights is None:
+        weights = np.ones(views.n_views)
+    return np.einsum('j,jnm->nm', weights, views.columns(index))
+
+
+def random_partition(n_objects, n_clusters, random_state=None):
+    """
+    Partição aleatória balanceada (embaralhamento + rodízio)
+
+    Args:
+        n_objects: Número de objetos
+        n_clusters: Número de clusters
+        random_state: Seed para reprodutibilidade
+
+    Returns:
+        Tupla (labels, members), com os membros na ordem do embaralhamento
+    """
+    objects = list(range(n_objects))
+    random.Random(random_state).shuffle(objects)
+    objects = np.asarray(objects, dtype=np.intp)
+    labels = np.empty(n_objects, dtype=np.intp)
+    labels[objects] = np.arange(n_objects) % n_clusters
+    return labels, [objects[k::n_clusters] for k in range(n_clusters)]
+
+
+def kmedoids_plus_plus(views, n_clusters, random_state=None, weights=None):
+    """
+    Sementes k-medoids++ sobre a soma ponderada das visões
+
+    Args:
+        views: Backend de visões
+        n_clusters: Número de clusters
+        random_state: Seed para reprodutibilidade
+        weights: Peso de cada visão (padrão: 1)
+
+    Returns:
+        Vetor com os K protótipos iniciais
+    """
+    rng = np.random.default_rng(random_state)
+    n_objects = views.n_objects
+    seeds = [int(rng.integers(n_objects))]
+    nearest = summed_columns(views, seeds, weights)[:, 0]
+    for _ in range(1, n_clusters):
+        probabilities = nearest ** 2
+        total = probabilities.sum()
+        if total > 0:
+            seed = int(rng.choice(n_objects, p=probabilities / total))
+        else:
+            seed = int(rng.integers(n_objects))
+        seeds.append(seed)
+        nearest = np.minimum(nearest, summed_columns(views, [seed], weights)[:, 0])
+    return np.asarray(seeds, dtype=np.intp)
+
+
+def build(views, n_clusters, n_candidates=None, random_state=None, weights=None):
+    """
+    Medoides iniciais pela fase BUILD do PAM
+
+    Args:
+        views: Backend de visões
+        n_clusters: Número de clusters
+        n_candidates: Se definido, avalia só uma amostra de candidatos
+            (recomendado para n grande; cada passo lê n x candidatos)
+        random_state: Seed da amostra de candidatos
+        weights: Peso de cada visão (padrão: 1)
+
+    Returns:
+        Vetor com os K protótipos iniciais
+    """
+    n_objects = views.n_objects
+    candidates = np.arange(n_objects)
+    if n_candidates is not None and n_candidates < n_objects:
+        rng = np.random.default_rng(random_state)
+        candidates = np.sort(rng.choice(n_objects, n_candidates, replace=False))
+
+    def best_gain(nearest):
+        best, best_gain = None, -np.inf
+        for start in range(0, len(candidates), BUILD_CHUNK):
+            chunk = candidates[start:start + BUILD_CHUNK]
+            columns = summed_columns(views, chunk, weights)
+            if nearest is None:
+                gains = -columns.sum(axis=0)
+            else:
+                gains = np.maximum(nearest[:, None] - columns, 0).sum(axis=0)
+            position = np.argmax(gains)
+            if gains[position] > best_gain:
+                best, best_gain = int(chunk[position]), gains[position]
+        return best
+
+    # Primeiro medoide: menor soma de distâncias a todos os objetos
+    medoids = [best_gain(None)]
+    nearest = summed_columns(views, medoids, weights)[:, 0]
+    for _ in range(1, n_clusters):
+        medoid = best_gain(nearest)
+        medoids.append(medoid)
+        nearest = np.minimum(nearest, summed_columns(views, [medoid], weights)[:, 0])
+    return np.asarray(medoids, dtype=np.intp)
+
+
+def initialize(views, n_clusters, init='random', random_state=None,
+               init_labels=None, init_prototypes=None):
+    """
+    Partição e protótipos iniciais
+
+    Args:
+        views: Backend de visões
+        n_clusters: Número de clusters
+        init: 'random', 'kmedoids++' ou 'build'
+        random_state: Seed para reprodutibilidade
+        init_labels: Partição inicial (0..K-1) para partida a quente
+        init_prototypes: Protótipos iniciais para partida a quente
+
+    Returns:
+        Tupla (labels, members, prototypes); members é None quando deve
+        seguir a ordem dos índices e prototypes é None quando devem ser
+        escolhidos pela busca de medoides
+    """
+    if init_labels is not None:
+        labels = np.asarray(init_labels, dtype=np.intp)
+        if len(labels) != views.n_objects or labels.min() < 0 or labels.max() >= n_clusters:
+            raise ValueError("init_labels deve ter um rótulo 0..K-1 por objeto")
+        return labels, None, None
+
+    if init_prototypes is not None:
+        prototypes = np.asarray(init_prototypes, dtype=np.intp)
+        if len(prototypes) != n_clusters:
+            raise ValueError("init_prototypes deve ter um protótipo por cluster")
+    elif init == 'random':
+        labels, members = random_partition(views.n_objects, n_clusters, random_state)
+        return labels, members, None
+    elif init == 'kmedoids++':
+        prototypes = kmedoids_plus_plus(views, n_clusters, random_state)
+    elif init == 'build':
+        prototypes = build(views, n_clusters, random_state=random_state)
+    else:
+        raise ValueError(f"Inicialização desconhecida: {init}")
+
+    # Partição inicial: cada objeto no protótipo mais próximo (pesos iguais)
+    labels = summed_columns(views, prototypes).argmin(axis=1)
+    return labels, None, prototypes
+
+
+def compare_initializations(d_matrices, n_clusters, strategies=STRATEGIES,
+                            seeds=range(42, 92), true_labels=None, **fit_params):
+    """
+    Compara estratégias de inicialização no benchmark de múltiplas seeds
+
+    Args:
+        d_matrices: Lista de matrizes de dissimilaridade ou backend de visões
+        n_clusters: Número de clusters
+        strategies: Estratégias a comparar ('random' é a referência)
+        seeds: Seeds de cada reinício
+        true_labels: Labels verdadeiros (opcional, para o ARI)
+        **fit_params: Parâmetros repassados a engine.fit
+
+    Returns:
+        Dicionário estratégia -> estatísticas (iterações e segundos médios,
+        economia em relação a 'random', melhor critério e o número de
+        reinícios necessários para igualar o melhor critério que a
+        inicialização aleatória atinge com todas as seeds)
+    """
+    from .backends import as_backend
+    from .engine import fit
+
+    views = as_backend(d_matrices)
+    seeds = list(seeds)
+    runs = {}
+    for strategy in strategies:
+        runs[strategy] = []
+        for seed in seeds:
+            start = time.perf_counter()
+            labels, _, _, iterations, objectives = fit(views, n_clusters, init=strategy,
+                                                       random_state=seed, **fit_params)
+            runs[strategy].append((iterations, time.perf_counter() - start,
+                                   objectives[-1], labels))
+
+    reference = runs.get('random')
+    if reference is not None:
+        target = min(run[2] for run in reference)
+    else:
+        target = min(run[2] for strategy_runs in runs.values() for run in strategy_runs)
+    report = {}
+    for strategy, strategy_runs in runs.items():
+        iterations = np.array([run[0] for run in strategy_runs])
+        seconds = np.array([run[1] for run in strategy_runs])
+        objectives = np.array([run[2] for run in strategy_runs])
+        reached = np.flatnonzero(np.minimum.accumulate(objectives)
+                                 <= target * (1 + 1e-9))
+        stats = {
+            'Iteracoes_Media': float(iterations.mean()),
+            'Segundos_Media': float(seconds.mean()),
+            'Objetivo_Medio': float(objectives.mean()),
+            'Objetivo_Melhor': float(objectives.min()),
+            'Reinicios_Necessarios': int(reached[0]) + 1 if len(reached) else None,
+        }
+        if reference is not None:
+            stats['Iteracoes_Economizadas'] = float(np.mean([run[0] for run in reference])
+                                                    - iterations.mean())
+            stats['Segundos_Economizados'] = float(np.mean([run[1] for run in reference])
+                                                   - seconds.mean())
+        if true_labels is not None:
+            from sklearn.metrics import adjusted_rand_score
+            aris = [adjusted_rand_score(true_labels, run[3]) for run in strategy_runs]
+            stats['ARI_Medio'] = float(np.mean(aris))
+            stats['ARI_Melhor_Objetivo'] = aris[int(np.argmin(objectives))]
+        report[strategy] = stats
+    return report
@@ -0,0 +1,386 @@
+"""
+Núcleo compilado (C + OpenMP) dos passos do MRDCA-RWL.
+
+_kernel.c implementa, sobre os buffers das visões densas em float64 ou
+float32, os três passos do algoritmo com threads sobre os objetos:
+
+- somas T_kj dos membros ao protótipo (pesos lambda via lambda_weights)
+- alocação ao protótipo de menor distância ponderada
+- somas por cluster (completas ou atualizadas com os objetos movidos) e
+  escolha do medoide ponderado, como a busca exata de MedoidSearch
+
+A biblioteca é compilada em um passo explícito, uma única vez:
+
+    python -m mrdca.cli --build-kernel [caminho]
+
+e carregada via ctypes: os arrays NumPy são passados por ponteiro, sem
+cópia. Em tempo de execução nada é compilado: só uma biblioteca já
+compilada é carregada (a do pacote ou a indicada em MRDCA_KERNEL_LIBRARY,
+para instalações somente leitura). Sem biblioteca, com uma biblioteca
+mais antiga que _kernel.c, com MRDCA_KERNEL=0 ou com backends não
+suportados (quantizados, condensados ou preguiçosos), engine.fit usa a
+implementação NumPy.
+
+check_parity() compara cada passo e o ajuste completo com a versão NumPy
+(os testes em tests/test_kernel.py fazem o mesmo a cada execução):
+
+    python -c "from mrdca import kernel; kernel.check_parity()"
+"""
+import ctypes
+import os
+import subprocess
+import sysconfig
+import warnings
+
+import numpy as np
+
+from .backends import DenseViews, as_backend
+from .medoids import MedoidSearch, one_hot
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(DIRECTORY, '_kernel.c')
+HEADER = os.path.join(DIRECTORY, '_kernel_impl.h')
+LIBRARY = os.path.join(DIRECTORY, '_kernel' + (sysconfig.get_config_var('SHLIB_SUFFIX') or '.so'))
+
+# Sufixo das funções de _kernel.c por tipo das visões
+SUFFIXES = {np.float64: 'f64', np.float32: 'f32'}
+
+# Biblioteca carregada (None: ainda não tentou; False: indisponível)
+_library = None
+
+# Limite de threads do núcleo neste processo (None: padrão do OpenMP)
+_threads = None
+
+_int64_array = np.ctypeslib.ndpointer(np.int64, flags='C_CONTIGUOUS')
+_float64_array = np.ctypeslib.ndpointer(np.float64, flags='C_CONTIGUOUS')
+
+
+def build_kernel(compiler=None, output=LIBRARY):
+    """
+    Compila _kernel.c como biblioteca compartilhada
+
+    Passo explícito de instalação (python -m mrdca.cli --build-kernel): load
+    nunca compila. Tenta com OpenMP e, se o compilador não suportar -fopenmp, compila a
+    versão sequencial.
+
+    Args:
+        compiler: Compilador C (padrão: $CC ou cc)
+        output: Caminho da biblioteca gerada
+
+    Returns:
+        Caminho da biblioteca
+    """
+    compiler = compiler or os.environ.get('CC', 'cc')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    # Compila em arquivo temporário e substitui de uma vez (escrita atômica)
+    temporary = f'{output}.{os.getpid()}.tmp'
+    command = [compiler, '-O3', '-shared', '-fPIC', '-o', temporary, SOURCE, '-lm']
+    try:
+        subprocess.run(command[:2] + ['-fopenmp'] + command[2:], check=True,
+                       capture_output=True)
+    except subprocess.CalledProcessError:
+        subprocess.run(command, check=True, capture_output=True)
+    os.replace(temporary, output)
+    return output
+
+
+def _declare(library):
+    """Assinaturas das funções exportadas"""
+    for suffix in SUFFIXES.values():
+        getattr(library, f'cluster_totals_{suffix}').argtypes = [
+            ctypes.c_void_p, ctypes.c_int64, ctypes.c_int64, _int64_array, _int64_array,
+            ctypes.c_int64, _float64_array]
+        getattr(library, f'assign_objects_{suffix}').argtypes = [
+            ctypes.c_void_p, ctypes.c_int64, ctypes.c_int64, _int64_array, ctypes.c_int64,
+            _float64_array, _int64_array]
+        getattr(library, f'cluster_sums_{suffix}').argtypes = [
+            ctypes.c_void_p, ctypes.c_int64, ctypes.c_int64, _int64_array, ctypes.c_int64,
+            _float64_array]
+        getattr(library, f'update_sums_{suffix}').argtypes = [
+            ctypes.c_void_p, ctypes.c_int64, ctypes.c_int64, _int64_array, ctypes.c_int64,
+            _int64_array, _int64_array, ctypes.c_int64, _float64_array]
+    library.select_medoids.argtypes = [
+        _float64_array, ctypes.c_int64, ctypes.c_int64, _int64_array, ctypes.c_int64,
+        _float64_array, _int64_array, _float64_array]
+    library.kernel_threads.restype = ctypes.c_int
+    library.set_kernel_threads.argtypes = [ctypes.c_int]
+    if _threads is not None:
+        library.set_kernel_threads(_threads)
+    return library
+
+
+def library_path():
+    """Biblioteca carregada em tempo de execução ($MRDCA_KERNEL_LIBRARY ou a do pacote)"""
+    return os.environ.get('MRDCA_KERNEL_LIBRARY') or LIBRARY
+
+
+def load(path=None):
+    """
+    Carrega a biblioteca já compilada (nunca compila)
+
+    Args:
+        path: Biblioteca a carregar no lugar da atual (padrão: library_path(),
+            carregada uma única vez por processo)
+
+    Returns:
+        ctypes.CDLL ou None se o núcleo estiver indisponível
+    """
+    global _library
+    if path is not None:
+        _library = None
+    if _library is None:
+        _library = False
+        path = path or library_path()
+        if os.environ.get('MRDCA_KERNEL', '1') != '0' and os.path.exists(path):
+            try:
+                if (os.path.exists(SOURCE) and os.path.getmtime(path)
+                        < max(os.path.getmtime(SOURCE), os.path.getmtime(HEADER))):
+                    raise OSError("biblioteca mais antiga que _kernel.c")
+                _library = _declare(ctypes.CDLL(path))
+            except (OSError, AttributeError) as error:
+                warnings.warn(f"Núcleo compilado ignorado ({path}: {error}); "
+                              f"recompile com python -m mrdca.cli --build-kernel")
+                _library = False
+    return _library or None
+
+
+def available():
+    """Indica se o núcleo compilado pode ser usado"""
+    return load() is not None
+
+
+def limit_threads(threads):
+    """
+    Limita as threads do núcleo neste processo (ex.: em cada processo de
+    um pool), agora ou quando a biblioteca for carregada
+
+    Args:
+        threads: Número de threads (None volta ao padrão só para cargas futuras)
+    """
+    global _threads
+    _threads = threads
+    if threads is not None and _library:
+        _library.set_kernel_threads(threads)
+
+
+def n_threads():
+    """Threads usadas pelo núcleo (0 se indisponível)"""
+    library = load()
+    return library.kernel_threads() if library is not None else 0
+
+
+def _labels(labels):
+    return np.ascontiguousarray(labels, dtype=np.int64)
+
+
+class CompiledViews:
+    """
+    Passos do MRDCA-RWL executados pelo núcleo compilado
+
+    Args:
+        library: Biblioteca carregada por load()
+        views: DenseViews em float64 ou float32 com matrizes contíguas
+    """
+
+    def __init__(self, library, views):
+        self.library = library
+        self.views = views
+        self.n_views = views.n_views
+        self.n_objects = views.n_objects
+        self.suffix = SUFFIXES[views.storage_dtype]
+        # Vetor de ponteiros para as visões (mantém referência aos buffers)
+        self.pointers = (ctypes.c_void_p * self.n_views)(
+            *[matrix.ctypes.data for matrix in views.views])
+
+    def call(self, name, *args):
+        getattr(self.library, f'{name}_{self.suffix}')(
+            self.pointers, self.n_views, self.n_objects, *args)
+
+    def cluster_totals(self, labels, prototypes, n_clusters):
+        """Somas T_kj (K, p), como engine.cluster_totals"""
+        totals = np.empty((n_clusters, self.n_views))
+        self.call('cluster_totals', _labels(labels), _labels(prototypes), n_clusters, totals)
+        return totals
+
+    def assign_objects(self, prototypes, lambdas):
+        """Rótulos de menor distância ponderada, como engine.assign_objects"""
+        labels = np.empty(self.n_objects, dtype=np.int64)
+        self.call('assign_objects', _labels(prototypes), len(prototypes),
+                  np.ascontiguousarray(lambdas, dtype=np.float64), labels)
+        return labels.astype(np.intp, copy=False)
+
+    def cluster_sums(self, labels, n_clusters):
+        """Somas por cluster (p, n, K), como ViewBackend.cluster_sums"""
+        sums = np.empty((self.n_views, self.n_objects, n_clusters))
+        self.call('cluster_sums', _labels(labels), n_clusters, sums)
+        return sums
+
+    def update_sums(self, sums, moved, old_labels, new_labels):
+        """Move os objetos indicados nas somas (in-place)"""
+        self.call('update_sums', _labels(moved), len(moved), _labels(old_labels),
+                  _labels(new_labels), sums.shape[2], sums)
+
+    def select_medoids(self, sums, labels, lambdas):
+        """
+        Medoide ponderado de cada cluster a partir das somas
+
+        Returns:
+            Tupla (protótipos, custos)
+        """
+        n_clusters = sums.shape[2]
+        prototypes = np.empty(n_clusters, dtype=np.int64)
+        costs = np.empty(n_clusters)
+        self.library.select_medoids(sums, self.n_views, self.n_objects, _labels(labels),
+                                    n_clusters, np.ascontiguousarray(lambdas, dtype=np.float64),
+                                    prototypes, costs)
+        return prototypes.astype(np.intp, copy=False), costs
+
+
+class CompiledSearch(MedoidSearch):
+    """
+    Busca exata de medoides com somas mantidas pelo núcleo compilado
+
+    Args:
+        compiled: CompiledViews das visões usadas no ajuste
+    """
+
+    def __init__(self, compiled):
+        super().__init__('exact')
+        self.compiled = compiled
+
+    def update_sums(self, views, labels, n_clusters):
+        moved = None
+        if self.sums is not None and self.sums.shape[2] == n_clusters:
+            moved = np.flatnonzero(labels != self.labels)
+        if moved is None or 2 * len(moved) > len(labels):
+            self.sums = self.compiled.cluster_sums(labels, n_clusters)
+        elif len(moved):
+            self.compiled.update_sums(self.sums, moved, self.labels, labels)
+        self.labels = labels.copy()
+        return self.sums
+
+    def select(self, views, labels, n_clusters, members, lambdas=None):
+        if lambdas is None:
+            lambdas = np.ones((n_clusters, views.n_views))
+        changed = self.changed_clusters(labels, n_clusters, lambdas)
+        sums = self.update_sums(views, labels, n_clusters)
+        if changed is None:
+            self.prototypes, self.costs = self.compiled.select_medoids(sums, labels, lambdas)
+            self.n_changed = n_clusters
+        else:
+            # Poucos clusters alterados: só os membros deles são avaliados
+            self.prototypes, self.costs = self.select_sums(sums, members, lambdas, changed)
+        self.lambdas = lambdas.copy()
+        return self.prototypes
+
+
+def bind(views):
+    """
+    Prepara o núcleo compilado para um conjunto de visões
+
+    Args:
+        views: Backend de visões, tensor (p, n, n) ou lista de matrizes
+
+    Returns:
+        CompiledViews, ou None se o núcleo estiver indisponível ou o
+        backend não for suportado
+    """
+    library = load()
+    views = as_backend(views)
+    if (library is None or not isinstance(views, DenseViews)
+            or views.storage_dtype not in SUFFIXES
+            or not all(matrix.flags.c_contiguous for matrix in views.views)):
+        return None
+    return CompiledViews(library, views)
+
+
+def check_parity(datasets=None, n_clusters=None, seeds=range(5), verbose=True):
+    """
+    Compara o núcleo compilado com a implementação NumPy
+
+    Para cada conjunto de dados e seed, confere cada passo isolado
+    (somas T_kj, alocação, somas por cluster e medoides) e o ajuste
+    completo de engine.fit com e sem o núcleo.
+
+    Args:
+        datasets: Dicionário {nome: dados (n, d)} (padrão: Iris, Wine e
+            Digits do scikit-learn)
+        n_clusters: Dicionário {nome: K} (padrão: número de classes)
+        seeds: Seeds testadas
+        verbose: Se True, imprime um resumo por conjunto
+
+    Returns:
+        Lista de dicionários com as diferenças máximas de cada passo e a
+        concordância (ARI) entre as partições finais
+    """
+    from sklearn.metrics import adjusted_rand_score
+
+    from . import engine
+    from .views import build_views
+
+    if not available():
+        raise RuntimeError("Núcleo compilado indisponível (python -m mrdca.cli --build-kernel)")
+    if datasets is None:
+        from sklearn.datasets import load_digits, load_iris, load_wine
+        loaded = {'Iris': load_iris(), 'Wine': load_wine(), 'Digits': load_digits()}
+        datasets = {name: bunch.data for name, bunch in loaded.items()}
+        n_clusters = {name: len(np.unique(bunch.target)) for name, bunch in loaded.items()}
+
+    report = []
+    for name, data in datasets.items():
+        K = n_clusters[name]
+        for dtype in SUFFIXES:
+            views = DenseViews(build_views(data), dtype=dtype)
+            compiled = bind(views)
+            tolerance = 1e-9 if dtype == np.float64 else 1e-4
+            for seed in seeds:
+                rng = np.random.default_rng(seed)
+                labels = rng.integers(0, K, len(data))
+                prototypes = rng.choice(len(data), K, replace=False)
+                columns = views.columns(prototypes)
+
+                totals = engine.cluster_totals(columns, labels, K)
+                lambdas = engine.lambda_weights(totals)
+                sums = views.cluster_sums(one_hot(labels, K))
+                compiled_sums = compiled.cluster_sums(labels, K)
+                moved = rng.choice(len(data), len(data) // 10, replace=False)
+                new_labels = labels.copy()
+                new_labels[moved] = rng.integers(0, K, len(moved))
+                compiled.update_sums(compiled_sums, moved, labels, new_labels)
+                new_sums = views.cluster_sums(one_hot(new_labels, K))
+
+                search = MedoidSearch()
+                expected = search.select(views, new_labels, K,
+                                         engine.cluster_members(new_labels, K), lambdas)
+                found, costs = compiled.select_medoids(compiled_sums, new_labels, lambdas)
+
+                reference = engine.fit(views, K, random_state=seed, use_kernel=False)
+                accelerated = engine.fit(views, K, random_state=seed, use_kernel=True)
+                scale = np.abs(totals).max()
+                result = {
+                    'Dataset': name,
+                    'Tipo': np.dtype(dtype).name,
+                    'Seed': seed,
+                    'Totais': float(np.abs(compiled.cluster_totals(labels, prototypes, K)
+                                           - totals).max() / scale),
+                    'Alocacao': float(np.mean(compiled.assign_objects(prototypes, lambdas)
+                                              != engine.assign_objects(columns, lambdas))),
+                    'Somas': float(np.abs(compiled_sums - new_sums).max() / new_sums.max()),
+                    'Medoides': float(np.mean(found != expected)),
+                    'Custos': float(np.abs(costs - search.costs).max() / search.costs.max()),
+                    'ARI_Ajuste': adjusted_rand_score(reference[0], accelerated[0]),
+                    'Objetivo': abs(accelerated[4][-1] - reference[4][-1]) / reference[4][-1],
+                }
+                result['OK'] = bool(result['Totais'] < tolerance and result['Somas'] < tolerance
+                                    and result['Custos'] < tolerance)
+                report.append(result)
+            if verbose:
+                rows = [r for r in report if r['Dataset'] == name
+                        and r['Tipo'] == np.dtype(dtype).name]
+                print(f"{name} ({np.dtype(dtype).name}): "
+                      f"passos OK em {sum(r['OK'] for r in rows)}/{len(rows)}, "
+                      f"alocações divergentes {max(r['Alocacao'] for r in rows):.4f}, "
+                      f"medoides divergentes {max(r['Medoides'] for r in rows):.4f}, "
+                      f"ARI mínimo do ajuste {min(r['ARI_Ajuste'] for r in rows):.4f}")
+    return report
+
@@ -0,0 +1,255 @@
+"""
+K-means multi-visão no espaço de atributos, com pesos por visão.
+
+Companheiro de mrdca.engine quando os atributos brutos estão disponíveis e
+n é grande demais para as matrizes n x n: cada visão j tem seus próprios
+atributos X_j (n, d_j) e centróides c_kj, e o critério é o do MRDCA-RWL
+com distâncias euclidianas quadráticas aos centróides no lugar das
+dissimilaridades aos medoides:
+
+    J = soma_k soma_j lambda_kj * soma_{i em C_k} ||x_ij - c_kj||^2
+
+Os pesos seguem a mesma restrição de produto 1 (engine.lambda_weights),
+por cluster (weights='cluster') ou um único vetor para todos os clusters
+(weights='global'). Cada passo minimiza J em uma das variáveis, então J
+não cresce, e a convergência é declarada quando sua redução relativa fica
+abaixo de tol.
+
+As distâncias de um bloco de linhas aos K centróides saem da expansão
+||x||^2 - 2 x.c + ||c||^2, com um produto de matrizes (BLAS) por visão, e
+os totais T_kj de soma_i ||x_i||^2 - n_k ||c_k||^2. As duas subtrações
+perdem precisão quando os atributos têm um deslocamento grande em
+relação à sua dispersão, então cada visão é centrada uma vez (cópia dos
+dados menos a média global, que não muda distâncias nem pesos) e normas
+e totais são acumulados em float64, mesmo com visões em float32. A
+alocação e as somas dos novos centróides são feitas na mesma passada
+pelos blocos, então cada iteração lê os dados uma vez, em O(n * K * d)
+operações e O(bloco * K) de memória. As visões de cada bloco podem ser
+processadas em paralelo por um pool de threads (NumPy e BLAS liberam o GIL).
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .engine import lambda_weights, normalize_lambdas
+from .medoids import one_hot
+
+WEIGHTS = ('cluster', 'global')
+
+INITS = ('kmeans++', 'random')
+
+# Linhas processadas por bloco em cada passada
+CHUNK_ROWS = 65536
+
+# Totais T_kj até esta fração de soma ||x||^2 do cluster são arredondamento
+# de um cluster sem dispersão na visão e viram zero (pesos iguais, como em
+# engine.fit)
+ZERO_SPREAD = 1e-12
+
+
+def as_feature_views(views):
+    """
+    Normaliza as visões para uma lista de arrays float (n, d_j)
+
+    Args:
+        views: Lista de arrays (n, d_j) ou um único array (n, d)
+
+    Returns:
+        Lista de arrays contíguos em float32 ou float64
+    """
+    if isinstance(views, np.ndarray):
+        views = [views]
+    arrays = []
+    for view in views:
+        view = np.asarray(view)
+        if view.ndim == 1:
+            view = view[:, None]
+        dtype = view.dtype if view.dtype in (np.float32, np.float64) else np.float64
+        arrays.append(np.ascontiguousarray(view, dtype=dtype))
+    if len({len(view) for view in arrays}) != 1:
+        raise ValueError("Todas as visões devem ter o mesmo número de objetos")
+    return arrays
+
+
+def squared_distances(rows, row_norms, centers, center_norms):
+    """
+    Distâncias euclidianas quadráticas pela expansão ||x||^2 - 2 x.c + ||c||^2
+
+    Args:
+        rows: Atributos (b, d)
+        row_norms: ||x||^2 de cada linha (b,)
+        centers: Centróides (K, d)
+        center_norms: ||c||^2 de cada centróide (K,)
+
+    Returns:
+        Array (b, K), sem valores negativos de arredondamento
+    """
+    distances = rows @ centers.T
+    distances *= -2
+    distances += row_norms[:, None]
+    distances += center_norms[None, :]
+    return np.maximum(distances, 0, out=distances)
+
+
+def kmeans_plus_plus(views, norms, n_clusters, rng):
+    """
+    Sementes com probabilidade proporcional à distância (soma das visões)
+
+    Args:
+        views: Lista de arrays (n, d_j)
+        norms: ||x||^2 de cada objeto em cada visão
+        n_clusters: Número de clusters
+        rng: Gerador de números aleatórios
+
+    Returns:
+        Índices das K sementes
+    """
+    n_objects = len(views[0])
+    seeds = [int(rng.integers(n_objects))]
+    nearest = np.full(n_objects, np.inf)
+    for _ in range(1, n_clusters):
+        seed = seeds[-1]
+        distance = sum(squared_distances(view, norm, view[[seed]], norm[[seed]])[:, 0]
+                       for view, norm in zip(views, norms))
+        nearest = np.minimum(nearest, distance)
+        total = nearest.sum()
+        if total > 0:
+            seeds.append(int(rng.choice(n_objects, p=nearest / total)))
+        else:
+            seeds.append(int(rng.integers(n_objects)))
+    return np.asarray(seeds, dtype=np.intp)
+
+
+def fit_kmeans(views, n_clusters, max_iter=100, tol=1e-4, weights='cluster',
+               init='kmeans++', random_state=None, n_jobs=1, chunk_rows=CHUNK_ROWS,
+               verbose=False):
+    """
+    Executa o k-means multi-visão com pesos por visão
+
+    Args:
+        views: Lista de arrays de atributos (n, d_j), um por visão
+        n_clusters: Número de clusters
+        max_iter: Número máximo de iterações
+        tol: Redução relativa mínima do critério para continuar iterando
+        weights: 'cluster' (pesos de cada cluster, como no MRDCA-RWL) ou
+            'global' (um peso por visão para todos os clusters)
+        init: 'kmeans++' ou 'random' (K objetos sorteados como centróides)
+        random_state: Seed para reprodutibilidade
+        n_jobs: Threads para processar as visões (1 = sequencial, None =
+            todos os núcleos)
+        chunk_rows: Linhas processadas por bloco
+        verbose: Se True, imprime o critério a cada iteração
+
+    Returns:
+        Tupla (labels, lambdas, centers, iterations, objectives), com
+        lambdas (K, p) normalizados para soma 1, centers com os centróides
+        (K, d_j) de cada visão e o critério J de cada iteração
+    """
+    if weights not in WEIGHTS:
+        raise ValueError(f"Pesos desconhecidos: {weights}")
+    if init not in INITS:
+        raise ValueError(f"Inicialização desconhecida: {init}")
+    views = as_feature_views(views)
+    n_objects, n_views = len(views[0]), len(views)
+    if not 1 <= n_clusters <= n_objects:
+        raise ValueError(f"Número de clusters inválido: {n_clusters}")
+    rng = np.random.default_rng(random_state)
+    # Visões centradas: ||x||^2 e ||c||^2 ficam na escala da dispersão
+    offsets = [view.mean(axis=0, dtype=np.float64) for view in views]
+    views = [(view - offset).astype(view.dtype, copy=False)
+             for view, offset in zip(views, offsets)]
+    norms = [np.einsum('ij,ij->i', view, view, dtype=np.float64) for view in views]
+
+    if init == 'kmeans++':
+        seeds = kmeans_plus_plus(views, norms, n_clusters, rng)
+    else:
+        seeds = rng.choice(n_objects, n_clusters, replace=False)
+    centers = [view[seeds].astype(np.float64) for view in views]
+    lambdas = np.ones((n_clusters, n_views))
+
+    pool = None
+    if n_jobs != 1 and n_views > 1:
+        pool = ThreadPoolExecutor(max_workers=min(n_views, n_jobs or os.cpu_count()))
+    run = pool.map if pool is not None else map
+
+    def assign_and_accumulate(centers, lambdas):
+        """Uma passada: aloca os objetos e acumula as somas dos novos centróides"""
+        center_norms = [np.einsum('kd,kd->k', center, center) for center in centers]
+        labels = np.empty(n_objects, dtype=np.intp)
+        sums = [np.zeros((n_clusters, view.shape[1])) for view in views]
+        square_sums = np.zeros((n_clusters, n_views))
+        for start in range(0, n_objects, chunk_rows):
+            stop = min(start + chunk_rows, n_objects)
+
+            def distances(view):
+                return squared_distances(views[view][start:stop], norms[view][start:stop],
+                                         centers[view].astype(views[view].dtype, copy=False),
+                                         center_norms[view])
+
+            weighted = np.zeros((stop - start, n_clusters))
+            for view, block in enumerate(run(distances, range(n_views))):
+                weighted += block * lambdas[:, view]
+            chunk_labels = weighted.argmin(axis=1)
+            labels[start:stop] = chunk_labels
+            indicator = one_hot(chunk_labels, n_clusters)
+
+            def accumulate(view):
+                sums[view] += indicator.T @ views[view][start:stop]
+                square_sums[:, view] += np.bincount(chunk_labels, norms[view][start:stop],
+                                                    minlength=n_clusters)
+
+            list(run(accumulate, range(n_views)))
+        return labels, sums, square_sums
+
+    def update_centers(labels, sums, square_sums, centers):
+        """Novos centróides (médias) e totais T_kj = soma dos ||x - c||^2"""
+        sizes = np.bincount(labels, minlength=n_clusters)
+        filled = sizes > 0
+        new_centers = []
+        totals = np.zeros((n_clusters, n_views))
+        for view in range(n_views):
+            # Clusters vazios mantêm o centróide anterior
+            center = centers[view].copy()
+            center[filled] = sums[view][filled] / sizes[filled, None]
+            new_centers.append(center)
+            totals[:, view] = square_sums[:, view] - sizes * np.einsum('kd,kd->k', center, center)
+        # Com dados centrados e somas em float64, o que sobra perto de zero
+        # (com qualquer sinal) é arredondamento de clusters sem dispersão
+        totals[totals <= ZERO_SPREAD * square_sums] = 0
+        return new_centers, totals
+
+    try:
+        # Partição inicial: objetos nas sementes mais próximas (pesos iguais)
+        labels, sums, square_sums = assign_and_accumulate(centers, lambdas)
+        centers, totals = update_centers(labels, sums, square_sums, centers)
+        objective = totals.sum()
+        objectives = []
+        iterations = 0
+        for iteration in range(max_iter):
+            iterations = iteration + 1
+            if weights == 'cluster':
+                lambdas = lambda_weights(totals)
+            else:
+                lambdas = np.repeat(lambda_weights(totals.sum(axis=0, keepdims=True)),
+                                    n_clusters, axis=0)
+            previous = labels
+            labels, sums, square_sums = assign_and_accumulate(centers, lambdas)
+            centers, totals = update_centers(labels, sums, square_sums, centers)
+            new_objective = float((lambdas * totals).sum())
+            objectives.append(new_objective)
+            if verbose:
+                moved = np.count_nonzero(labels != previous)
+                print(f"Iteração {iterations}: J = {new_objective:.6f}, {moved} objetos movidos")
+            converged = objective - new_objective <= tol * abs(objective)
+            objective = new_objective
+            if converged:
+                if verbose:
+                    print("Convergiu!")
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    centers = [center + offset for center, offset in zip(centers, offsets)]
+    return labels, normalize_lambdas(lambdas), centers, iterations, objectives
@@ -0,0 +1,91 @@
+"""
+Visões de dissimilaridade calculadas sob demanda a partir dos dados.
+
+A alocação e os pesos lambda só leem as K colunas dos protótipos em cada
+visão, então LazyViews nunca materializa as matrizes n x n: cada coluna é
+calculada dos atributos originais quando pedida e guardada em um cache
+LRU (os protótipos mudam pouco entre iterações). A busca de medoides usa
+blocos membros x membros de cada cluster, calculados em partes e
+descartados. A memória por iteração fica em O(n * K * p).
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from .backends import ViewBackend
+from .medoids import BLOCK_ELEMENTS
+from .views import as_view_specs
+
+
+class LazyViews(ViewBackend):
+    """
+    Backend que calcula distâncias dos atributos originais sob demanda
+
+    Args:
+        data: Dados de entrada (n, d)
+        metrics: Visões: nomes de métricas, tuplas (atributos, métrica)
+            ou ViewSpec (ver mrdca.views)
+        dtype: float64 ou float32
+        cache_columns: Número de colunas mantidas no cache LRU
+    """
+
+    incremental_sums = False
+
+    def __init__(self, data, metrics=('euclidean', 'cityblock'), dtype=np.float64,
+                 cache_columns=64):
+        self.data = np.asarray(data)
+        self.metrics = as_view_specs(metrics)
+        self.features = [spec.select(self.data) for spec in self.metrics]
+        self.storage_dtype = np.dtype(dtype).type
+        if self.storage_dtype not in (np.float64, np.float32):
+            raise ValueError(f"Precisão não suportada: {dtype}")
+        self.scales = [1.0] * len(self.metrics)
+        self.n_views = len(self.metrics)
+        self.n_objects = len(self.data)
+        self.cache_columns = cache_columns
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + sum(column.nbytes for column in self.cache.values())
+
+    def distances(self, view, rows, cols):
+        """Calcula d_view(rows, cols) a partir dos atributos"""
+        features = self.features[view]
+        return self.metrics[view].distances(features[rows], features[cols]).astype(
+            self.storage_dtype, copy=False)
+
+    def raw_block(self, view, rows, cols):
+        return self.distances(view, np.asarray(rows), np.asarray(cols))
+
+    def columns(self, index):
+        index = [int(obj) for obj in index]
+        missing = [obj for obj in dict.fromkeys(index) if obj not in self.cache]
+        self.hits += len(index) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            computed = np.stack([self.distances(view, slice(None), missing)
+                                 for view in range(self.n_views)])
+            for position, obj in enumerate(missing):
+                self.cache[obj] = np.ascontiguousarray(computed[:, :, position])
+        for obj in index:
+            self.cache.move_to_end(obj)
+        columns = np.stack([self.cache[obj] for obj in index], axis=2)
+
+        while len(self.cache) > self.cache_columns:
+            self.cache.popitem(last=False)
+        return columns
+
+    def cluster_sums(self, indicator):
+        # Blocos calculados e descartados, sem passar pelo cache de colunas
+        indicator = indicator.astype(self.dtype)
+        everyone = np.arange(self.n_objects)
+        step = max(1, BLOCK_ELEMENTS // self.n_objects)
+        sums = np.empty((self.n_views, self.n_objects, indicator.shape[1]))
+        for start in range(0, self.n_objects, step):
+            rows = everyone[start:start + step]
+            sums[:, rows, :] = self.block(rows, everyone) @ indicator
+        return sums
@@ -0,0 +1,331 @@
+"""
+Busca de protótipos (medoides) para o MRDCA-RWL.
+
+O protótipo de C_k é o membro que minimiza a soma ponderada
+soma_j lambda_kj * soma_{o em C_k} d_j(i, o). A busca exata mantém, para
+cada visão, a soma das dissimilaridades de todo objeto a cada cluster:
+sums[j, i, k] = soma de d_j(i, o) para o em C_k. Quando poucos objetos mudam
+de cluster as somas são atualizadas apenas com as colunas desses objetos,
+em O(p * n * m) para m objetos movidos em vez de O(p * |C|^2).
+
+Com incremental=True (padrão) a busca também lembra a partição e os
+pesos da seleção anterior e só refaz o medoide dos clusters que
+ganharam ou perderam objetos ou cujos pesos mudaram; os demais mantêm
+protótipo e custo. As mesmas somas dão os totais T_kj da fórmula dos
+pesos lambda (T_kj = sums[j, g_k, k]), então engine.fit não precisa
+percorrer os n objetos para recalcular os pesos. Nas iterações finais,
+quando poucos objetos mudam, esses dois passos custam proporcionalmente
+à mudança e não a n.
+
+Backends sem somas baratas sobre todas as linhas (incremental_sums=False,
+como mrdca.lazy.LazyViews) usam a busca exata por blocos: só os blocos
+membros x membros de cada cluster são calculados.
+
+Os modos aproximados avaliam só uma amostra de candidatos ('sample') ou
+fazem trocas aleatórias limitadas a partir do medoide atual, no estilo
+CLARANS ('clarans'). Com verify=True o custo do medoide aproximado é
+comparado com o ótimo exato e a diferença relativa é guardada em gaps.
+"""
+import numpy as np
+
+METHODS = ('exact', 'sample', 'clarans')
+
+# Objetos movidos processados por vez na atualização incremental das somas
+UPDATE_CHUNK = 256
+
+# Tamanho máximo (candidatos x membros) de cada bloco avaliado de uma vez
+BLOCK_ELEMENTS = 2 ** 22
+
+
+def one_hot(labels, n_clusters, dtype=np.float64):
+    """
+    Codifica o vetor de rótulos como matriz indicadora (n, K)
+
+    Args:
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters
+        dtype: Tipo do array de saída
+
+    Returns:
+        Matriz (n, K) com 1 na coluna do cluster de cada objeto
+    """
+    indicator = np.zeros((len(labels), n_clusters), dtype=dtype)
+    indicator[np.arange(len(labels)), labels] = 1
+    return indicator
+
+
+def weighted_scores(sums, cluster, k, weights):
+    """
+    Custo soma_j w_j * sums[j, i, k] de cada membro i do cluster k
+
+    As visões são somadas em ordem, como no núcleo compilado, para que os
+    dois caminhos escolham o mesmo medoide em caso de empate.
+
+    Args:
+        sums: Somas por visão e cluster (p, n, K)
+        cluster: Membros do cluster
+        k: Índice do cluster
+        weights: Pesos lambda do cluster, um por visão
+
+    Returns:
+        Array com o custo de cada membro
+    """
+    scores = weights[0] * sums[0, cluster, k]
+    for j in range(1, len(weights)):
+        scores += weights[j] * sums[j, cluster, k]
+    return scores
+
+
+def medoid_costs(views, candidates, members, weights=None):
+    """
+    Soma ponderada das dissimilaridades de cada candidato aos membros
+
+    Args:
+        views: Backend de visões
+        candidates: Índices dos candidatos
+        members: Índices dos membros do cluster
+        weights: Pesos lambda do cluster, um por visão (padrão: 1)
+
+    Returns:
+        Array com o custo de cada candidato
+    """
+    if weights is None:
+        weights = np.ones(views.n_views)
+    # Candidatos em blocos para limitar a memória do bloco candidatos x membros
+    step = max(1, BLOCK_ELEMENTS // max(len(members), 1))
+    return np.concatenate([
+        weights @ views.block(candidates[start:start + step], members).sum(axis=2, dtype=np.float64)
+        for start in range(0, len(candidates), step)])
+
+
+class MedoidSearch:
+    """
+    Seleção de protótipos com cache incremental e modos aproximados
+
+    Args:
+        method: 'exact', 'sample' ou 'clarans'
+        n_candidates: Candidatos avaliados por cluster nos modos aproximados
+        max_swaps: Rodadas de troca sem melhora antes de parar ('clarans')
+        verify: Se True, compara cada medoide aproximado com o exato
+        random_state: Seed para a amostragem de candidatos
+        incremental: Se True, a busca exata só refaz os clusters que
+            mudaram desde a seleção anterior
+    """
+
+    def __init__(self, method='exact', n_candidates=64, max_swaps=4,
+                 verify=False, random_state=None, incremental=True):
+        if method not in METHODS:
+            raise ValueError(f"Método de busca desconhecido: {method}")
+        self.method = method
+        self.n_candidates = n_candidates
+        self.max_swaps = max_swaps
+        self.verify = verify
+        self.incremental = incremental
+        self.rng = np.random.default_rng(random_state)
+        self.gaps = []
+        self.reset()
+
+    def reset(self):
+        """Descarta as somas em cache (necessário ao trocar de visões)"""
+        self.sums = None
+        self.labels = None
+        self.lambdas = None
+        self.prototypes = None
+        self.costs = None
+        self.n_changed = 0
+
+    def changed_clusters(self, labels, n_clusters, lambdas):
+        """
+        Clusters cujo medoide pode ter mudado desde a seleção anterior
+
+        Um cluster precisa de nova busca se ganhou ou perdeu objetos ou se
+        seus pesos mudaram; caso contrário o medoide e o custo são os mesmos.
+
+        Args:
+            labels: Vetor de rótulos (0..K-1)
+            n_clusters: Número de clusters
+            lambdas: Pesos (K, p) da seleção atual
+
+        Returns:
+            Máscara (K,) dos clusters alterados, ou None se todos precisam
+            ser recalculados
+        """
+        if (not self.incremental or self.prototypes is None or self.labels is None
+                or len(self.prototypes) != n_clusters or len(self.labels) != len(labels)):
+            return None
+        moved = np.flatnonzero(labels != self.labels)
+        changed = np.any(lambdas != self.lambdas, axis=1)
+        changed[self.labels[moved]] = True
+        changed[labels[moved]] = True
+        return changed
+
+    def cluster_totals(self, labels, prototypes):
+        """
+        Totais T_kj da fórmula dos pesos lambda a partir das somas em cache
+
+        Args:
+            labels: Vetor de rótulos (0..K-1)
+            prototypes: Vetor com o protótipo de cada cluster
+
+        Returns:
+            Array (K, p) com T_kj = sums[j, g_k, k], ou None se as somas
+            não corresponderem a labels
+        """
+        if (not self.incremental or self.sums is None or self.labels is None
+                or self.sums.shape[2] != len(prototypes)
+                or not np.array_equal(labels, self.labels)):
+            return None
+        return self.sums[:, prototypes, np.arange(len(prototypes))].T
+
+    def update_sums(self, views, labels, n_clusters):
+        """
+        Atualiza as somas por visão e cluster para a nova partição
+
+        Args:
+            views: Backend de visões
+            labels: Vetor de rótulos (0..K-1)
+            n_clusters: Número de clusters
+
+        Returns:
+            Array (p, n, K) com as somas de dissimilaridade por cluster
+        """
+        moved = None
+        if self.sums is not None and self.sums.shape[2] == n_clusters:
+            moved = np.flatnonzero(labels != self.labels)
+        if moved is None or 2 * len(moved) > len(labels):
+            # Muitas mudanças: recalcular tudo lê as visões uma única vez
+            self.sums = views.cluster_sums(one_hot(labels, n_clusters))
+        else:
+            # Remove cada objeto movido do cluster antigo e soma no novo,
+            # em blocos para limitar a memória das colunas lidas
+            for start in range(0, len(moved), UPDATE_CHUNK):
+                chunk = moved[start:start + UPDATE_CHUNK]
+                delta = (one_hot(labels[chunk], n_clusters, views.dtype)
+                         - one_hot(self.labels[chunk], n_clusters, views.dtype))
+                self.sums += views.columns(chunk) @ delta
+        self.labels = labels.copy()
+        return self.sums
+
+    def select(self, views, labels, n_clusters, members, lambdas=None):
+        """
+        Seleciona o medoide ponderado de cada cluster
+
+        O custo de cada protótipo escolhido fica em self.costs; a soma
+        desses custos é o critério do MRDCA-RWL para a partição.
+
+        Args:
+            views: Backend de visões
+            labels: Vetor de rótulos (0..K-1)
+            n_clusters: Número de clusters
+            members: Lista com os objetos de cada cluster
+            lambdas: Pesos (K, p) de cada cluster (padrão: 1 em todas as visões)
+
+        Returns:
+            Vetor com o protótipo de cada cluster
+        """
+        if lambdas is None:
+            lambdas = np.ones((n_clusters, views.n_views))
+        if self.method == 'exact' and not views.incremental_sums:
+            changed = self.changed_clusters(labels, n_clusters, lambdas)
+            prototypes, costs = self.select_blocks(views, members, lambdas, changed)
+            self.labels = labels.copy()
+        elif self.method == 'exact':
+            changed = self.changed_clusters(labels, n_clusters, lambdas)
+            sums = self.update_sums(views, labels, n_clusters)
+            prototypes, costs = self.select_sums(sums, members, lambdas, changed)
+        else:
+            prototypes, costs = self.select_approximate(views, members, lambdas)
+            self.n_changed = n_clusters
+        self.prototypes = prototypes
+        self.costs = costs
+        self.lambdas = lambdas.copy()
+        return prototypes
+
+    def _previous(self, n_clusters, changed):
+        """Protótipos, custos e clusters a recalcular (todos se changed for None)"""
+        if changed is None:
+            self.n_changed = n_clusters
+            return (np.zeros(n_clusters, dtype=np.intp), np.zeros(n_clusters),
+                    range(n_clusters))
+        self.n_changed = int(np.count_nonzero(changed))
+        return self.prototypes.copy(), self.costs.copy(), np.flatnonzero(changed)
+
+    def select_sums(self, sums, members, lambdas, changed=None):
+        """Medoides exatos a partir das somas por cluster (só os alterados)"""
+        prototypes, costs, clusters = self._previous(len(members), changed)
+        for k in clusters:
+            cluster = members[k]
+            if len(cluster):
+                scores = weighted_scores(sums, cluster, k, lambdas[k])
+                best = np.argmin(scores)
+                prototypes[k], costs[k] = cluster[best], scores[best]
+            else:
+                prototypes[k], costs[k] = 0, 0.0
+        return prototypes, costs
+
+    def select_blocks(self, views, members, lambdas, changed=None):
+        """Medoides exatos calculando só os blocos internos de cada cluster"""
+        prototypes, costs, clusters = self._previous(len(members), changed)
+        for k in clusters:
+            cluster = members[k]
+            if len(cluster):
+                cluster_costs = medoid_costs(views, cluster, cluster, lambdas[k])
+                best = np.argmin(cluster_costs)
+                prototypes[k], costs[k] = cluster[best], cluster_costs[best]
+            else:
+                prototypes[k], costs[k] = 0, 0.0
+        return prototypes, costs
+
+    def select_approximate(self, views, members, lambdas):
+        """Medoides aproximados por amostragem ou trocas limitadas"""
+        previous = self.prototypes
+        prototypes = np.zeros(len(members), dtype=np.intp)
+        costs = np.zeros(len(members))
+        for k, cluster in enumerate(members):
+            if len(cluster) == 0:
+                continue
+            weights = lambdas[k]
+            if len(cluster) <= self.n_candidates:
+                cluster_costs = medoid_costs(views, cluster, cluster, weights)
+                best = np.argmin(cluster_costs)
+                prototypes[k], costs[k] = cluster[best], cluster_costs[best]
+                continue
+
+            current = None
+            if previous is not None and np.any(cluster == previous[k]):
+                current = previous[k]
+            if self.method == 'sample':
+                prototypes[k], costs[k] = self.sample_candidates(views, cluster, current, weights)
+            else:
+                prototypes[k], costs[k] = self.swap_search(views, cluster, current, weights)
+
+            if self.verify:
+                exact = medoid_costs(views, cluster, cluster, weights).min()
+                self.gaps.append((costs[k] - exact) / exact if exact > 0 else 0.0)
+        return prototypes, costs
+
+    def sample_candidates(self, views, cluster, current, weights):
+        """Avalia uma amostra de candidatos mais o medoide atual"""
+        candidates = self.rng.choice(cluster, self.n_candidates, replace=False)
+        if current is not None:
+            candidates = np.append(candidates, current)
+        costs = medoid_costs(views, candidates, cluster, weights)
+        best = np.argmin(costs)
+        return candidates[best], costs[best]
+
+    def swap_search(self, views, cluster, current, weights):
+        """Trocas aleatórias a partir do medoide atual (estilo CLARANS)"""
+        if current is None:
+            current = self.rng.choice(cluster)
+        current_cost = medoid_costs(views, [current], cluster, weights)[0]
+        failures = 0
+        while failures < self.max_swaps:
+            neighbors = self.rng.choice(cluster, self.n_candidates, replace=False)
+            costs = medoid_costs(views, neighbors, cluster, weights)
+            best = np.argmin(costs)
+            if costs[best] < current_cost:
+                current, current_cost = neighbors[best], costs[best]
+                failures = 0
+            else:
+                failures += 1
+        return current, current_cost
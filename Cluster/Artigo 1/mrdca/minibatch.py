@@ -0,0 +1,218 @@
+"""
+Variante mini-batch (estocástica) do MRDCA-RWL para n muito grande.
+
+Cada iteração sorteia um lote de objetos e só lê as dissimilaridades
+lote x protótipos. As estatísticas dos pesos lambda (as somas T_kj de
+compute_lambdas) viram médias correntes por cluster, atualizadas com uma
+taxa de aprendizado:
+
+- 'inverse': taxa = membros no lote / membros já vistos (média exata de
+  todos os lotes desde a última troca de protótipo)
+- 'constant': taxa fixa learning_rate (esquece lotes antigos)
+
+Cada cluster mantém um reservatório (amostragem de reservatório) com
+objetos alocados a ele; um objeto realocado a outro cluster em um lote
+posterior sai do reservatório antigo, então os reservatórios só guardam
+membros atuais (segundo a última alocação de cada objeto). Os protótipos
+são renovados escolhendo, entre o protótipo atual e os objetos do
+reservatório, o medoide ponderado do reservatório; quando o protótipo
+muda, a média do cluster é reiniciada com as distâncias do reservatório
+ao novo protótipo. Ao final, uma única passada completa aloca todos os
+objetos.
+
+O custo por iteração é O(p * (b * K + K * R^2)) para lotes de b objetos e
+reservatórios de R objetos, independente de n.
+"""
+import numpy as np
+
+from .backends import as_backend
+from .engine import assign_objects, cluster_totals, lambda_weights, normalize_lambdas
+from .initialization import initialize
+
+SCHEDULES = ('inverse', 'constant')
+
+
+def reservoir_update(reservoir, seen, filled, objects, rng):
+    """
+    Acrescenta objetos a um reservatório (algoritmo R)
+
+    Args:
+        reservoir: Array com os objetos do reservatório (capacidade fixa)
+        seen: Objetos já oferecidos ao reservatório
+        filled: Posições ocupadas (as primeiras do array)
+        objects: Novos objetos
+        rng: Gerador de números aleatórios
+
+    Returns:
+        Tupla (reservatório, objetos vistos, posições ocupadas)
+    """
+    capacity = len(reservoir)
+    free = max(0, min(capacity - filled, len(objects)))
+    reservoir[filled:filled + free] = objects[:free]
+    rest = objects[free:]
+    if len(rest):
+        # O i-ésimo objeto oferecido substitui uma posição com probabilidade capacity / i
+        slots = (rng.random(len(rest)) * (seen + free + np.arange(1, len(rest) + 1))).astype(np.intp)
+        keep = slots < capacity
+        reservoir[slots[keep]] = rest[keep]
+    return reservoir, seen + len(objects), filled + free
+
+
+def reservoir_remove(reservoir, filled, objects):
+    """
+    Retira objetos do reservatório (ex.: realocados a outro cluster)
+
+    Args:
+        reservoir: Array com os objetos do reservatório (compactado no lugar)
+        filled: Posições ocupadas
+        objects: Objetos a retirar
+
+    Returns:
+        Posições ocupadas depois da remoção
+    """
+    kept = reservoir[:filled][~np.isin(reservoir[:filled], objects)]
+    reservoir[:len(kept)] = kept
+    return len(kept)
+
+
+def refresh_prototype(views, k, prototypes, reservoir, weights, means, counts):
+    """
+    Renova o protótipo de um cluster a partir do seu reservatório
+
+    Args:
+        views: Backend de visões
+        k: Índice do cluster
+        prototypes: Protótipos (atualizado no lugar)
+        reservoir: Objetos do reservatório do cluster
+        weights: Pesos lambda do cluster
+        means: Médias correntes (atualizadas no lugar se o protótipo mudar)
+        counts: Membros vistos por cluster (idem)
+
+    Returns:
+        True se o protótipo mudou
+    """
+    candidates = np.append(reservoir, prototypes[k])
+    sums = views.block(candidates, reservoir).sum(axis=2, dtype=np.float64)
+    best = int(np.argmin(weights @ sums))
+    if candidates[best] == prototypes[k]:
+        return False
+    prototypes[k] = candidates[best]
+    # Estatísticas antigas eram do protótipo anterior: reinicia pelo reservatório
+    means[k] = sums[:, best] / len(reservoir)
+    counts[k] = len(reservoir)
+    return True
+
+
+def fit_minibatch(views, n_clusters, batch_size=1024, n_passes=3, schedule='inverse',
+                  learning_rate=0.1, reservoir_size=128, verbose=False,
+                  random_state=None, init='kmedoids++', init_prototypes=None):
+    """
+    Executa o MRDCA-RWL em lotes, com uma passada completa de alocação no fim
+
+    Args:
+        views: Backend de visões (mrdca.backends, mrdca.lazy ou
+            mrdca.outofcore) ou lista de matrizes de dissimilaridade
+        n_clusters: Número de clusters
+        batch_size: Objetos por lote
+        n_passes: Número de passadas sobre os dados (cada passada
+            percorre uma permutação dos objetos em lotes); para antes se
+            nenhum protótipo mudar durante uma passada inteira
+        schedule: Taxa de aprendizado das médias: 'inverse' ou 'constant'
+        learning_rate: Taxa usada com schedule='constant'
+        reservoir_size: Capacidade do reservatório de candidatos por cluster
+        verbose: Se True, imprime informações detalhadas
+        random_state: Seed para reprodutibilidade
+        init: Protótipos iniciais: 'kmedoids++', 'build' (lê n x n; evitar
+            com n grande) ou 'random' (K objetos distintos ao acaso)
+        init_prototypes: Protótipos iniciais para partida a quente
+
+    Returns:
+        Tupla (labels, lambdas, prototypes, iterations, objectives), no
+        formato de engine.fit. objectives traz a estimativa do critério J
+        em cada lote (escalada para n objetos) seguida do J exato da
+        passada final.
+    """
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Taxa de aprendizado desconhecida: {schedule}")
+    views = as_backend(views)
+    n_objects = views.n_objects
+    rng = np.random.default_rng(random_state)
+
+    if init_prototypes is not None or init != 'random':
+        _, _, prototypes = initialize(views, n_clusters, init, random_state,
+                                      init_prototypes=init_prototypes)
+    else:
+        prototypes = rng.choice(n_objects, n_clusters, replace=False)
+    prototypes = np.array(prototypes, dtype=np.intp)
+
+    # Médias correntes de d_j(membro, protótipo) e membros vistos por cluster
+    means = np.zeros((n_clusters, views.n_views))
+    counts = np.zeros(n_clusters)
+    reservoirs = [np.empty(reservoir_size, dtype=np.intp) for _ in range(n_clusters)]
+    seen = [0] * n_clusters
+    filled = [0] * n_clusters
+    # Último cluster de cada objeto (-1: ainda não sorteado em um lote)
+    assigned = np.full(n_objects, -1, dtype=np.intp)
+
+    objectives = []
+    iterations = 0
+    for epoch in range(n_passes):
+        changed = False
+        order = rng.permutation(n_objects)
+        for start in range(0, n_objects, batch_size):
+            iterations += 1
+            batch = order[start:start + batch_size]
+            lambdas = lambda_weights(means)
+
+            # Visões simétricas: protótipos x lote lê K linhas em vez de b
+            columns = views.block(prototypes, batch).transpose(0, 2, 1)
+            labels = assign_objects(columns, lambdas)
+            sizes = np.bincount(labels, minlength=n_clusters)
+            totals = cluster_totals(columns, labels, n_clusters)
+            objectives.append(float((lambdas * totals).sum()) * n_objects / len(batch))
+
+            present = sizes > 0
+            counts += sizes
+            if schedule == 'inverse':
+                rate = np.divide(sizes, counts, out=np.zeros(n_clusters), where=present)
+            else:
+                rate = np.where(counts == sizes, 1.0, learning_rate) * present
+            batch_means = totals / np.maximum(sizes, 1)[:, None]
+            means += rate[:, None] * (batch_means - means)
+
+            # Objetos que trocaram de cluster saem do reservatório antigo
+            previous = assigned[batch]
+            moved = (previous >= 0) & (previous != labels)
+            for k in np.unique(previous[moved]):
+                filled[k] = reservoir_remove(reservoirs[k], filled[k],
+                                             batch[moved & (previous == k)])
+            assigned[batch] = labels
+
+            for k in np.flatnonzero(present):
+                # Quem já era do cluster não é oferecido de novo (sem repetições)
+                joined = batch[(labels == k) & (previous != k)]
+                reservoirs[k], seen[k], filled[k] = reservoir_update(reservoirs[k], seen[k],
+                                                                     filled[k], joined, rng)
+                if filled[k]:
+                    changed |= refresh_prototype(views, k, prototypes,
+                                                 reservoirs[k][:filled[k]], lambdas[k],
+                                                 means, counts)
+
+            if verbose:
+                print(f"Lote {iterations} (passada {epoch + 1}): "
+                      f"J estimado {objectives[-1]:.6f}")
+
+        if not changed:
+            if verbose:
+                print("Protótipos estáveis em uma passada inteira: parando")
+            break
+
+    # Passada final: todos os objetos no protótipo mais próximo
+    lambdas = lambda_weights(means)
+    columns = views.columns(prototypes)
+    labels = assign_objects(columns, lambdas)
+    objectives.append(float((lambdas * cluster_totals(columns, labels, n_clusters)).sum()))
+    if verbose:
+        print(f"Critério J (passada completa): {objectives[-1]:.6f}")
+
+    return labels, normalize_lambdas(lambdas), prototypes, iterations, objectives
@@ -0,0 +1,155 @@
+"""
+Modelo ajustado do MRDCA-RWL para alocar objetos novos.
+
+Um agrupamento ajustado fica determinado pelos K protótipos, pelos pesos
+lambda de cada cluster e pela descrição das visões (mrdca.views.ViewSpec).
+FittedModel guarda só isso: os atributos dos protótipos (K, d), e não as
+matrizes n x n, então predict calcula apenas as distâncias dos objetos
+novos aos K protótipos em cada visão, em lotes de linhas, em
+O(lote * K * p) distâncias, e aloca cada objeto pela mesma regra de
+engine.assign_objects.
+
+save grava um arquivo .npz comprimido (atributos dos protótipos, pesos e
+a descrição das visões em JSON, sem pickle) e load o reabre.
+"""
+import json
+
+import numpy as np
+
+from .engine import product_one_lambdas
+from .views import ViewSpec, as_view_specs
+
+# Linhas avaliadas por lote em predict
+BATCH_ROWS = 4096
+
+# Versão do formato gravado por save
+FORMAT_VERSION = 1
+
+
+class FittedModel:
+    """
+    Protótipos, pesos e visões de um ajuste do MRDCA-RWL
+
+    Args:
+        centers: Atributos dos protótipos (K, d)
+        lambdas: Pesos (K, p) de cada cluster, normalizados (soma 1) como
+            em engine.fit ou com produto 1
+        metrics: Visões (ver mrdca.views.as_view_specs)
+        prototypes: Índices dos protótipos nos dados de treino (opcional)
+    """
+
+    def __init__(self, centers, lambdas, metrics=('euclidean', 'cityblock'), prototypes=None):
+        self.centers = np.asarray(centers)
+        self.metrics = as_view_specs(metrics)
+        self.lambdas = product_one_lambdas(np.asarray(lambdas, dtype=np.float64))
+        if self.lambdas.shape != (len(self.centers), len(self.metrics)):
+            raise ValueError("lambdas deve ter um peso por cluster e visão (K, p)")
+        self.prototypes = None if prototypes is None else np.asarray(prototypes, dtype=np.intp)
+        # Atributos de cada visão já selecionados nos protótipos
+        self.features = [spec.select(self.centers) for spec in self.metrics]
+
+    @classmethod
+    def from_fit(cls, data, prototypes, lambdas, metrics=('euclidean', 'cityblock')):
+        """
+        Cria o modelo a partir de um ajuste de engine.fit
+
+        Args:
+            data: Dados de treino (n, d) usados para calcular as visões
+            prototypes: Vetor com o protótipo de cada cluster
+            lambdas: Pesos (K, p) de engine.fit
+            metrics: Visões usadas no ajuste
+
+        Returns:
+            FittedModel
+        """
+        prototypes = np.asarray(prototypes, dtype=np.intp)
+        return cls(np.asarray(data)[prototypes], lambdas, metrics, prototypes)
+
+    @property
+    def n_clusters(self):
+        return len(self.centers)
+
+    @property
+    def n_views(self):
+        return len(self.metrics)
+
+    def columns(self, data):
+        """
+        Distâncias de objetos novos aos protótipos em cada visão
+
+        Args:
+            data: Objetos (b, d)
+
+        Returns:
+            Array (p, b, K), no formato de engine.prototype_columns
+        """
+        data = np.asarray(data)
+        return np.stack([spec.distances(spec.select(data), features)
+                         for spec, features in zip(self.metrics, self.features)])
+
+    def transform(self, data, batch_size=BATCH_ROWS):
+        """
+        Distância ponderada soma_j lambda_kj * d_j(x, g_k) a cada protótipo
+
+        Args:
+            data: Objetos (n, d)
+            batch_size: Linhas avaliadas por lote
+
+        Returns:
+            Array (n, K)
+        """
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data[None, :]
+        distances = np.empty((len(data), self.n_clusters))
+        for start in range(0, len(data), batch_size):
+            columns = self.columns(data[start:start + batch_size])
+            distances[start:start + batch_size] = np.einsum('kj,jnk->nk', self.lambdas, columns)
+        return distances
+
+    def predict(self, data, batch_size=BATCH_ROWS):
+        """
+        Aloca objetos novos ao protótipo de menor distância ponderada
+
+        Args:
+            data: Objetos (n, d) ou um único objeto (d,)
+            batch_size: Linhas avaliadas por lote
+
+        Returns:
+            Vetor de rótulos (0..K-1)
+        """
+        return self.transform(data, batch_size).argmin(axis=1)
+
+    def save(self, path):
+        """Grava o modelo em um arquivo .npz comprimido"""
+        description = {'versao': FORMAT_VERSION,
+                       'visoes': [spec.to_dict() for spec in self.metrics]}
+        arrays = {'centers': self.centers, 'lambdas': self.lambdas,
+                  'description': np.array(json.dumps(description))}
+        if self.prototypes is not None:
+            arrays['prototypes'] = self.prototypes
+        with open(path, 'wb') as file:
+            np.savez_compressed(file, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reabre um modelo gravado por save
+
+        Args:
+            path: Caminho do arquivo .npz
+
+        Returns:
+            FittedModel
+        """
+        with np.load(path, allow_pickle=False) as file:
+            description = json.loads(str(file['description']))
+            if description['versao'] != FORMAT_VERSION:
+                raise ValueError(f"Versão de modelo não suportada: {description['versao']}")
+            metrics = [ViewSpec.from_dict(view) for view in description['visoes']]
+            prototypes = file['prototypes'] if 'prototypes' in file.files else None
+            return cls(file['centers'], file['lambdas'], metrics, prototypes)
+
+    def __repr__(self):
+        names = ', '.join(spec.name for spec in self.metrics)
+        return f'FittedModel(n_clusters={self.n_clusters}, views=[{names}])'
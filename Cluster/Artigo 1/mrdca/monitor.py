@@ -0,0 +1,225 @@
+"""
+Avaliação incremental de partições para monitoramento online.
+
+Quando poucos objetos mudam de cluster, recalcular silhouette, ARI e NMI
+do zero (como calculate_metrics) custa O(n^2) por atualização.
+IncrementalEvaluator mantém as estatísticas de que esses índices
+dependem e move um objeto de cada vez:
+
+- somas S[o, k] = soma_{i em C_k} d(o, i) e as mesmas somas com d^2:
+  mover i de a para b soma/subtrai a linha d(i, .) nas colunas a e b, O(n)
+- cluster mais próximo de cada objeto (termo b da silhouette): só
+  objetos cujo mais próximo era a ou b são refeitos por completo
+- tabela de contingência contra os rótulos verdadeiros e as somas
+  sum C(n_kc, 2) (ARI) e sum n_kc log n_kc (NMI), atualizadas em O(1)
+- somas de d^2 entre pares de clusters (Davies-Bouldin e
+  Calinski-Harabasz de mrdca.validity), atualizadas em O(n + K^2)
+
+Os valores coincidem com sklearn.metrics (ARI, NMI com média aritmética)
+e com mrdca.validity (silhouette, Davies-Bouldin, Calinski-Harabasz).
+"""
+import numpy as np
+
+from .medoids import one_hot
+from .validity import (
+    calinski_harabasz_from_geometry,
+    centroid_geometry,
+    centroid_scatter,
+    check_labels,
+    davies_bouldin_from_geometry,
+    distance_sums,
+)
+
+
+def xlogx(values):
+    """x * log(x), com 0 * log(0) = 0"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(values > 0, values * np.log(np.where(values > 0, values, 1)), 0.0)
+
+
+class IncrementalEvaluator:
+    """
+    Índices de validação mantidos sob movimentos de objetos
+
+    Args:
+        matrix: Matriz de dissimilaridade n x n (ex.: a visão euclidiana
+            d_matrices[0]); as linhas são lidas uma a uma nas atualizações
+        labels: Partição inicial (0..K-1)
+        n_clusters: Número de clusters (padrão: maior rótulo + 1)
+        true_labels: Labels verdadeiros (opcional, para ARI e NMI)
+    """
+
+    def __init__(self, matrix, labels, n_clusters=None, true_labels=None):
+        self.matrix = matrix
+        self.labels = np.array(labels, dtype=np.intp)
+        self.n_objects = len(self.labels)
+        self.n_clusters = int(self.labels.max()) + 1 if n_clusters is None else n_clusters
+        self.rows = np.arange(self.n_objects)
+
+        self.sizes = np.bincount(self.labels, minlength=self.n_clusters)
+        self.sums = distance_sums(matrix, self.labels, self.n_clusters)
+        self.squared_sums = distance_sums(matrix, self.labels, self.n_clusters, power=2)
+        self.pair = one_hot(self.labels, self.n_clusters).T @ self.squared_sums
+        # Dispersão total: não depende da partição
+        self.total = float(self.squared_sums.sum()) / (2.0 * self.n_objects)
+        self.nearest = np.zeros(self.n_objects, dtype=np.intp)
+        self.nearest_mean = np.full(self.n_objects, np.inf)
+        self.refresh_nearest(self.rows)
+
+        self.classes = None
+        if true_labels is not None:
+            _, self.classes = np.unique(np.asarray(true_labels), return_inverse=True)
+            self.contingency = np.zeros((self.n_clusters, self.classes.max() + 1), dtype=np.int64)
+            np.add.at(self.contingency, (self.labels, self.classes), 1)
+            class_sizes = self.contingency.sum(axis=0)
+            self.pairs_cells = float((self.contingency * (self.contingency - 1) // 2).sum())
+            self.pairs_clusters = float((self.sizes * (self.sizes - 1) // 2).sum())
+            self.pairs_classes = float((class_sizes * (class_sizes - 1) // 2).sum())
+            self.entropy_cells = float(xlogx(self.contingency).sum())
+            self.entropy_clusters = float(xlogx(self.sizes).sum())
+            self.entropy_classes = float(xlogx(class_sizes).sum())
+
+    def cluster_means(self, objects, clusters):
+        """Distância média de objetos a clusters (inf para clusters vazios)"""
+        sizes = self.sizes[clusters]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(sizes > 0, self.sums[objects, clusters] / sizes, np.inf)
+
+    def refresh_nearest(self, objects):
+        """Recalcula o cluster vizinho mais próximo de alguns objetos, O(K) cada"""
+        if len(objects) == 0:
+            return
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.where(self.sizes > 0, self.sums[objects] / self.sizes, np.inf)
+        means[np.arange(len(objects)), self.labels[objects]] = np.inf
+        self.nearest[objects] = means.argmin(axis=1)
+        self.nearest_mean[objects] = means[np.arange(len(objects)), self.nearest[objects]]
+
+    def move(self, obj, target):
+        """
+        Move um objeto para outro cluster, atualizando todas as estatísticas
+
+        Args:
+            obj: Índice do objeto
+            target: Cluster de destino (0..K-1)
+        """
+        source = int(self.labels[obj])
+        target = int(target)
+        if source == target:
+            return
+        # Visão simétrica: a coluna d(., obj) é a linha obj
+        row = np.asarray(self.matrix[obj], dtype=np.float64)
+        squared = row ** 2
+
+        # pair' = pair + (H^T v) delta^T + delta S2[obj, :], com v = d(., obj)^2
+        delta = np.zeros(self.n_clusters)
+        delta[source], delta[target] = -1.0, 1.0
+        self.pair += np.outer(np.bincount(self.labels, weights=squared,
+                                          minlength=self.n_clusters), delta)
+        self.pair += np.outer(delta, self.squared_sums[obj])
+
+        self.sums[:, source] -= row
+        self.sums[:, target] += row
+        self.squared_sums[:, source] -= squared
+        self.squared_sums[:, target] += squared
+        self.sizes[source] -= 1
+        self.sizes[target] += 1
+        self.labels[obj] = target
+
+        # Vizinho mais próximo: as médias só mudaram nas colunas source e target
+        stale = (self.nearest == source) | (self.nearest == target)
+        stale[obj] = True
+        fresh = ~stale
+        for cluster in (source, target):
+            candidates = fresh & (self.labels != cluster)
+            means = self.cluster_means(self.rows[candidates], cluster)
+            closer = means < self.nearest_mean[candidates]
+            index = self.rows[candidates][closer]
+            self.nearest[index] = cluster
+            self.nearest_mean[index] = means[closer]
+        self.refresh_nearest(self.rows[stale])
+
+        if self.classes is not None:
+            label = self.classes[obj]
+            old, new = self.contingency[source, label], self.contingency[target, label]
+            self.pairs_cells += new - (old - 1)
+            self.pairs_clusters += self.sizes[target] - 1 - self.sizes[source]
+            self.entropy_cells += (xlogx(old - 1) - xlogx(old) + xlogx(new + 1) - xlogx(new))
+            self.entropy_clusters += (xlogx(self.sizes[source]) - xlogx(self.sizes[source] + 1)
+                                      + xlogx(self.sizes[target]) - xlogx(self.sizes[target] - 1))
+            self.contingency[source, label] -= 1
+            self.contingency[target, label] += 1
+
+    def update(self, labels):
+        """
+        Aplica uma nova partição movendo só os objetos que mudaram
+
+        Args:
+            labels: Nova partição (0..K-1)
+
+        Returns:
+            Número de objetos movidos
+        """
+        labels = np.asarray(labels, dtype=np.intp)
+        moved = np.flatnonzero(labels != self.labels)
+        for obj in moved:
+            self.move(obj, labels[obj])
+        return len(moved)
+
+    def silhouette(self):
+        """Silhouette média da partição atual, O(n)"""
+        check_labels(self.labels, np.count_nonzero(self.sizes))
+        own_size = self.sizes[self.labels]
+        a = self.sums[self.rows, self.labels] / np.maximum(own_size - 1, 1)
+        b = self.nearest_mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (b - a) / np.maximum(a, b)
+        scores[own_size == 1] = 0
+        return float(np.nan_to_num(scores).mean())
+
+    def davies_bouldin(self):
+        """Davies-Bouldin da partição atual, O(n + K^2)"""
+        spread, centers = centroid_geometry(self.pair, self.sizes)
+        scatter = centroid_scatter(self.squared_sums, self.labels, self.sizes, spread)
+        return davies_bouldin_from_geometry(scatter, centers, self.sizes)[0]
+
+    def calinski_harabasz(self):
+        """Calinski-Harabasz da partição atual, O(K^2)"""
+        spread, _ = centroid_geometry(self.pair, self.sizes)
+        return calinski_harabasz_from_geometry(spread, self.sizes, self.total)
+
+    def ari(self):
+        """Adjusted Rand Index contra os labels verdadeiros, O(1)"""
+        total_pairs = self.n_objects * (self.n_objects - 1) / 2
+        expected = self.pairs_clusters * self.pairs_classes / total_pairs
+        maximum = (self.pairs_clusters + self.pairs_classes) / 2
+        if maximum == expected:
+            return 1.0
+        return float((self.pairs_cells - expected) / (maximum - expected))
+
+    def nmi(self):
+        """Normalized Mutual Information (média aritmética) contra os labels verdadeiros, O(1)"""
+        n = self.n_objects
+        log_n = np.log(n)
+        entropy_clusters = log_n - self.entropy_clusters / n
+        entropy_classes = log_n - self.entropy_classes / n
+        if entropy_clusters <= 1e-15 and entropy_classes <= 1e-15:
+            return 1.0
+        mutual = (self.entropy_cells - self.entropy_clusters - self.entropy_classes) / n + log_n
+        return float(max(mutual, 0.0) / ((entropy_clusters + entropy_classes) / 2))
+
+    def metrics(self):
+        """
+        Métricas no formato de calculate_metrics
+
+        Returns:
+            Tupla (ari, nmi, silhouette); silhouette vale -1 se a partição
+            tiver menos de 2 clusters não vazios
+        """
+        try:
+            silhouette = self.silhouette()
+        except ValueError:
+            silhouette = -1
+        if self.classes is None:
+            return None, None, silhouette
+        return self.ari(), self.nmi(), silhouette
@@ -0,0 +1,129 @@
+"""
+Modo fora da memória: visões de dissimilaridade em disco via np.memmap.
+
+Cada visão é um arquivo .npy (o mesmo formato da camada em disco de
+mrdca.cache) escrito em blocos de linhas, sem nunca manter a matriz
+n x n inteira na RAM. Como as visões são simétricas, colunas são lidas
+como linhas: os K protótipos (pesos lambda e alocação) e os objetos que
+mudaram de cluster (somas dos medoides) custam poucas leituras
+contíguas, e a soma completa por cluster percorre o arquivo uma única
+vez em blocos de linhas sequenciais.
+"""
+import os
+import sys
+
+import numpy as np
+
+from .backends import DenseViews
+from .views import allocate_views, as_view_specs, build_views
+
+# Linhas lidas por vez ao percorrer uma visão em disco
+TILE_ROWS = 1024
+
+
+def peak_rss_mb():
+    """
+    Pico de memória residente (RSS) do processo, em MB
+
+    Returns:
+        Pico de RSS em MB (nan se indisponível na plataforma)
+    """
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é dado em bytes no macOS e em KB no Linux
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class MemmapViews(DenseViews):
+    """
+    Visões n x n abertas do disco com np.memmap, lidas em blocos de linhas
+
+    Args:
+        views: Lista de caminhos .npy ou arrays np.memmap (float32/float64)
+    """
+
+    def __init__(self, views):
+        self.views = [np.load(view, mmap_mode='r') if isinstance(view, (str, os.PathLike))
+                      else view for view in views]
+        self.storage_dtype = self.views[0].dtype.type
+        if self.storage_dtype not in (np.float64, np.float32):
+            raise ValueError(f"Precisão não suportada em disco: {self.storage_dtype}")
+        self.scales = [1.0] * len(self.views)
+        self.n_views = len(self.views)
+        self.n_objects = self.views[0].shape[0]
+
+    @classmethod
+    def create(cls, directory, data, metrics=('euclidean', 'cityblock'),
+               dtype=np.float64, block_rows=TILE_ROWS, n_jobs=1):
+        """
+        Calcula as visões em blocos de linhas e grava cada uma em disco
+
+        Args:
+            directory: Diretório dos arquivos view_<j>.npy
+            data: Dados de entrada (n, d)
+            metrics: Visões: nomes de métricas, tuplas (atributos, métrica)
+                ou ViewSpec (ver mrdca.views)
+            dtype: float64 ou float32
+            block_rows: Linhas calculadas por bloco
+            n_jobs: Threads usadas no cálculo dos blocos
+
+        Returns:
+            MemmapViews sobre os arquivos gravados
+        """
+        specs = as_view_specs(metrics)
+        out, paths = allocate_views(len(data), len(specs), dtype, directory)
+        build_views(data, specs, out=out, block_rows=block_rows, n_jobs=n_jobs)
+        del out
+        return cls(paths)
+
+    def rows(self, view, index):
+        """Lê linhas em ordem crescente de posição no arquivo"""
+        index = np.asarray(index, dtype=np.intp)
+        order = np.argsort(index, kind='stable')
+        rows = np.empty((len(index), self.n_objects), dtype=self.storage_dtype)
+        rows[order] = self.views[view][index[order]]
+        return rows
+
+    def raw_block(self, view, rows, cols):
+        return self.rows(view, rows)[:, cols]
+
+    def columns(self, index):
+        # Visões simétricas: a coluna j é a linha j
+        return np.stack([self.rows(view, index).T for view in range(self.n_views)])
+
+    def cluster_sums(self, indicator):
+        indicator = indicator.astype(self.dtype)
+        sums = np.empty((self.n_views, self.n_objects, indicator.shape[1]))
+        for view, matrix in enumerate(self.views):
+            for start in range(0, self.n_objects, TILE_ROWS):
+                stop = min(start + TILE_ROWS, self.n_objects)
+                sums[view, start:stop] = np.asarray(matrix[start:stop]) @ indicator
+        return sums
+
+
+def memory_report(views, n_clusters):
+    """
+    Resumo de memória para dimensionar execuções
+
+    Args:
+        views: Backend de visões
+        n_clusters: Número de clusters
+
+    Returns:
+        Dicionário com o pico de RSS, o tamanho das visões e a estimativa
+        da memória de trabalho do algoritmo (somas, colunas e um bloco).
+        Páginas do arquivo mapeado entram no RSS, mas são liberadas pelo
+        sistema sob pressão de memória; a RAM necessária é a de trabalho.
+    """
+    p, n = views.n_views, views.n_objects
+    working = (2 * p * n * n_clusters * 8
+               + p * TILE_ROWS * n * np.dtype(views.dtype).itemsize)
+    return {
+        'Pico_RSS_MB': peak_rss_mb(),
+        'Visoes_MB': views.nbytes / 2 ** 20,
+        'Visoes_Em_Disco': isinstance(views, MemmapViews),
+        'Trabalho_Estimado_MB': working / 2 ** 20,
+    }
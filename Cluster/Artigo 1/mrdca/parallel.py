@@ -0,0 +1,171 @@
+"""
+Execução paralela de múltiplas inicializações (multi-start) do MRDCA-RWL.
+
+As visões são escritas uma a uma direto em um bloco de memória
+compartilhada (multiprocessing.shared_memory), sem um tensor intermediário
+no processo principal, e cada processo do pool as acessa como um array
+NumPy, sem serializar as matrizes a cada tarefa. Cada processo limita as
+threads do núcleo compilado (OpenMP) e do BLAS à sua parte dos núcleos,
+para que o pool não crie n_jobs x núcleos threads. Os resultados voltam
+na ordem das seeds, independentemente da ordem de término.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import kernel
+from .engine import stack_views
+
+# Variáveis lidas pelas bibliotecas de threads ao serem carregadas
+THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# Visões anexadas à memória compartilhada dentro de cada processo do pool
+_shared = None
+_views = None
+
+
+def views_shape(d_matrices):
+    """Shape (p, n, n) das visões, sem empilhá-las"""
+    if isinstance(d_matrices, np.ndarray) and d_matrices.ndim == 3:
+        return d_matrices.shape
+    return (len(d_matrices),) + np.shape(d_matrices[0])
+
+
+def write_views(shared, shape, d_matrices):
+    """Converte cada visão para float64 direto no bloco compartilhado"""
+    views = np.ndarray(shape, dtype=np.float64, buffer=shared.buf)
+    for view, d_matrix in enumerate(d_matrices):
+        views[view] = d_matrix
+
+
+def limit_threads(threads):
+    """
+    Limita as threads de OpenMP e BLAS no processo atual
+
+    As variáveis de ambiente valem para bibliotecas ainda não carregadas;
+    as já carregadas são limitadas pelo threadpoolctl (se instalado) e o
+    núcleo compilado por kernel.limit_threads.
+
+    Args:
+        threads: Threads por processo
+    """
+    for variable in THREAD_VARIABLES:
+        os.environ[variable] = str(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        pass
+    else:
+        threadpool_limits(limits=threads)
+    kernel.limit_threads(threads)
+
+
+def _attach(name, shape, dtype, threads):
+    """Inicializador do pool: limita as threads e anexa as visões compartilhadas"""
+    global _shared, _views
+    limit_threads(threads)
+    try:
+        _shared = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: sem o parâmetro track
+        _shared = shared_memory.SharedMemory(name=name)
+    _views = np.ndarray(shape, dtype=dtype, buffer=_shared.buf)
+    _views.flags.writeable = False
+
+
+def _run(task, seed):
+    """Executa uma tarefa sobre as visões do processo"""
+    return task(_views, seed)
+
+
+def select_best(results, objective_key='Objetivo'):
+    """
+    Mantém apenas o resultado de menor critério
+
+    Args:
+        results: Lista de resultados (dicionários) na ordem das seeds
+        objective_key: Chave do critério em cada resultado
+
+    Returns:
+        Resultado de menor critério (empate: a primeira seed)
+    """
+    return min(results, key=lambda result: result[objective_key])
+
+
+def run_seeds(task, d_matrices, seeds, n_jobs=None, best_of=False,
+              objective_key='Objetivo', stop=None, cancel_event=None, on_result=None,
+              threads_per_worker=None):
+    """
+    Executa task(views, seed) para cada seed em um pool de processos
+
+    Args:
+        task: Função (views, seed) -> dicionário de resultados; deve ser
+            serializável (função de módulo ou functools.partial)
+        d_matrices: Lista de matrizes de dissimilaridade ou tensor (p, n, n)
+        seeds: Seeds (ou tuplas de argumentos) passadas a task
+        n_jobs: Número de processos (padrão: todos os núcleos; 1 = sem pool)
+        best_of: Se True, retorna apenas o resultado de menor critério
+        objective_key: Chave do critério usada em best_of
+        stop: Função (resultado) -> bool; se retornar True cancela as
+            tarefas ainda não iniciadas
+        cancel_event: threading.Event que, se acionado, cancela as tarefas
+            ainda não iniciadas
+        on_result: Função (índice, resultado) chamada a cada término
+        threads_per_worker: Threads de OpenMP/BLAS em cada processo
+            (padrão: núcleos divididos pelo número de processos)
+
+    Returns:
+        Lista de resultados na ordem das seeds (tarefas canceladas são
+        omitidas), ou o melhor resultado se best_of=True
+    """
+    seeds = list(seeds)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    results = {}
+
+    def finished(index, result):
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+        return stop is not None and stop(result)
+
+    if n_jobs == 1:
+        views = stack_views(d_matrices)
+        for index, seed in enumerate(seeds):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if finished(index, task(views, seed)):
+                break
+    else:
+        shape = views_shape(d_matrices)
+        n_workers = max(1, min(n_jobs, len(seeds)))
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // n_workers)
+        shared = shared_memory.SharedMemory(create=True, size=max(1, 8 * int(np.prod(shape))))
+        try:
+            write_views(shared, shape, d_matrices)
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach,
+                                     initargs=(shared.name, shape, np.float64,
+                                               threads_per_worker)) as pool:
+                pending = {pool.submit(_run, task, seed): index
+                           for index, seed in enumerate(seeds)}
+                cancelled = False
+                while pending and not cancelled:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if finished(pending.pop(future), future.result()):
+                            cancelled = True
+                    if cancel_event is not None and cancel_event.is_set():
+                        cancelled = True
+                if cancelled:
+                    for future in pending:
+                        future.cancel()
+        finally:
+            shared.close()
+            shared.unlink()
+
+    ordered = [results[index] for index in sorted(results)]
+    if best_of:
+        return select_best(ordered, objective_key)
+    return ordered
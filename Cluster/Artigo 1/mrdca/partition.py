@@ -0,0 +1,139 @@
+"""
+Representação compacta de partições rígidas.
+
+Partition guarda a partição como um vetor de rótulos int32 (0..K-1) e
+calcula sob demanda, uma única vez, os tamanhos dos clusters e os
+membros em formato CSR (indptr, indices): os objetos de C_k são
+indices[indptr[k]:indptr[k + 1]], em ordem crescente, sem uma lista
+Python por cluster. diff compara duas partições em O(n) e devolve os
+objetos que mudaram de cluster.
+
+Para compatibilidade com o formato {cluster_id: [objetos]} usado nos
+experimentos, Partition é um Mapping com clusters numerados a partir de
+1 cujos valores são os arrays de membros; np.asarray(partition) devolve
+o vetor de rótulos, então métricas e funções de mrdca.validity a usam
+sem conversão.
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class Partition(Mapping):
+    """
+    Partição rígida de n objetos em K clusters
+
+    Args:
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters (padrão: maior rótulo + 1)
+    """
+
+    def __init__(self, labels, n_clusters=None):
+        self.labels = np.ascontiguousarray(labels, dtype=np.int32)
+        self.n_objects = len(self.labels)
+        if n_clusters is None:
+            n_clusters = int(self.labels.max()) + 1 if self.n_objects else 0
+        self.n_clusters = n_clusters
+        self._sizes = None
+        self._indptr = None
+        self._indices = None
+
+    @classmethod
+    def from_clusters(cls, clusters, n_objects):
+        """
+        Converte o dicionário {cluster_id: [objetos]} (ids a partir de 1)
+
+        Args:
+            clusters: Dicionário de clusters, Partition ou vetor de rótulos
+            n_objects: Número de objetos
+
+        Returns:
+            Partition
+        """
+        if isinstance(clusters, Partition):
+            return clusters
+        if not isinstance(clusters, Mapping):
+            return cls(clusters)
+        labels = np.zeros(n_objects, dtype=np.int32)
+        for cluster_id, objects in clusters.items():
+            labels[np.asarray(objects, dtype=np.intp)] = cluster_id - 1
+        return cls(labels, max(clusters, default=0))
+
+    @property
+    def sizes(self):
+        """Número de objetos de cada cluster (K,)"""
+        if self._sizes is None:
+            self._sizes = np.bincount(self.labels, minlength=self.n_clusters)
+        return self._sizes
+
+    @property
+    def indptr(self):
+        """Início de cada cluster em indices (K + 1,)"""
+        if self._indptr is None:
+            self._indptr = np.zeros(self.n_clusters + 1, dtype=np.int64)
+            np.cumsum(self.sizes, out=self._indptr[1:])
+        return self._indptr
+
+    @property
+    def indices(self):
+        """Objetos ordenados por cluster e, dentro de cada um, por índice (n,)"""
+        if self._indices is None:
+            self._indices = np.argsort(self.labels, kind='stable').astype(np.int32, copy=False)
+        return self._indices
+
+    def members(self, k):
+        """Objetos do cluster k (0..K-1), como view de indices"""
+        return self.indices[self.indptr[k]:self.indptr[k + 1]]
+
+    def member_lists(self):
+        """Lista com os membros de cada cluster (views, sem cópia)"""
+        return [self.members(k) for k in range(self.n_clusters)]
+
+    def diff(self, other):
+        """
+        Objetos cujo cluster difere entre duas partições, O(n)
+
+        Args:
+            other: Partition ou vetor de rótulos com os mesmos objetos
+
+        Returns:
+            Array com os índices dos objetos que mudaram de cluster
+        """
+        return np.flatnonzero(self.labels != np.asarray(other))
+
+    def moved_from(self, other):
+        """Tupla (objetos movidos, clusters antigos, clusters novos) em relação a other"""
+        moved = self.diff(other)
+        return moved, np.asarray(other)[moved], self.labels[moved]
+
+    def to_clusters(self):
+        """Dicionário {cluster_id: [objetos]} com listas Python (ids a partir de 1)"""
+        return {k + 1: members.tolist() for k, members in enumerate(self.member_lists())}
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.labels
+        return self.labels.astype(dtype)
+
+    def __getitem__(self, cluster_id):
+        if not 1 <= cluster_id <= self.n_clusters:
+            raise KeyError(cluster_id)
+        return self.members(cluster_id - 1)
+
+    def __iter__(self):
+        return iter(range(1, self.n_clusters + 1))
+
+    def __len__(self):
+        return self.n_clusters
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping) and not isinstance(other, Partition):
+            other = Partition.from_clusters(other, self.n_objects)
+        if not isinstance(other, Partition):
+            return NotImplemented
+        return self.n_objects == other.n_objects and not len(self.diff(other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Partition(n_objects={self.n_objects}, n_clusters={self.n_clusters})'
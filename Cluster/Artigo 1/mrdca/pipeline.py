@@ -0,0 +1,416 @@
+"""
+Pipeline experimental do MRDCA-RWL (Artigo 1) como biblioteca importável.
+
+Reúne o algoritmo no formato de dicionários usado nos experimentos
+(mrdca_rwl e os passos avulsos), as métricas de avaliação e os testes
+múltiplos com seeds fixas. Importar este módulo não tem efeitos
+colaterais: nada é instalado nem criado em disco, e scikit-learn só é
+carregado ao calcular métricas. Os relatórios (pandas/openpyxl) estão em
+mrdca.reporting e a linha de comando em mrdca.cli.
+"""
+import time
+from functools import partial
+
+import numpy as np
+
+from . import engine, parallel, validity
+from .backends import as_backend
+from .cache import MAX_DISK_BYTES, DissimilarityCache, default_directory
+from .medoids import medoid_costs
+from .minibatch import fit_minibatch
+from .model import FittedModel
+from .partition import Partition
+from .selection import first_view, sweep
+from .telemetry import Recorder
+
+# Cache das matrizes de dissimilaridade (memória + disco), compartilhado
+# entre reinícios, execuções e processos; o diretório por usuário (ver
+# mrdca.cache.default_directory) só é criado na primeira base calculada
+dissimilarity_cache = DissimilarityCache(directory=default_directory(), n_jobs=None,
+                                         max_bytes=MAX_DISK_BYTES)
+
+
+def calculate_lambda(cluster, prototype, d_matrices):
+    """
+    Calcula os pesos lambda para um cluster
+
+    Os pesos são os de engine.fit (produto 1, ver engine.lambda_weights),
+    então calculate_lambda, update_clusters e select_prototypes chamados
+    em sequência reproduzem uma iteração do ajuste. A normalização para
+    soma 1 fica só nos relatórios (Lambda*_Media).
+
+    Args:
+        cluster: Lista de objetos do cluster
+        prototype: Índice do protótipo
+        d_matrices: Lista de matrizes de dissimilaridade ou backend de visões
+
+    Returns:
+        Lista de pesos lambda com produto 1 (pesos iguais se alguma
+        visão tiver soma nula)
+    """
+    views = as_backend(d_matrices)
+    total_d = views.block(cluster, [prototype]).sum(axis=(1, 2), dtype=np.float64)
+    return engine.lambda_weights(total_d[None, :])[0].tolist()
+
+
+def update_clusters(d_matrices, lambdas, prototypes):
+    """
+    Atualiza os clusters baseado nas distâncias ponderadas
+
+    Args:
+        d_matrices: Lista de matrizes de dissimilaridade ou backend de visões
+        lambdas: Dicionário de pesos lambda por cluster (produto 1, como
+            os de calculate_lambda, ou normalizados para soma 1, como os
+            de mrdca_rwl; são convertidos para produto 1)
+        prototypes: Dicionário de protótipos por cluster
+
+    Returns:
+        Partition com os novos clusters (ids 1..K na ordem de prototypes)
+    """
+    views = as_backend(d_matrices)
+    cluster_ids = list(prototypes.keys())
+
+    # Distância ponderada de todos os objetos a todos os protótipos de uma vez
+    columns = views.columns([prototypes[k] for k in cluster_ids])
+    weights = np.array([lambdas[k] for k in cluster_ids], dtype=np.float64)
+    best = engine.assign_objects(columns, engine.product_one_lambdas(weights))
+
+    return Partition(best, len(cluster_ids))
+
+
+def select_prototypes(clusters, d_matrices, lambdas=None):
+    """
+    Seleciona protótipos que minimizam a distância intra-cluster
+
+    Args:
+        clusters: Partition ou dicionário de clusters
+        d_matrices: Lista de matrizes de dissimilaridade ou backend de visões
+        lambdas: Dicionário de pesos lambda por cluster (padrão: pesos iguais)
+
+    Returns:
+        Dicionário de protótipos por cluster
+    """
+    views = as_backend(d_matrices)
+    prototypes = {}
+    for k, cluster in clusters.items():
+        if len(cluster) == 0:
+            prototypes[k] = 0  # Protótipo padrão se cluster vazio
+            continue
+
+        # Selecionar o objeto que minimiza a soma das distâncias para todos os outros objetos do cluster
+        weights = lambdas[k] if lambdas is not None else None
+        costs = medoid_costs(views, cluster, cluster, weights)
+        prototypes[k] = int(cluster[int(np.argmin(costs))])
+
+    return prototypes
+
+
+def mrdca_rwl(d_matrices, n_clusters, max_iter=30, verbose=False, random_state=None,
+              medoid_search=None, init='random', batch_size=None, n_passes=3,
+              schedule='inverse', use_kernel=None, callback=None, assignment='exact'):
+    """
+    Algoritmo MRDCA-RWL principal
+
+    Todos os passos são executados pelo núcleo vetorizado em mrdca.engine,
+    que usa o núcleo compilado em C/OpenMP (mrdca.kernel) quando disponível.
+    d_matrices pode ser um backend de mrdca.backends (ex.: CondensedViews
+    em float32) para reduzir a memória das visões.
+
+    Args:
+        d_matrices: Lista de matrizes de dissimilaridade ou backend de visões
+        n_clusters: Número de clusters
+        max_iter: Número máximo de iterações (fixado em 30)
+        verbose: Se True, imprime informações detalhadas
+        random_state: Seed para reprodutibilidade
+        medoid_search: MedoidSearch para a seleção de protótipos
+            (padrão: busca exata incremental; ver mrdca.medoids)
+        init: Inicialização: 'random', 'kmedoids++' ou 'build'
+            (ver mrdca.initialization)
+        batch_size: Se definido, usa a variante mini-batch com lotes desse
+            tamanho (ver mrdca.minibatch); max_iter e medoid_search não se
+            aplicam e iterations conta os lotes processados
+        n_passes: Passadas sobre os dados na variante mini-batch
+        schedule: Taxa de aprendizado na variante mini-batch
+            ('inverse' ou 'constant')
+        use_kernel: Núcleo compilado: None usa se disponível, True exige
+            e False usa só NumPy (ignorado na variante mini-batch)
+        callback: Telemetria por iteração (ver mrdca.telemetry); se
+            retornar True interrompe o ajuste (ignorado na variante mini-batch)
+        assignment: Alocação: 'exact', 'elkan' ou 'hamerly' (poda por
+            desigualdade triangular, ver mrdca.bounds; ignorado na variante
+            mini-batch)
+
+    Returns:
+        Tupla (clusters, lambdas, iterations); clusters é uma Partition,
+        que se comporta como o dicionário {cluster_id: objetos}
+    """
+    if batch_size is not None:
+        labels, lambdas, _, iterations, _ = fit_minibatch(d_matrices, n_clusters,
+                                                          batch_size=batch_size,
+                                                          n_passes=n_passes,
+                                                          schedule=schedule,
+                                                          verbose=verbose,
+                                                          random_state=random_state,
+                                                          init=init)
+    else:
+        labels, lambdas, _, iterations, _ = engine.fit(d_matrices, n_clusters,
+                                                       max_iter=max_iter, verbose=verbose,
+                                                       random_state=random_state,
+                                                       medoid_search=medoid_search,
+                                                       init=init, use_kernel=use_kernel,
+                                                       callback=callback,
+                                                       assignment=assignment)
+
+    clusters = Partition(labels, n_clusters)
+    lambdas = {k + 1: lambdas[k].tolist() for k in range(n_clusters)}
+    return clusters, lambdas, iterations
+
+
+def calculate_metrics(clusters, true_labels, data, d_matrix=None):
+    """
+    Calcula métricas de avaliação dos clusters
+
+    Args:
+        clusters: Partition, dicionário de clusters ou vetor de rótulos
+        true_labels: Labels verdadeiros
+        data: Dados originais
+        d_matrix: Matriz de distâncias euclidianas já calculada (opcional;
+            evita recalcular as distâncias para a silhouette)
+
+    Returns:
+        Tupla (ari, nmi, silhouette)
+    """
+    from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score
+
+    # Vetor de rótulos (direto da Partition, sem conversão)
+    predicted_labels = Partition.from_clusters(clusters, len(true_labels)).labels
+
+    # Calcular métricas
+    ari = adjusted_rand_score(true_labels, predicted_labels)
+    nmi = normalized_mutual_info_score(true_labels, predicted_labels)
+
+    if d_matrix is None:
+        from sklearn.metrics.pairwise import pairwise_distances
+        d_matrix = pairwise_distances(data)
+    try:
+        silhouette = validity.silhouette(d_matrix, predicted_labels)
+    except ValueError:
+        silhouette = -1  # Valor padrão se não conseguir calcular
+
+    return ari, nmi, silhouette
+
+
+def create_dissimilarity_matrices(data, metrics=('euclidean', 'cityblock')):
+    """
+    Cria matrizes de dissimilaridade usando diferentes métricas
+
+    As matrizes são calculadas uma vez por base, em blocos de linhas, e
+    reaproveitadas do cache.
+
+    Args:
+        data: Dados de entrada
+        metrics: Visões: nomes de métricas ('euclidean', 'cityblock',
+            'cosine', 'correlation', 'chebyshev', ...), funções, tuplas
+            (atributos, métrica) ou mrdca.views.ViewSpec
+
+    Returns:
+        Lista de matrizes de dissimilaridade
+    """
+    return dissimilarity_cache.get(data, metrics)
+
+
+def fit_model(data, n_clusters, metrics=('euclidean', 'cityblock'), random_state=None,
+              n_init=1, **fit_params):
+    """
+    Ajusta o MRDCA-RWL e devolve um modelo capaz de alocar objetos novos
+
+    As visões vêm do cache de dissimilaridades. Com n_init > 1 fica o
+    reinício de menor critério J (seeds random_state + i).
+
+    Args:
+        data: Dados de treino (n, d)
+        n_clusters: Número de clusters
+        metrics: Visões (ver create_dissimilarity_matrices)
+        random_state: Seed do primeiro reinício
+        n_init: Número de reinícios
+        **fit_params: Parâmetros repassados a engine.fit
+
+    Returns:
+        Tupla (FittedModel, Partition dos dados de treino)
+    """
+    d_matrices = create_dissimilarity_matrices(data, metrics)
+    best = None
+    for restart in range(n_init):
+        seed = None if random_state is None else random_state + restart
+        solution = engine.fit(d_matrices, n_clusters, random_state=seed, **fit_params)
+        if best is None or solution[4][-1] < best[4][-1]:
+            best = solution
+    labels, lambdas, prototypes, _, _ = best
+    return FittedModel.from_fit(data, prototypes, lambdas, metrics), Partition(labels, n_clusters)
+
+
+def select_n_clusters(data, k_min=2, k_max=None, criterion='Silhouette_Ponderada',
+                      n_init=10, patience=2, d_matrices=None, verbose=False, **sweep_params):
+    """
+    Escolhe o número de clusters de uma base por varredura com partida a quente
+
+    As visões vêm do cache de dissimilaridades, então os testes seguintes
+    com o K escolhido não as recalculam (ver mrdca.selection.sweep).
+
+    Args:
+        data: Dados de entrada
+        k_min: Menor número de clusters
+        k_max: Maior número de clusters (padrão: raiz de n)
+        criterion: Índice de validação que escolhe K
+        n_init: Reinícios aleatórios no menor K
+        patience: Valores seguidos de K sem melhora antes de parar
+        d_matrices: Matrizes de dissimilaridade (opcional)
+        verbose: Se True, imprime a curva
+        **sweep_params: Demais parâmetros de mrdca.selection.sweep
+
+    Returns:
+        Dicionário de sweep, com 'Clusters' (Partition da solução recomendada)
+    """
+    if d_matrices is None:
+        d_matrices = create_dissimilarity_matrices(data)
+    result = sweep(d_matrices, k_min=k_min, k_max=k_max, criterion=criterion, n_init=n_init,
+                   patience=patience, verbose=verbose, **sweep_params)
+    result['Clusters'] = Partition(result['Rotulos'], result['K'])
+    return result
+
+
+def run_single_test(data, true_labels, n_clusters, test_number, random_state=None,
+                    d_matrices=None, keep_labels=False, telemetry=False):
+    """
+    Executa um único teste do algoritmo
+
+    Args:
+        data: Dados de entrada
+        true_labels: Labels verdadeiros
+        n_clusters: Número de clusters
+        test_number: Número do teste
+        random_state: Seed para reprodutibilidade
+        d_matrices: Matrizes de dissimilaridade já calculadas (opcional)
+        keep_labels: Se True, inclui a partição obtida em 'Rotulos'
+        telemetry: Se True, inclui os pesos lambda finais (K x p) em
+            'Lambdas' e os registros de cada iteração (mrdca.telemetry)
+            em 'Telemetria'
+
+    Returns:
+        Dicionário com resultados do teste
+    """
+    # Criar matrizes de dissimilaridade
+    if d_matrices is None:
+        d_matrices = create_dissimilarity_matrices(data)
+
+    # Executar algoritmo
+    recorder = Recorder() if telemetry else None
+    start = time.perf_counter()
+    labels, lambdas, _, iterations, objectives = engine.fit(d_matrices, n_clusters,
+                                                            max_iter=30, verbose=False,
+                                                            random_state=random_state,
+                                                            callback=recorder)
+    seconds = time.perf_counter() - start
+    clusters = Partition(labels, n_clusters)
+
+    # Calcular métricas (a primeira visão é a euclidiana, também num backend)
+    euclidean = first_view(d_matrices, d_matrices)
+    ari, nmi, silhouette = calculate_metrics(clusters, true_labels, data, euclidean)
+
+    # Calcular média dos lambdas
+    lambda_means = lambdas.mean(axis=0).tolist()
+
+    result = {
+        'Teste': test_number,
+        'ARI': ari,
+        'NMI': nmi,
+        'Silhouette': silhouette,
+        'Lambda1_Media': lambda_means[0] if len(lambda_means) > 0 else 0,
+        'Lambda2_Media': lambda_means[1] if len(lambda_means) > 1 else 0,
+        'N_Iteracoes': iterations,
+        'Objetivo': objectives[-1] if objectives else float('nan'),
+        'Segundos': seconds
+    }
+    if keep_labels:
+        result['Rotulos'] = labels.astype(np.int32)
+    if telemetry:
+        result['Lambdas'] = lambdas
+        result['Telemetria'] = recorder.records
+    return result
+
+
+def _run_seed(views, test, data, true_labels, n_clusters, keep_labels=False, telemetry=False):
+    """Tarefa do pool paralelo: um teste (número, seed) sobre as visões compartilhadas"""
+    test_number, random_state = test
+    return run_single_test(data, true_labels, n_clusters, test_number,
+                           random_state=random_state, d_matrices=views,
+                           keep_labels=keep_labels, telemetry=telemetry)
+
+
+def run_multiple_tests(data, true_labels, n_clusters, dataset_name, n_tests=50,
+                       n_jobs=1, best_of=False, return_partitions=False, store=None,
+                       run_id=None, telemetry=None):
+    """
+    Executa múltiplos testes para uma base de dados
+
+    Args:
+        data: Dados de entrada
+        true_labels: Labels verdadeiros
+        n_clusters: Número de clusters
+        dataset_name: Nome da base de dados
+        n_tests: Número de testes a executar
+        n_jobs: Número de processos (1 = sequencial, None = todos os núcleos)
+        best_of: Se True, retorna apenas o teste de menor critério J
+        return_partitions: Se True, retorna também as partições de todos
+            os testes em um array (n_tests, n) de rótulos, pronto para
+            mrdca.consensus
+        store: mrdca.store.ResultsStore onde cada teste é gravado assim
+            que termina (opcional)
+        run_id: Execução no store (padrão: uma nova execução)
+        telemetry: Grava pesos lambda e telemetria por iteração no store
+            (padrão: True se houver store)
+
+    Returns:
+        Lista de resultados (ou tupla (resultados, partições))
+    """
+    print(f"\nExecutando {n_tests} testes para {dataset_name}...")
+
+    # Usar seed diferente para cada teste
+    tests = [(test + 1, 42 + test) for test in range(n_tests)]
+    if telemetry is None:
+        telemetry = store is not None
+    if store is not None and run_id is None:
+        run_id = store.start_run(parameters={'Testes': n_tests, 'Base': dataset_name})
+
+    def finish(index, result):
+        """Grava o teste no store e remove os campos usados só na gravação"""
+        print(f"Teste {index + 1}/{n_tests} - {dataset_name}")
+        if store is not None:
+            store.add_restart(run_id, dataset_name, result, seed=tests[index][1],
+                              n_objects=len(data), n_clusters=n_clusters)
+        result.pop('Lambdas', None)
+        result.pop('Telemetria', None)
+
+    # Matrizes calculadas uma única vez para todos os testes
+    d_matrices = create_dissimilarity_matrices(data)
+
+    if n_jobs != 1:
+        task = partial(_run_seed, data=data, true_labels=true_labels, n_clusters=n_clusters,
+                       keep_labels=return_partitions, telemetry=telemetry)
+        results = parallel.run_seeds(task, d_matrices, tests, n_jobs=n_jobs, on_result=finish)
+    else:
+        results = []
+        for index, (test_number, seed) in enumerate(tests):
+            result = run_single_test(data, true_labels, n_clusters, test_number,
+                                     random_state=seed, d_matrices=d_matrices,
+                                     keep_labels=return_partitions, telemetry=telemetry)
+            finish(index, result)
+            results.append(result)
+
+    if return_partitions:
+        partitions = np.stack([result.pop('Rotulos') for result in results])
+    if best_of:
+        results = [parallel.select_best(results)]
+    if return_partitions:
+        return results, partitions
+    return results
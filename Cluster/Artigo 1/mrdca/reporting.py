@@ -0,0 +1,218 @@
+"""
+Relatórios dos experimentos do MRDCA-RWL (estatísticas, Excel e TXT).
+
+pandas e openpyxl só são importados aqui, dentro das funções, então o
+algoritmo (mrdca.pipeline) e os processos do pool não pagam por eles. O
+diretório de saída é criado na primeira gravação.
+
+Os resultados de cada execução ficam em um mrdca.store.ResultsStore;
+export_reports gera os arquivos Excel/TXT e o resumo executivo a partir
+dele, a qualquer momento (inclusive durante a execução).
+"""
+import os
+from datetime import datetime
+
+from .store import METRICS, RESTART_COLUMNS, ResultsStore
+
+# Diretório padrão dos arquivos de resultados
+RESULTS_DIRECTORY = 'resultados_mrdca'
+
+# Arquivo padrão do store de resultados
+STORE_FILENAME = 'resultados.sqlite'
+
+
+def calculate_statistics(results, dataset=None, run_id=None):
+    """
+    Calcula estatísticas resumo dos resultados
+
+    Args:
+        results: Lista de resultados dos testes ou ResultsStore (nesse
+            caso a agregação é feita no SQLite)
+        dataset: Base agregada (obrigatória com ResultsStore)
+        run_id: Execução agregada (padrão: a mais recente do store)
+
+    Returns:
+        DataFrame com estatísticas
+    """
+    import pandas as pd
+
+    if isinstance(results, ResultsStore):
+        run_id = run_id or results.latest_run()
+        summary = results.aggregate(run_id, dataset)
+        return pd.DataFrame({
+            'Metrica': list(METRICS),
+            'Media': [summary[metric][0] for metric in METRICS],
+            'Desvio_Padrao': [summary[metric][1] for metric in METRICS],
+            'Minimo': [summary[metric][2] for metric in METRICS],
+            'Maximo': [summary[metric][3] for metric in METRICS],
+        })
+
+    df = pd.DataFrame(results)
+
+    stats = {
+        'Metrica': ['ARI', 'NMI', 'Silhouette', 'Lambda1_Media', 'Lambda2_Media', 'N_Iteracoes'],
+        'Media': [
+            df['ARI'].mean(),
+            df['NMI'].mean(),
+            df['Silhouette'].mean(),
+            df['Lambda1_Media'].mean(),
+            df['Lambda2_Media'].mean(),
+            df['N_Iteracoes'].mean()
+        ],
+        'Desvio_Padrao': [
+            df['ARI'].std(),
+            df['NMI'].std(),
+            df['Silhouette'].std(),
+            df['Lambda1_Media'].std(),
+            df['Lambda2_Media'].std(),
+            df['N_Iteracoes'].std()
+        ],
+        'Minimo': [
+            df['ARI'].min(),
+            df['NMI'].min(),
+            df['Silhouette'].min(),
+            df['Lambda1_Media'].min(),
+            df['Lambda2_Media'].min(),
+            df['N_Iteracoes'].min()
+        ],
+        'Maximo': [
+            df['ARI'].max(),
+            df['NMI'].max(),
+            df['Silhouette'].max(),
+            df['Lambda1_Media'].max(),
+            df['Lambda2_Media'].max(),
+            df['N_Iteracoes'].max()
+        ]
+    }
+
+    return pd.DataFrame(stats)
+
+
+def save_results(results, stats, dataset_name, timestamp, directory=RESULTS_DIRECTORY):
+    """
+    Salva os resultados em arquivos
+
+    Args:
+        results: Lista de resultados
+        stats: DataFrame com estatísticas
+        dataset_name: Nome da base de dados
+        timestamp: Timestamp para nomes únicos
+        directory: Diretório de saída
+    """
+    import pandas as pd
+
+    os.makedirs(directory, exist_ok=True)
+    df_results = pd.DataFrame(results)
+
+    # Salvar resultados detalhados em Excel
+    excel_filename = os.path.join(directory, f'resultados_detalhados_{dataset_name}_{timestamp}.xlsx')
+    try:
+        with pd.ExcelWriter(excel_filename, engine='openpyxl') as writer:
+            df_results.to_excel(writer, sheet_name='Resultados_Detalhados', index=False)
+            stats.to_excel(writer, sheet_name='Estatisticas', index=False)
+        print(f"Arquivo Excel salvo: {excel_filename}")
+    except Exception as e:
+        print(f"Erro ao salvar Excel: {e}")
+
+    # Salvar em TXT
+    txt_filename = os.path.join(directory, f'resultados_{dataset_name}_{timestamp}.txt')
+    try:
+        with open(txt_filename, 'w', encoding='utf-8') as f:
+            f.write(f"RESULTADOS PARA BASE DE DADOS: {dataset_name}\n")
+            f.write("="*50 + "\n\n")
+
+            f.write("ESTATÍSTICAS RESUMO:\n")
+            f.write("-"*30 + "\n")
+            f.write(stats.to_string(index=False))
+            f.write("\n\n")
+
+            f.write("RESULTADOS DETALHADOS:\n")
+            f.write("-"*30 + "\n")
+            f.write(df_results.to_string(index=False))
+        print(f"Arquivo TXT salvo: {txt_filename}")
+    except Exception as e:
+        print(f"Erro ao salvar TXT: {e}")
+
+
+def start_summary(timestamp, n_tests=50, directory=RESULTS_DIRECTORY):
+    """
+    Cria o arquivo de resumo executivo com o cabeçalho da execução
+
+    Args:
+        timestamp: Timestamp para nomes únicos
+        n_tests: Número de testes por base
+        directory: Diretório de saída
+
+    Returns:
+        Caminho do arquivo de resumo
+    """
+    os.makedirs(directory, exist_ok=True)
+    resumo_filename = os.path.join(directory, f'resumo_executivos_{timestamp}.txt')
+    with open(resumo_filename, 'w', encoding='utf-8') as f:
+        f.write("RELATÓRIO EXECUTIVO - ALGORITMO MRDCA-RWL\n")
+        f.write("="*50 + "\n")
+        f.write(f"Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+        f.write(f"Número de testes por base: {n_tests}\n")
+        f.write("Critério de parada: 30 iterações ou convergência\n\n")
+    return resumo_filename
+
+
+def append_summary(resumo_filename, name, n_objects, n_clusters, stats):
+    """
+    Acrescenta o resumo de uma base ao relatório executivo
+
+    Args:
+        resumo_filename: Caminho do arquivo de resumo
+        name: Nome da base de dados
+        n_objects: Número de objetos
+        n_clusters: Número de clusters
+        stats: DataFrame de calculate_statistics
+    """
+    def metric(metrica, column):
+        return stats[stats['Metrica'] == metrica][column].iloc[0]
+
+    with open(resumo_filename, 'a', encoding='utf-8') as f:
+        f.write(f"\nBASE DE DADOS: {name}\n")
+        f.write("-"*30 + "\n")
+        f.write(f"Número de objetos: {n_objects}\n")
+        f.write(f"Número de clusters: {n_clusters}\n")
+        f.write(f"ARI Médio: {metric('ARI', 'Media'):.4f} ± {metric('ARI', 'Desvio_Padrao'):.4f}\n")
+        f.write(f"NMI Médio: {metric('NMI', 'Media'):.4f} ± {metric('NMI', 'Desvio_Padrao'):.4f}\n")
+        f.write(f"Silhouette Médio: {metric('Silhouette', 'Media'):.4f} ± "
+                f"{metric('Silhouette', 'Desvio_Padrao'):.4f}\n")
+        f.write(f"Iterações Médias: {metric('N_Iteracoes', 'Media'):.2f} ± "
+                f"{metric('N_Iteracoes', 'Desvio_Padrao'):.2f}\n")
+        f.write("\n")
+
+
+def export_reports(store, run_id=None, directory=RESULTS_DIRECTORY, datasets=None):
+    """
+    Gera os relatórios Excel/TXT e o resumo executivo a partir do store
+
+    Args:
+        store: ResultsStore (ou caminho do arquivo SQLite)
+        run_id: Execução (padrão: a mais recente)
+        directory: Diretório de saída
+        datasets: Bases incluídas (padrão: todas as gravadas na execução)
+
+    Returns:
+        Caminho do resumo executivo (None se a execução estiver vazia)
+    """
+    if not isinstance(store, ResultsStore):
+        store = ResultsStore(store)
+    run_id = run_id or store.latest_run()
+    datasets = datasets or store.datasets(run_id)
+    if run_id is None or not datasets:
+        return None
+
+    restarts = {name: store.restarts(run_id, name) for name in datasets}
+    n_tests = max(len(rows) for rows in restarts.values())
+    resumo_filename = start_summary(run_id, n_tests, directory)
+    for name, rows in restarts.items():
+        stats = calculate_statistics(store, name, run_id)
+        results = [{'Teste': row['Teste'], 'Seed': row['Seed'],
+                    **{column: row[column] for column in RESTART_COLUMNS[1:]}}
+                   for row in rows]
+        save_results(results, stats, name, run_id, directory)
+        append_summary(resumo_filename, name, rows[0]['N_Objetos'], rows[0]['N_Clusters'], stats)
+    return resumo_filename
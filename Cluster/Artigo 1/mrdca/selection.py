@@ -0,0 +1,232 @@
+"""
+Escolha automática do número de clusters por varredura com partida a quente.
+
+sweep ajusta o MRDCA-RWL para K = k_min, k_min + 1, ... reaproveitando a
+solução de K - 1 em cada passo: o cluster de maior custo (sua parcela do
+critério J) é dividido em dois, com o protótipo atual e o membro mais
+distante dele como sementes, e essa partição inicializa engine.fit com K
+clusters (init_labels). Só k_min recebe vários reinícios aleatórios; os
+demais valores partem de uma solução quase convergida e precisam de
+poucas iterações. As visões são as mesmas em toda a varredura.
+
+Cada K é avaliado por um índice calculado das próprias dissimilaridades:
+a silhouette ponderada pelos lambdas ('Silhouette_Ponderada', ver
+mrdca.validity.weighted_silhouette) ou um dos índices de
+mrdca.validity.INDICES sobre a primeira visão. A varredura é podada de
+duas formas:
+
+- um K cuja divisão reduz J em menos de min_gain (relativo; padrão
+  MIN_GAIN, 1% de J) não é avaliado pelo índice e conta como sem
+  melhora; min_gain=0 desliga essa poda
+- a varredura para depois de patience valores seguidos de K sem melhorar
+  o melhor índice
+"""
+import time
+
+import numpy as np
+
+from .backends import ViewBackend, as_backend
+from .engine import fit, product_one_lambdas
+from .validity import INDICES, MINIMIZED, validity_indices, weighted_silhouette
+
+CRITERIA = ('Silhouette_Ponderada',) + INDICES
+
+# Redução relativa mínima de J para avaliar um K. Cada divisão costuma
+# reduzir J em alguns por cento até o número natural de grupos (Iris,
+# Wine e Digits: 2% a 28%) e em menos de 1% depois dele
+MIN_GAIN = 0.01
+
+
+def cluster_costs(views, labels, lambdas, prototypes):
+    """
+    Parcela de cada cluster no critério J
+
+    Args:
+        views: Backend de visões
+        labels: Vetor de rótulos (0..K-1)
+        lambdas: Pesos (K, p), normalizados como em engine.fit
+        prototypes: Vetor com o protótipo de cada cluster
+
+    Returns:
+        Tupla (custos (K,), distância ponderada de cada objeto ao seu
+        protótipo (n,))
+    """
+    weights = product_one_lambdas(lambdas)
+    rows = np.arange(len(labels))
+    own = views.columns(prototypes)[:, rows, labels]
+    distances = np.einsum('jn,nj->n', own, weights[labels])
+    return np.bincount(labels, weights=distances, minlength=len(prototypes)), distances
+
+
+def split_worst(views, labels, lambdas, prototypes):
+    """
+    Partição com um cluster a mais, dividindo o cluster de maior custo
+
+    O membro mais distante do protótipo vira semente do novo cluster, e
+    cada membro fica com a semente mais próxima (pesos do cluster dividido).
+
+    Args:
+        views: Backend de visões
+        labels: Vetor de rótulos (0..K-1)
+        lambdas: Pesos (K, p), normalizados como em engine.fit
+        prototypes: Vetor com o protótipo de cada cluster
+
+    Returns:
+        Vetor de rótulos (0..K), ou None se nenhum cluster tiver dois objetos
+    """
+    n_clusters = len(prototypes)
+    costs, distances = cluster_costs(views, labels, lambdas, prototypes)
+    sizes = np.bincount(labels, minlength=n_clusters)
+    if not np.any(sizes >= 2):
+        return None
+    worst = int(np.argmax(np.where(sizes >= 2, costs, -np.inf)))
+    members = np.flatnonzero(labels == worst)
+    seed = members[np.argmax(distances[members])]
+    to_seed = product_one_lambdas(lambdas)[worst] @ views.block(members, [seed])[:, :, 0]
+    labels = labels.copy()
+    labels[members[to_seed < distances[members]]] = n_clusters
+    labels[seed] = n_clusters
+    return labels
+
+
+def first_view(d_matrices, views):
+    """Primeira visão como matriz n x n (índices de mrdca.validity)"""
+    if not isinstance(d_matrices, ViewBackend):
+        return np.asarray(d_matrices[0])
+    everything = np.arange(views.n_objects)
+    return views.block(everything, everything)[0]
+
+
+def is_better(value, best, criterion):
+    """Compara dois valores do índice (NaN nunca é melhor)"""
+    if value is None or np.isnan(value):
+        return False
+    if best is None:
+        return True
+    return value < best if criterion in MINIMIZED else value > best
+
+
+def sweep(d_matrices, k_min=2, k_max=None, criterion='Silhouette_Ponderada', indices=(),
+          n_init=10, patience=2, min_gain=MIN_GAIN, random_state=42, matrix=None,
+          verbose=False, **fit_params):
+    """
+    Varre K = k_min..k_max com partida a quente e recomenda o melhor K
+
+    Args:
+        d_matrices: Lista de matrizes de dissimilaridade ou backend de visões
+        k_min: Menor número de clusters (pelo menos 2)
+        k_max: Maior número de clusters (padrão: raiz de n)
+        criterion: Índice que escolhe K (ver CRITERIA)
+        indices: Índices adicionais registrados na curva
+        n_init: Reinícios aleatórios em k_min (seeds random_state + i)
+        patience: Valores seguidos de K sem melhora antes de parar (None
+            varre até k_max)
+        min_gain: Redução relativa mínima de J para avaliar um K (0
+            avalia todos)
+        random_state: Seed base
+        matrix: Matriz n x n para os índices de mrdca.validity (padrão:
+            primeira visão)
+        verbose: Se True, imprime cada ponto da curva
+        **fit_params: Parâmetros repassados a engine.fit (ex.: use_kernel)
+
+    Returns:
+        Dicionário com o 'K' recomendado, o 'Criterio', a 'Curva' (uma
+        entrada por K ajustado, com objetivo, iterações, segundos, se foi
+        podado e os índices), 'Rotulos', 'Lambdas' e 'Prototipos' da
+        solução recomendada, o número de 'Ajustes' e os 'Segundos' totais
+    """
+    names = [criterion] + [name for name in indices if name != criterion]
+    unknown = set(names) - set(CRITERIA)
+    if unknown:
+        raise ValueError(f"Índices desconhecidos: {sorted(unknown)}")
+    views = as_backend(d_matrices)
+    n_objects = views.n_objects
+    k_min = max(2, k_min)
+    if k_max is None:
+        k_max = max(k_min, int(np.sqrt(n_objects)))
+    k_max = min(k_max, n_objects - 1)
+    plain = [name for name in names if name != 'Silhouette_Ponderada']
+    if plain and matrix is None:
+        matrix = first_view(d_matrices, views)
+
+    def score(labels, lambdas):
+        values = dict.fromkeys(names, float('nan'))
+        try:
+            if 'Silhouette_Ponderada' in names:
+                values['Silhouette_Ponderada'] = weighted_silhouette(views, labels, lambdas)
+            if plain:
+                values.update(validity_indices(matrix, labels, plain))
+        except ValueError:
+            pass  # Menos de dois clusters não vazios
+        return values
+
+    started = time.perf_counter()
+    fit_params.pop('init_labels', None)
+    best_start = None
+    for restart in range(n_init):
+        seed = None if random_state is None else random_state + restart
+        solution = fit(views, k_min, random_state=seed, **fit_params)
+        if best_start is None or solution[4][-1] < best_start[4][-1]:
+            best_start = solution
+    n_fits = n_init
+
+    curve = []
+    best = None
+    stale = 0
+    solution = best_start
+    n_clusters = k_min
+    fit_started = started
+    while True:
+        labels, lambdas, prototypes, iterations, objectives = solution
+        objective = float(objectives[-1])
+        pruned = False
+        if curve:
+            previous = curve[-1]['Objetivo']
+            pruned = (previous - objective) < min_gain * abs(previous)
+        entry = {
+            'K': n_clusters,
+            'Inicio': 'divisao' if curve else 'aleatorio',
+            'Objetivo': objective,
+            'Iteracoes': iterations,
+            'Segundos': time.perf_counter() - fit_started,
+            'Podado': pruned,
+        }
+        entry.update(dict.fromkeys(names) if pruned else score(labels, lambdas))
+        curve.append(entry)
+        if verbose:
+            value = entry[criterion]
+            shown = 'podado' if pruned else f"{criterion} = {value:.4f}"
+            print(f"K = {n_clusters}: J = {objective:.4f}, {iterations} iterações, {shown}")
+
+        if not pruned and is_better(entry[criterion], None if best is None else best['Valor'],
+                                       criterion):
+            best = {'K': n_clusters, 'Valor': entry[criterion], 'Rotulos': labels,
+                    'Lambdas': lambdas, 'Prototipos': prototypes}
+            stale = 0
+        elif len(curve) > 1:
+            stale += 1
+        if (patience is not None and stale >= patience) or n_clusters >= k_max:
+            break
+
+        # Partida a quente: divide o pior cluster da solução atual
+        init_labels = split_worst(views, labels, lambdas, prototypes)
+        if init_labels is None:
+            break
+        n_clusters += 1
+        fit_started = time.perf_counter()
+        solution = fit(views, n_clusters, init_labels=init_labels, **fit_params)
+        n_fits += 1
+
+    if best is None:
+        best = {'K': k_min, 'Valor': None, 'Rotulos': best_start[0],
+                'Lambdas': best_start[1], 'Prototipos': best_start[2]}
+    return {
+        'K': best['K'],
+        'Criterio': criterion,
+        'Curva': curve,
+        'Rotulos': best['Rotulos'],
+        'Lambdas': best['Lambdas'],
+        'Prototipos': best['Prototipos'],
+        'Ajustes': n_fits,
+        'Segundos': time.perf_counter() - started,
+    }
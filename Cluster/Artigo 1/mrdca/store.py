@@ -0,0 +1,255 @@
+"""
+Armazenamento incremental dos resultados em SQLite (só inserções).
+
+Cada execução do experimento recebe um identificador (o timestamp usado
+nos nomes dos relatórios) e cada reinício é gravado assim que termina,
+com seed, métricas, tempo, pesos lambda e, opcionalmente, a telemetria
+de cada iteração (mrdca.telemetry). As tabelas só recebem INSERT, em
+modo WAL, então é possível consultar uma execução ainda em andamento e
+comparar execuções diferentes no mesmo arquivo.
+
+Tabelas:
+
+- execucoes: Execucao, Inicio, Parametros (JSON)
+- reinicios: uma linha por reinício, com as mesmas chaves dos resultados
+  de run_single_test mais Execucao, Base, Seed, N_Objetos, N_Clusters e
+  Lambdas (JSON, K x p)
+- iteracoes: uma linha por iteração de cada reinício, com critério,
+  objetos movidos, tempo de cada passo e Lambdas (JSON)
+
+Os relatórios Excel/TXT são gerados a partir do arquivo por
+mrdca.reporting.export_reports, e calculate_statistics agrega direto nele.
+"""
+import json
+import math
+import os
+import sqlite3
+from datetime import datetime
+
+# Métricas agregadas por calculate_statistics
+METRICS = ('ARI', 'NMI', 'Silhouette', 'Lambda1_Media', 'Lambda2_Media', 'N_Iteracoes')
+
+# Colunas numéricas de cada reinício, na ordem dos resultados
+RESTART_COLUMNS = ('Teste', 'ARI', 'NMI', 'Silhouette', 'Lambda1_Media', 'Lambda2_Media',
+                   'N_Iteracoes', 'Objetivo', 'Segundos')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    Execucao TEXT PRIMARY KEY,
+    Inicio TEXT NOT NULL,
+    Parametros TEXT
+);
+CREATE TABLE IF NOT EXISTS reinicios (
+    Execucao TEXT NOT NULL REFERENCES execucoes(Execucao),
+    Base TEXT NOT NULL,
+    Teste INTEGER NOT NULL,
+    Seed INTEGER,
+    N_Objetos INTEGER,
+    N_Clusters INTEGER,
+    ARI REAL,
+    NMI REAL,
+    Silhouette REAL,
+    Lambda1_Media REAL,
+    Lambda2_Media REAL,
+    N_Iteracoes INTEGER,
+    Objetivo REAL,
+    Segundos REAL,
+    Lambdas TEXT,
+    Gravado_Em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reinicios_execucao ON reinicios (Execucao, Base);
+CREATE TABLE IF NOT EXISTS iteracoes (
+    Execucao TEXT NOT NULL,
+    Base TEXT NOT NULL,
+    Teste INTEGER NOT NULL,
+    Iteracao INTEGER NOT NULL,
+    Objetivo REAL,
+    Movidos INTEGER,
+    Tempo_Lambdas REAL,
+    Tempo_Alocacao REAL,
+    Tempo_Prototipos REAL,
+    Lambdas TEXT
+);
+CREATE INDEX IF NOT EXISTS iteracoes_execucao ON iteracoes (Execucao, Base, Teste);
+"""
+
+
+def _scalar(value):
+    """Converte escalares NumPy para tipos nativos do sqlite3"""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _json(value):
+    """Serializa listas/arrays (None permanece None)"""
+    if value is None:
+        return None
+    return json.dumps(value.tolist() if hasattr(value, 'tolist') else value)
+
+
+class ResultsStore:
+    """
+    Arquivo SQLite com os resultados de todas as execuções
+
+    Args:
+        path: Caminho do arquivo (o diretório é criado se necessário)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start_run(self, run_id=None, parameters=None):
+        """
+        Registra uma nova execução
+
+        Args:
+            run_id: Identificador (padrão: timestamp atual; recebe sufixo
+                se já existir)
+            parameters: Dicionário com os parâmetros da execução
+
+        Returns:
+            Identificador da execução
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        candidate, suffix = run_id, 1
+        while self.connection.execute('SELECT 1 FROM execucoes WHERE Execucao = ?',
+                                      (candidate,)).fetchone():
+            suffix += 1
+            candidate = f'{run_id}_{suffix}'
+        with self.connection:
+            self.connection.execute('INSERT INTO execucoes VALUES (?, ?, ?)',
+                                    (candidate, datetime.now().isoformat(timespec='seconds'),
+                                     json.dumps(parameters or {}, default=str)))
+        return candidate
+
+    def add_restart(self, run_id, dataset, result, seed=None, n_objects=None, n_clusters=None):
+        """
+        Grava um reinício (e a telemetria de suas iterações) assim que termina
+
+        Args:
+            run_id: Execução (start_run)
+            dataset: Nome da base de dados
+            result: Dicionário de run_single_test; 'Lambdas' (K x p) e
+                'Telemetria' (registros de mrdca.telemetry) são opcionais
+            seed: Seed do reinício
+            n_objects: Número de objetos da base
+            n_clusters: Número de clusters
+        """
+        values = [result.get(column) for column in RESTART_COLUMNS]
+        with self.connection:
+            self.connection.execute(
+                f"INSERT INTO reinicios (Execucao, Base, Seed, N_Objetos, N_Clusters, "
+                f"{', '.join(RESTART_COLUMNS)}, Lambdas, Gravado_Em) "
+                f"VALUES ({', '.join('?' * (len(RESTART_COLUMNS) + 7))})",
+                [run_id, dataset, _scalar(seed), _scalar(n_objects), _scalar(n_clusters),
+                 *[_scalar(value) for value in values],
+                 _json(result.get('Lambdas')), datetime.now().isoformat(timespec='seconds')])
+            records = result.get('Telemetria') or []
+            self.connection.executemany(
+                'INSERT INTO iteracoes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, dataset, _scalar(result['Teste']), record['Iteracao'],
+                  record['Objetivo'], record['Movidos'], record['Tempos']['Lambdas'],
+                  record['Tempos']['Alocacao'], record['Tempos']['Prototipos'],
+                  _json(record['Lambdas']))
+                 for record in records])
+
+    def runs(self):
+        """Execuções registradas, da mais recente para a mais antiga"""
+        rows = self.connection.execute('SELECT * FROM execucoes ORDER BY Inicio DESC, rowid DESC')
+        return [{**dict(row), 'Parametros': json.loads(row['Parametros'] or '{}')} for row in rows]
+
+    def latest_run(self):
+        """Identificador da execução mais recente (None se vazio)"""
+        runs = self.runs()
+        return runs[0]['Execucao'] if runs else None
+
+    def datasets(self, run_id):
+        """Bases gravadas em uma execução, na ordem de gravação"""
+        rows = self.connection.execute(
+            'SELECT Base FROM reinicios WHERE Execucao = ? GROUP BY Base ORDER BY MIN(rowid)',
+            (run_id,))
+        return [row['Base'] for row in rows]
+
+    def _select(self, table, run_id, dataset, order):
+        query, params = f'SELECT * FROM {table}', []
+        conditions = []
+        if run_id is not None:
+            conditions.append('Execucao = ?')
+            params.append(run_id)
+        if dataset is not None:
+            conditions.append('Base = ?')
+            params.append(dataset)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        rows = self.connection.execute(f'{query} ORDER BY {order}', params)
+        return [{key: json.loads(row[key]) if key == 'Lambdas' and row[key] else row[key]
+                 for key in row.keys()} for row in rows]
+
+    def restarts(self, run_id=None, dataset=None):
+        """
+        Reinícios gravados
+
+        Args:
+            run_id: Filtra por execução (padrão: todas)
+            dataset: Filtra por base (padrão: todas)
+
+        Returns:
+            Lista de dicionários (mesmas chaves dos resultados de
+            run_single_test, mais as colunas da tabela)
+        """
+        return self._select('reinicios', run_id, dataset, 'Execucao, Base, Teste')
+
+    def iterations(self, run_id=None, dataset=None):
+        """Telemetria por iteração gravada (ver restarts)"""
+        return self._select('iteracoes', run_id, dataset, 'Execucao, Base, Teste, Iteracao')
+
+    def aggregate(self, run_id, dataset, metrics=METRICS):
+        """
+        Média, desvio padrão amostral, mínimo e máximo de cada métrica
+
+        A agregação é feita pelo SQLite em duas passadas: uma subconsulta
+        calcula as médias e a consulta externa soma os quadrados dos desvios
+        em torno delas (SUM(x^2) - SUM(x)^2 / n perderia precisão quando o
+        desvio é pequeno perto da média). O desvio padrão usa a mesma
+        correção (n - 1) de pandas.
+
+        Args:
+            run_id: Execução
+            dataset: Base de dados
+            metrics: Colunas agregadas
+
+        Returns:
+            Dicionário {métrica: (média, desvio, mínimo, máximo)}
+        """
+        means = ', '.join(f'AVG({m}) AS Media_{index}' for index, m in enumerate(metrics))
+        columns = ', '.join(f'AVG({m}), SUM(({m} - Media_{index}) * ({m} - Media_{index})), '
+                            f'COUNT({m}), MIN({m}), MAX({m})'
+                            for index, m in enumerate(metrics))
+        row = self.connection.execute(
+            f'SELECT {columns} FROM reinicios, '
+            f'(SELECT {means} FROM reinicios WHERE Execucao = ? AND Base = ?) '
+            f'WHERE Execucao = ? AND Base = ?',
+            (run_id, dataset, run_id, dataset)).fetchone()
+        summary = {}
+        for index, metric in enumerate(metrics):
+            mean, squares, count, low, high = row[5 * index:5 * index + 5]
+            std = float('nan')
+            if count and count > 1:
+                std = math.sqrt(squares / (count - 1))
+            summary[metric] = (mean, std, low, high)
+        return summary
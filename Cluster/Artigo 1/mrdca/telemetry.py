@@ -0,0 +1,137 @@
+"""
+Telemetria por iteração do MRDCA-RWL.
+
+engine.fit (e mrdca_rwl) aceitam callback=função(registro) -> bool,
+chamada ao fim de cada iteração com os tempos dos passos (pesos lambda,
+alocação e protótipos), o critério J, o número de objetos que mudaram de
+cluster, os pesos lambda e os protótipos. Retornar True interrompe o
+ajuste. Sem callback nada é registrado, ao contrário de verbose=True,
+que imprime a cada iteração.
+
+Recorder guarda os registros e os exporta como log estruturado (JSON
+Lines) ou como trace do Chrome (chrome://tracing ou Perfetto).
+stop_when monta critérios de parada antecipada.
+"""
+import json
+import os
+
+import numpy as np
+
+PHASES = ('Lambdas', 'Alocacao', 'Prototipos')
+
+
+def stop_when(max_seconds=None, max_moved=None, min_improvement=None):
+    """
+    Critério de parada antecipada para o callback de engine.fit
+
+    Args:
+        max_seconds: Para quando o tempo total do ajuste passar disso
+        max_moved: Para quando no máximo essa quantidade de objetos mudar
+            de cluster em uma iteração
+        min_improvement: Para quando a redução relativa do critério J em
+            uma iteração ficar abaixo disso
+
+    Returns:
+        Função (registro) -> bool
+    """
+    def stop(record):
+        if max_seconds is not None and record['Tempo_Total'] >= max_seconds:
+            return True
+        if max_moved is not None and record['Movidos'] <= max_moved:
+            return True
+        if min_improvement is not None:
+            previous = record['Objetivo_Anterior']
+            improvement = (previous - record['Objetivo']) / abs(previous) if previous else 0.0
+            if improvement < min_improvement:
+                return True
+        return False
+
+    return stop
+
+
+def as_json(record):
+    """Registro com arrays convertidos para listas"""
+    return {key: value.tolist() if isinstance(value, np.ndarray) else value
+            for key, value in record.items()}
+
+
+class Recorder:
+    """
+    Callback que guarda a telemetria de cada iteração
+
+    Args:
+        stop: Critério de parada (registro) -> bool, ex.: stop_when(...)
+        name: Nome da execução no trace (ex.: dataset e seed)
+    """
+
+    def __init__(self, stop=None, name='MRDCA-RWL'):
+        self.stop = stop
+        self.name = name
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+        return bool(self.stop(record)) if self.stop is not None else False
+
+    def summary(self):
+        """
+        Resumo das iterações registradas
+
+        Returns:
+            Dicionário com o tempo total e a fração de cada passo, as
+            iterações, os objetos movidos por iteração e o critério final
+        """
+        totals = {phase: sum(record['Tempos'][phase] for record in self.records)
+                  for phase in PHASES}
+        elapsed = sum(totals.values())
+        return {
+            'Iteracoes': len(self.records),
+            'Tempos': totals,
+            'Fracoes': {phase: seconds / elapsed if elapsed else 0.0
+                        for phase, seconds in totals.items()},
+            'Movidos': [record['Movidos'] for record in self.records],
+            'Objetivo': self.records[-1]['Objetivo'] if self.records else None,
+        }
+
+    def save_log(self, path):
+        """Grava um registro JSON por linha (JSON Lines)"""
+        with open(path, 'w', encoding='utf-8') as file:
+            for record in self.records:
+                file.write(json.dumps(as_json(record), ensure_ascii=False) + '\n')
+
+    def chrome_trace(self):
+        """
+        Registros no formato Trace Event do Chrome
+
+        Cada passo vira um evento de duração ('X') e o critério J e os
+        objetos movidos viram contadores ('C'), com tempos em microssegundos
+        a partir do primeiro passo registrado.
+
+        Returns:
+            Dicionário com a lista traceEvents
+        """
+        if not self.records:
+            return {'traceEvents': []}
+        origin = self.records[0]['Inicios']['Lambdas']
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid,
+                   'args': {'name': self.name}}]
+        for record in self.records:
+            for phase in PHASES:
+                events.append({
+                    'name': phase, 'cat': 'mrdca', 'ph': 'X', 'pid': pid, 'tid': 0,
+                    'ts': (record['Inicios'][phase] - origin) * 1e6,
+                    'dur': record['Tempos'][phase] * 1e6,
+                    'args': {'Iteracao': record['Iteracao']},
+                })
+            end = (record['Inicios']['Prototipos'] + record['Tempos']['Prototipos'] - origin) * 1e6
+            events.append({'name': 'Objetivo', 'ph': 'C', 'pid': pid, 'ts': end,
+                           'args': {'J': record['Objetivo']}})
+            events.append({'name': 'Movidos', 'ph': 'C', 'pid': pid, 'ts': end,
+                           'args': {'Objetos': record['Movidos']}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_trace(self, path):
+        """Grava o trace do Chrome em JSON"""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.chrome_trace(), file)
@@ -0,0 +1,374 @@
+"""
+Índices de validação calculados a partir de matrizes de dissimilaridade.
+
+As visões do MRDCA-RWL já guardam todas as distâncias par a par, então
+nenhum índice precisa recalculá-las dos atributos. Quase tudo sai das
+somas por cluster S[i, k] = soma_{o em C_k} d(i, o) (e das mesmas somas
+com d^2), obtidas com um único produto matriz x indicadora:
+
+- Silhouette: a(i) = S[i, C(i)] / (|C(i)| - 1), b(i) = min_k S[i, k] / |C_k|
+- Calinski-Harabasz: dispersões intra e total pela identidade
+  soma_{i em C} ||x_i - c||^2 = soma_{i, o em C} d(i, o)^2 / (2|C|)
+- Davies-Bouldin e DB*: distância média de cada objeto ao centróide do
+  seu cluster (q = 1, como sklearn.metrics.davies_bouldin_score) e
+  distâncias entre centróides, ambas exatas a partir de d^2 quando a
+  visão é euclidiana: ||x_i - c_k||^2 = S2[i, k] / |C_k| - dispersão de C_k
+- Dunn e COP: mínimos e máximos por cluster em uma passada por blocos de
+  linhas; o COP usa o medoide no lugar do centróide
+- C-index, Gamma e G+: comparam distâncias intra e inter-cluster e por
+  isso guardam todos os n(n-1)/2 pares (O(n^2) de memória)
+
+weighted_silhouette estende a silhouette a várias visões: a distância de
+um objeto a C_k é medida com os pesos lambda do próprio C_k.
+"""
+import numpy as np
+
+from .backends import as_backend
+from .medoids import one_hot
+
+INDICES = ('Silhouette', 'Davies_Bouldin', 'Davies_Bouldin_Estrela', 'Calinski_Harabasz',
+           'Dunn', 'COP', 'C_Index', 'Gamma', 'G_Plus')
+
+# Índices que precisam de todos os pares de distâncias
+PAIR_INDICES = ('C_Index', 'Gamma', 'G_Plus')
+
+# Índices em que menor é melhor (nos demais, maior é melhor)
+MINIMIZED = ('Davies_Bouldin', 'Davies_Bouldin_Estrela', 'COP', 'C_Index', 'G_Plus')
+
+# Linhas da matriz lidas por vez
+TILE_ROWS = 1024
+
+
+def relabel(labels):
+    """
+    Renumera os rótulos como 0..K-1 (só clusters não vazios)
+
+    Args:
+        labels: Vetor de rótulos (quaisquer inteiros)
+
+    Returns:
+        Tupla (rótulos 0..K-1, K)
+    """
+    unique, labels = np.unique(np.asarray(labels), return_inverse=True)
+    return labels.astype(np.intp), len(unique)
+
+
+def check_labels(labels, n_clusters):
+    """Exige 2 <= K <= n - 1, como sklearn.metrics.silhouette_score"""
+    if not 2 <= n_clusters <= len(labels) - 1:
+        raise ValueError(f"Número de clusters inválido: {n_clusters} "
+                         f"(esperado de 2 a n - 1 = {len(labels) - 1})")
+
+
+def row_blocks(matrix):
+    """Percorre a matriz em blocos de linhas (funciona com np.memmap)"""
+    n_objects = matrix.shape[0]
+    for start in range(0, n_objects, TILE_ROWS):
+        stop = min(start + TILE_ROWS, n_objects)
+        yield start, stop, np.asarray(matrix[start:stop], dtype=np.float64)
+
+
+def distance_sums(matrix, labels, n_clusters, power=1):
+    """
+    Soma das dissimilaridades (elevadas a power) de cada objeto a cada cluster
+
+    Args:
+        matrix: Matriz de dissimilaridade n x n
+        labels: Vetor de rótulos (0..K-1)
+        n_clusters: Número de clusters
+        power: Expoente aplicado às dissimilaridades
+
+    Returns:
+        Array (n, K)
+    """
+    indicator = one_hot(labels, n_clusters)
+    sums = np.empty((len(labels), n_clusters))
+    for start, stop, block in row_blocks(matrix):
+        sums[start:stop] = (block if power == 1 else block ** power) @ indicator
+    return sums
+
+
+def silhouette_from_sums(sums, labels, sizes):
+    """
+    Silhouette média a partir das somas por cluster
+
+    Args:
+        sums: Somas S[i, k] (n, K)
+        labels: Vetor de rótulos (0..K-1)
+        sizes: Tamanho de cada cluster
+
+    Returns:
+        Silhouette média (objetos isolados em seu cluster valem 0)
+    """
+    rows = np.arange(len(labels))
+    own_size = sizes[labels]
+    a = sums[rows, labels] / np.maximum(own_size - 1, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(sizes > 0, sums / sizes, np.inf)
+    means[rows, labels] = np.inf
+    b = means.min(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = (b - a) / np.maximum(a, b)
+    scores[own_size == 1] = 0
+    return float(np.nan_to_num(scores).mean())
+
+
+def silhouette(matrix, labels):
+    """
+    Silhouette média a partir de uma matriz de dissimilaridade
+
+    Equivale a sklearn.metrics.silhouette_score(matrix, labels,
+    metric='precomputed').
+
+    Args:
+        matrix: Matriz de dissimilaridade n x n
+        labels: Vetor de rótulos
+
+    Returns:
+        Silhouette média
+    """
+    labels, n_clusters = relabel(labels)
+    check_labels(labels, n_clusters)
+    sums = distance_sums(matrix, labels, n_clusters)
+    return silhouette_from_sums(sums, labels, np.bincount(labels, minlength=n_clusters))
+
+
+def weighted_silhouette(views, labels, lambdas):
+    """
+    Silhouette multi-visão ponderada pelos lambdas de cada cluster
+
+    A distância de um objeto ao cluster C_k é soma_j lambda_kj * d_j, com
+    os pesos do próprio C_k, a mesma medida que o MRDCA-RWL usa na alocação.
+
+    Args:
+        views: Backend de visões ou lista de matrizes de dissimilaridade
+        labels: Vetor de rótulos (0..K-1)
+        lambdas: Pesos (K, p), por exemplo os normalizados de engine.fit
+
+    Returns:
+        Silhouette média ponderada
+    """
+    views = as_backend(views)
+    labels = np.asarray(labels, dtype=np.intp)
+    lambdas = np.asarray(lambdas, dtype=np.float64)
+    n_clusters = len(lambdas)
+    sizes = np.bincount(labels, minlength=n_clusters)
+    check_labels(labels, np.count_nonzero(sizes))
+    sums = views.cluster_sums(one_hot(labels, n_clusters))
+    return silhouette_from_sums(np.einsum('jnk,kj->nk', sums, lambdas), labels, sizes)
+
+
+def centroid_geometry(pair, sizes):
+    """
+    Dispersões e distâncias entre centróides a partir das somas de d^2
+
+    Args:
+        pair: Somas pair[k, l] = soma_{i em C_k, o em C_l} d(i, o)^2 (K, K)
+        sizes: Tamanho de cada cluster
+
+    Returns:
+        Tupla (dispersão quadrática média de cada cluster (K,), distâncias
+        quadráticas entre centróides (K, K))
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spread = np.diag(pair) / (2.0 * sizes ** 2)
+        centers = pair / np.outer(sizes, sizes) - spread[:, None] - spread[None, :]
+    return spread, np.maximum(centers, 0)
+
+
+def centroid_scatter(squared_sums, labels, sizes, spread):
+    """
+    Distância média dos objetos ao centróide do próprio cluster
+
+    Args:
+        squared_sums: Somas S2[i, k] = soma_{o em C_k} d(i, o)^2 (n, K)
+        labels: Vetor de rótulos (0..K-1)
+        sizes: Tamanho de cada cluster
+        spread: Dispersão quadrática média de cada cluster (centroid_geometry)
+
+    Returns:
+        Array (K,) (zero nos clusters vazios)
+    """
+    own_size = sizes[labels]
+    squared = squared_sums[np.arange(len(labels)), labels] / own_size - spread[labels]
+    distances = np.sqrt(np.maximum(squared, 0))
+    return np.bincount(labels, weights=distances, minlength=len(sizes)) / np.maximum(sizes, 1)
+
+
+def davies_bouldin_from_geometry(scatter, centers, sizes=None):
+    """
+    Davies-Bouldin e DB* a partir da geometria dos centróides
+
+    Args:
+        scatter: Distância média ao centróide em cada cluster (K,)
+        centers: Distâncias quadráticas entre centróides (K, K)
+        sizes: Tamanho de cada cluster (clusters vazios são ignorados)
+
+    Returns:
+        Tupla (Davies-Bouldin, DB*)
+    """
+    if sizes is not None:
+        present = np.flatnonzero(sizes)
+        scatter, centers = scatter[present], centers[np.ix_(present, present)]
+    others = ~np.eye(len(scatter), dtype=bool)
+    separation = np.sqrt(centers)
+    pair_scatter = scatter[:, None] + scatter[None, :]
+    with np.errstate(divide='ignore'):
+        ratios = pair_scatter / separation
+        nearest = np.where(others, separation, np.inf).min(axis=1)
+        star = np.where(others, pair_scatter, -np.inf).max(axis=1) / nearest
+    return (float(np.where(others, ratios, -np.inf).max(axis=1).mean()),
+            float(star.mean()))
+
+
+def calinski_harabasz_from_geometry(spread, sizes, total):
+    """
+    Calinski-Harabasz a partir das dispersões
+
+    Args:
+        spread: Dispersão quadrática média de cada cluster (K,)
+        sizes: Tamanho de cada cluster
+        total: Dispersão total soma_{i < o} d(i, o)^2 / n
+
+    Returns:
+        Índice de Calinski-Harabasz
+    """
+    present = sizes > 0
+    n_objects, n_clusters = sizes.sum(), np.count_nonzero(present)
+    within = float((sizes[present] * spread[present]).sum())
+    if within <= 0:
+        return 1.0
+    return float((total - within) * (n_objects - n_clusters) / (within * (n_clusters - 1)))
+
+
+def pair_distances(matrix, labels):
+    """
+    Distâncias de todos os pares i < o, separadas em intra e inter-cluster
+
+    Args:
+        matrix: Matriz de dissimilaridade n x n
+        labels: Vetor de rótulos
+
+    Returns:
+        Tupla (distâncias intra-cluster, distâncias inter-cluster)
+    """
+    n_objects = matrix.shape[0]
+    within, between = [], []
+    for start, stop, block in row_blocks(matrix):
+        rows = np.arange(start, stop)
+        cols = np.arange(start, n_objects)
+        upper = cols[None, :] > rows[:, None]
+        same = (labels[rows, None] == labels[None, cols])
+        values = block[:, start:]
+        within.append(values[upper & same])
+        between.append(values[upper & ~same])
+    return np.concatenate(within), np.concatenate(between)
+
+
+def extreme_distances(matrix, labels, n_clusters):
+    """
+    Menor e maior dissimilaridade de cada objeto a cada cluster
+
+    Args:
+        matrix: Matriz de dissimilaridade n x n
+        labels: Vetor de rótulos (0..K-1, todos os clusters não vazios)
+        n_clusters: Número de clusters
+
+    Returns:
+        Tupla de arrays (n, K): (mínimos, máximos)
+    """
+    order = np.argsort(labels, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=n_clusters))[:-1]])
+    lowest = np.empty((len(labels), n_clusters))
+    highest = np.empty((len(labels), n_clusters))
+    for start, stop, block in row_blocks(matrix):
+        grouped = block[:, order]
+        lowest[start:stop] = np.minimum.reduceat(grouped, bounds, axis=1)
+        highest[start:stop] = np.maximum.reduceat(grouped, bounds, axis=1)
+    return lowest, highest
+
+
+def validity_indices(matrix, labels, indices=INDICES):
+    """
+    Calcula vários índices de validação compartilhando as somas por cluster
+
+    Davies-Bouldin, DB* e Calinski-Harabasz usam centróides e só têm o
+    significado usual quando a matriz é euclidiana (d_matrices[0] com as
+    métricas padrão); em outras visões equivalem aos índices no espaço em
+    que essas dissimilaridades seriam euclidianas. Menores é melhor para
+    Davies-Bouldin, DB*, COP, C-index e G+; maiores para os demais.
+
+    Args:
+        matrix: Matriz de dissimilaridade n x n (array ou np.memmap)
+        labels: Vetor de rótulos
+        indices: Nomes dos índices a calcular (ver INDICES)
+
+    Returns:
+        Dicionário nome -> valor
+    """
+    unknown = set(indices) - set(INDICES)
+    if unknown:
+        raise ValueError(f"Índices desconhecidos: {sorted(unknown)}")
+    labels, n_clusters = relabel(labels)
+    check_labels(labels, n_clusters)
+    n_objects = len(labels)
+    sizes = np.bincount(labels, minlength=n_clusters)
+    rows = np.arange(n_objects)
+    results = {}
+
+    sums = None
+    if {'Silhouette', 'COP'} & set(indices):
+        sums = distance_sums(matrix, labels, n_clusters)
+    if 'Silhouette' in indices:
+        results['Silhouette'] = silhouette_from_sums(sums, labels, sizes)
+
+    if {'Davies_Bouldin', 'Davies_Bouldin_Estrela', 'Calinski_Harabasz'} & set(indices):
+        squared_sums = distance_sums(matrix, labels, n_clusters, power=2)
+        pair = one_hot(labels, n_clusters).T @ squared_sums
+        spread, centers = centroid_geometry(pair, sizes)
+        scatter = centroid_scatter(squared_sums, labels, sizes, spread)
+        davies_bouldin, davies_bouldin_star = davies_bouldin_from_geometry(scatter, centers)
+        if 'Davies_Bouldin' in indices:
+            results['Davies_Bouldin'] = davies_bouldin
+        if 'Davies_Bouldin_Estrela' in indices:
+            results['Davies_Bouldin_Estrela'] = davies_bouldin_star
+        if 'Calinski_Harabasz' in indices:
+            total = float(squared_sums.sum()) / (2.0 * n_objects)
+            results['Calinski_Harabasz'] = calinski_harabasz_from_geometry(spread, sizes, total)
+
+    if {'Dunn', 'COP'} & set(indices):
+        lowest, highest = extreme_distances(matrix, labels, n_clusters)
+        outside = labels[:, None] != np.arange(n_clusters)[None, :]
+        if 'Dunn' in indices:
+            separation = lowest[outside].min()
+            diameter = highest[rows, labels].max()
+            results['Dunn'] = float(separation / diameter) if diameter > 0 else np.inf
+        if 'COP' in indices:
+            # Dispersão: distância média ao medoide; separação: menor
+            # "distância máxima" de um objeto de fora até os membros
+            own = np.where(~outside, sums, np.inf)
+            intra = own.min(axis=0) / sizes
+            inter = np.where(outside, highest, np.inf).min(axis=0)
+            results['COP'] = float((sizes * intra / inter).sum() / n_objects)
+
+    if set(PAIR_INDICES) & set(indices):
+        within, between = pair_distances(matrix, labels)
+        if 'C_Index' in indices:
+            everything = np.concatenate([within, between])
+            count = len(within)
+            smallest = np.partition(everything, count - 1)[:count].sum() if count else 0.0
+            largest = np.partition(everything, len(everything) - count)[-count:].sum() if count else 0.0
+            results['C_Index'] = (float((within.sum() - smallest) / (largest - smallest))
+                                  if largest > smallest else 0.0)
+        if {'Gamma', 'G_Plus'} & set(indices):
+            between.sort()
+            # Pares (intra, inter) concordantes (intra < inter) e discordantes
+            concordant = float((len(between) - np.searchsorted(between, within, side='right')).sum())
+            discordant = float(np.searchsorted(between, within, side='left').sum())
+            if 'Gamma' in indices:
+                total = concordant + discordant
+                results['Gamma'] = (concordant - discordant) / total if total else 0.0
+            if 'G_Plus' in indices:
+                n_pairs = n_objects * (n_objects - 1) / 2
+                results['G_Plus'] = 2 * discordant / (n_pairs * (n_pairs - 1))
+    return {name: results[name] for name in indices}
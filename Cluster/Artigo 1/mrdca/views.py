@@ -0,0 +1,294 @@
+"""
+Construção das visões de dissimilaridade em blocos de linhas.
+
+Cada visão é descrita por um ViewSpec: um subconjunto de atributos e uma
+métrica (qualquer nome aceito por pairwise_distances do scikit-learn,
+como 'euclidean', 'cityblock', 'cosine', 'correlation' e 'chebyshev', ou
+uma função vetorizada). build_views calcula cada visão em blocos de
+linhas e escreve direto em um buffer pré-alocado (em memória ou np.memmap
+em disco), então o pico de memória é o resultado final mais os
+temporários de alguns blocos, e não o dobro do resultado como em uma
+chamada única a pairwise_distances. Os blocos podem ser distribuídos em
+um pool de threads (NumPy e BLAS liberam o GIL).
+
+O repr de um ViewSpec é a chave das visões no cache (mrdca.cache). Uma
+função usada como métrica entra na chave pelo nome e por content_digest,
+um hash do seu código, constantes, valores padrão, variáveis de closure e
+globais referenciadas, então duas lambdas do mesmo módulo ou uma função
+editada não reaproveitam visões calculadas com outra métrica.
+"""
+import functools
+import hashlib
+import os
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Linhas calculadas por bloco
+BLOCK_ROWS = 1024
+
+
+def _feed(digest, value, seen):
+    """Acrescenta um valor ao hash (arrays pelo conteúdo, funções pelo código)"""
+    if isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, value.dtype.str)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, types.CodeType):
+        digest.update(value.co_code)
+        digest.update(repr(value.co_names).encode())
+        _feed(digest, value.co_consts, seen)
+    elif isinstance(value, (tuple, list)):
+        digest.update(b'(')
+        for item in value:
+            _feed(digest, item, seen)
+        digest.update(b')')
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _feed(digest, value[key], seen)
+    elif callable(value) and not isinstance(value, type):
+        _feed_callable(digest, value, seen)
+    else:
+        # Objetos sem repr estável (com endereço de memória) só geram faltas
+        digest.update(repr(value).encode())
+
+
+def _feed_callable(digest, function, seen):
+    if id(function) in seen:
+        return
+    seen.add(id(function))
+    name = f'{getattr(function, "__module__", "")}.{getattr(function, "__qualname__", "")}'
+    digest.update(name.encode())
+    if isinstance(function, functools.partial):
+        _feed(digest, (function.func, function.args, function.keywords), seen)
+    elif isinstance(function, types.MethodType):
+        _feed(digest, (function.__func__, function.__self__), seen)
+    elif isinstance(function, types.FunctionType):
+        code = function.__code__
+        cells = tuple(cell.cell_contents for cell in function.__closure__ or ())
+        _feed(digest, (code, function.__defaults__, function.__kwdefaults__, cells), seen)
+        # Globais usadas pela função (constantes, arrays e outras funções)
+        used = {name: function.__globals__[name] for name in code.co_names
+                if name in function.__globals__
+                and not isinstance(function.__globals__[name], types.ModuleType)}
+        _feed(digest, used, seen)
+    elif hasattr(function, '__dict__') and not isinstance(function, types.BuiltinFunctionType):
+        # Objeto chamável: classe, método __call__ e atributos
+        call = getattr(type(function), '__call__', None)
+        _feed(digest, (type(function).__qualname__, call, vars(function)), seen)
+
+
+def content_digest(value):
+    """
+    Hash do conteúdo de um valor usado na descrição de uma visão
+
+    Args:
+        value: Função, lambda, functools.partial, objeto chamável ou
+            parâmetro (ex.: array)
+
+    Returns:
+        String hexadecimal; para funções muda com o código, as
+        constantes, os valores padrão, a closure e as globais referenciadas
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    _feed(digest, value, set())
+    return digest.hexdigest()
+
+
+class ViewSpec:
+    """
+    Descrição de uma visão de dissimilaridade
+
+    Args:
+        metric: Nome da métrica (pairwise_distances do scikit-learn) ou
+            função f(X_bloco, Y) -> matriz (len(X_bloco), len(Y)) de
+            dissimilaridades
+        features: Colunas usadas pela visão (índices, fatia ou máscara;
+            padrão: todas)
+        name: Nome da visão nos relatórios (padrão: nome da métrica)
+        **params: Parâmetros extras repassados à métrica
+    """
+
+    def __init__(self, metric='euclidean', features=None, name=None, **params):
+        self.metric = metric
+        self.features = features
+        self.params = params
+        if name is None:
+            name = metric if isinstance(metric, str) else getattr(metric, '__name__', 'custom')
+        self.name = name
+
+    def __repr__(self):
+        # Usado na chave do cache: identifica métrica, atributos e parâmetros
+        metric = self.metric
+        if not isinstance(metric, str):
+            name = getattr(metric, '__qualname__', type(metric).__qualname__)
+            metric = f'{getattr(metric, "__module__", "")}.{name}#{content_digest(metric)}'
+        features = self.features
+        if isinstance(features, np.ndarray):
+            features = features.tolist()
+        # Arrays nos parâmetros entram pelo conteúdo (o repr os abrevia)
+        params = sorted((key, content_digest(value)
+                         if isinstance(value, np.ndarray) or callable(value) else value)
+                        for key, value in self.params.items())
+        return f'ViewSpec({metric!r}, features={features!r}, params={params!r})'
+
+    def to_dict(self):
+        """
+        Descrição serializável em JSON (ver from_dict)
+
+        Funções são guardadas pelo caminho de importação (módulo:nome), então
+        precisam estar definidas no nível de um módulo.
+
+        Returns:
+            Dicionário com métrica, atributos, nome e parâmetros
+        """
+        metric = self.metric
+        if callable(metric):
+            qualname = getattr(metric, '__qualname__', '')
+            if not qualname or '<' in qualname:
+                raise ValueError(f"Métrica não serializável: {metric!r}")
+            metric = {'funcao': f'{metric.__module__}:{qualname}'}
+        features = self.features
+        if isinstance(features, slice):
+            features = {'fatia': [features.start, features.stop, features.step]}
+        elif features is not None:
+            features = np.asarray(features).tolist()
+        params = {key: value.tolist() if isinstance(value, np.ndarray) else value
+                  for key, value in self.params.items()}
+        return {'metrica': metric, 'atributos': features, 'nome': self.name, 'parametros': params}
+
+    @classmethod
+    def from_dict(cls, description):
+        """Reconstrói o ViewSpec de to_dict (listas nos parâmetros viram arrays)"""
+        metric = description['metrica']
+        if isinstance(metric, dict):
+            import importlib
+            module, qualname = metric['funcao'].split(':')
+            metric = importlib.import_module(module)
+            for part in qualname.split('.'):
+                metric = getattr(metric, part)
+        features = description['atributos']
+        if isinstance(features, dict):
+            features = slice(*features['fatia'])
+        elif features is not None:
+            features = np.asarray(features)
+        params = {key: np.asarray(value) if isinstance(value, list) else value
+                  for key, value in description['parametros'].items()}
+        return cls(metric, features, description['nome'], **params)
+
+    def select(self, data):
+        """Atributos da visão"""
+        return data if self.features is None else data[:, self.features]
+
+    def distances(self, rows, cols):
+        """
+        Dissimilaridades entre dois conjuntos de objetos (já com os atributos da visão)
+
+        Args:
+            rows: Atributos dos objetos das linhas
+            cols: Atributos dos objetos das colunas
+
+        Returns:
+            Array (len(rows), len(cols))
+        """
+        if callable(self.metric):
+            return np.asarray(self.metric(rows, cols, **self.params))
+        from sklearn.metrics.pairwise import pairwise_distances
+        return pairwise_distances(rows, cols, metric=self.metric, **self.params)
+
+
+def as_view_specs(metrics):
+    """
+    Normaliza a descrição das visões para uma lista de ViewSpec
+
+    Args:
+        metrics: Lista com nomes de métricas, funções, tuplas
+            (atributos, métrica) ou ViewSpec
+
+    Returns:
+        Lista de ViewSpec
+    """
+    specs = []
+    for metric in metrics:
+        if isinstance(metric, ViewSpec):
+            specs.append(metric)
+        elif isinstance(metric, tuple):
+            features, metric = metric
+            specs.append(ViewSpec(metric, features))
+        else:
+            specs.append(ViewSpec(metric))
+    return specs
+
+
+def allocate_views(n_objects, n_views, dtype=np.float64, directory=None, suffix=''):
+    """
+    Buffers de saída das visões, em memória ou em arquivos .npy mapeados
+
+    Args:
+        n_objects: Número de objetos
+        n_views: Número de visões
+        dtype: Tipo das visões
+        directory: Diretório dos arquivos view_<j>.npy (None: memória)
+        suffix: Sufixo dos nomes de arquivo (ex.: para escrita atômica)
+
+    Returns:
+        Tupla (lista de arrays n x n, lista de caminhos ou None)
+    """
+    if directory is None:
+        return [np.empty((n_objects, n_objects), dtype=dtype) for _ in range(n_views)], None
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f'view_{view}.npy{suffix}') for view in range(n_views)]
+    views = [np.lib.format.open_memmap(path, mode='w+', dtype=dtype,
+                                       shape=(n_objects, n_objects)) for path in paths]
+    return views, paths
+
+
+def build_views(data, metrics=('euclidean', 'cityblock'), out=None, directory=None,
+                dtype=np.float64, block_rows=BLOCK_ROWS, n_jobs=1):
+    """
+    Calcula as visões de dissimilaridade em blocos de linhas
+
+    Args:
+        data: Dados de entrada (n, d)
+        metrics: Visões (ver as_view_specs)
+        out: Buffers pré-alocados, um n x n por visão (opcional)
+        directory: Se definido (e out não), grava cada visão em
+            directory/view_<j>.npy via np.memmap
+        dtype: Tipo das visões criadas
+        block_rows: Linhas calculadas por bloco
+        n_jobs: Threads (1 = sequencial, None = todos os núcleos)
+
+    Returns:
+        Lista de matrizes n x n (np.memmap se directory foi usado)
+    """
+    data = np.asarray(data)
+    specs = as_view_specs(metrics)
+    n_objects = len(data)
+    if out is None:
+        out, _ = allocate_views(n_objects, len(specs), dtype, directory)
+
+    features = [spec.select(data) for spec in specs]
+
+    def fill(task):
+        view, start = task
+        stop = min(start + block_rows, n_objects)
+        block = specs[view].distances(features[view][start:stop], features[view])
+        # Diagonal exatamente nula (o truque do produto interno deixa resíduos)
+        block[np.arange(stop - start), np.arange(start, stop)] = 0
+        out[view][start:stop] = block
+
+    tasks = [(view, start) for view in range(len(specs))
+             for start in range(0, n_objects, block_rows)]
+    if n_jobs == 1:
+        for task in tasks:
+            fill(task)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs or os.cpu_count()) as pool:
+            # list() propaga exceções das threads
+            list(pool.map(fill, tasks))
+
+    for matrix in out:
+        if isinstance(matrix, np.memmap):
+            matrix.flush()
+    return out
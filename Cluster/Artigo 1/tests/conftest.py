@@ -0,0 +1,18 @@
+"""
+Dados pequenos compartilhados pelos testes do pacote mrdca.
+"""
+import pytest
+from synthetic import make_blobs
+
+from mrdca.views import build_views
+
+
+@pytest.fixture
+def blobs():
+    return make_blobs()
+
+
+@pytest.fixture
+def d_matrices(blobs):
+    """Visões euclidiana e cityblock dos grupos gaussianos"""
+    return build_views(blobs[0], ('euclidean', 'cityblock'))
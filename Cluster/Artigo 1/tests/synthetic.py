@@ -0,0 +1,17 @@
+"""
+Dados sintéticos usados pelos testes.
+"""
+import numpy as np
+
+
+def make_blobs(n_objects=90, n_clusters=3, n_features=4, offset=0.0, seed=0):
+    """Grupos gaussianos bem separados (n, d) e seus rótulos verdadeiros"""
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n_objects) % n_clusters
+    centers = rng.normal(scale=4.0, size=(n_clusters, n_features))
+    return offset + centers[labels] + rng.normal(size=(n_objects, n_features)), labels
+
+
+def half_cityblock(rows, cols):
+    """Métrica de módulo (serializável por ViewSpec.to_dict)"""
+    return 0.5 * np.abs(rows[:, None, :] - cols[None, :, :]).sum(axis=2)
@@ -0,0 +1,58 @@
+"""
+Benchmark: casos pelo pipeline e comparação de relatórios.
+"""
+import copy
+
+import pytest
+
+from mrdca import benchmark, pipeline
+
+CASE = {'Dataset': 'Sintetico', 'N': 120, 'P': 2, 'K': 3}
+
+
+@pytest.fixture(scope='module')
+def report():
+    result = benchmark.run_case(CASE, repeats=2)
+    return {'Versao': benchmark.SCHEMA, 'Resultados': [result]}
+
+
+def rows_by_metric(rows):
+    return {row['Metrica']: row for row in rows}
+
+
+def test_run_case_keeps_user_cache(report):
+    cache = pipeline.dissimilarity_cache
+    benchmark.run_case(CASE, repeats=1)
+    assert pipeline.dissimilarity_cache is cache
+    result = report['Resultados'][0]
+    assert all(len(result['Tempos'][phase]) == 2 for phase in benchmark.PHASES)
+    assert result['Iteracoes'][0] >= 1 and result['Objetivo'][0] > 0
+
+
+def test_compare_same_report_has_no_regression(report):
+    assert not any(row['Regressao'] for row in benchmark.compare(report, report))
+
+
+def test_compare_flags_regressions(report):
+    current = copy.deepcopy(report)
+    result = current['Resultados'][0]
+    result['Tempo_Mediano']['Agrupamento'] = max(
+        2 * result['Tempo_Mediano']['Agrupamento'], 2 * benchmark.MIN_SECONDS)
+    result['Tempo_Mediano']['Metricas'] *= 0.5
+    result['Pico_RSS_MB'] *= 1.5
+    result['ARI'] = [value - 0.1 for value in result['ARI']]
+    rows = rows_by_metric(benchmark.compare(report, current))
+    assert rows['Tempo_Agrupamento']['Regressao']
+    assert rows['Pico_RSS_MB']['Regressao']
+    assert rows['ARI']['Regressao']
+    assert not rows['Tempo_Metricas']['Regressao']
+    assert not rows['Iteracoes']['Regressao']
+
+
+def test_compare_ignores_noise_below_min_seconds(report):
+    baseline, current = copy.deepcopy(report), copy.deepcopy(report)
+    baseline['Resultados'][0]['Tempo_Mediano']['Metricas'] = 0.001
+    current['Resultados'][0]['Tempo_Mediano']['Metricas'] = 0.005
+    rows = rows_by_metric(benchmark.compare(baseline, current))
+    assert not rows['Tempo_Metricas']['Regressao']
+    assert rows['Tempo_Metricas']['Razao'] == pytest.approx(5.0)
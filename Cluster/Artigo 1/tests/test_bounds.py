@@ -0,0 +1,62 @@
+"""
+Alocação com limites de Elkan e Hamerly: mesma partição que a exata e
+menos distâncias calculadas.
+"""
+import numpy as np
+import pytest
+from synthetic import make_blobs
+
+from mrdca import engine
+from mrdca.backends import as_backend
+from mrdca.bounds import METHODS, BoundedAssignment
+from mrdca.telemetry import Recorder
+from mrdca.views import build_views
+
+
+@pytest.fixture(scope='module')
+def views():
+    return as_backend(build_views(make_blobs(n_objects=200, n_clusters=5, seed=3)[0],
+                                  ('euclidean', 'cityblock', 'chebyshev')))
+
+
+@pytest.mark.parametrize('method', METHODS)
+@pytest.mark.parametrize('n_clusters', [3, 5, 8])
+@pytest.mark.parametrize('seed', range(3))
+def test_fit_matches_exact_on_metric_views(views, method, n_clusters, seed):
+    exact = engine.fit(views, n_clusters, random_state=seed, use_kernel=False)
+    bounded = engine.fit(views, n_clusters, random_state=seed, use_kernel=False,
+                         assignment=method)
+    np.testing.assert_array_equal(bounded[0], exact[0])
+    np.testing.assert_array_equal(bounded[2], exact[2])
+    assert bounded[3] == exact[3]
+    np.testing.assert_allclose(bounded[4], exact[4], rtol=1e-12)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_fewer_distances_after_first_iteration(views, method):
+    n_clusters = 5
+    recorder = Recorder()
+    engine.fit(views, n_clusters, random_state=0, use_kernel=False, assignment=method,
+               tol=0.0, callback=recorder)
+    distances = [record['Distancias'] for record in recorder.records]
+    assert len(distances) >= 2
+    assert distances[0] == views.n_objects * n_clusters
+    assert all(count < views.n_objects * n_clusters for count in distances[1:])
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_repeated_assignment_reuses_bounds(views, method):
+    labels, lambdas, prototypes = engine.fit(views, 5, random_state=1, use_kernel=False)[:3]
+    bounded = BoundedAssignment(method)
+    first = bounded.assign(views, prototypes, lambdas)
+    assert bounded.n_distances == views.n_objects * 5
+    second = bounded.assign(views, prototypes, lambdas)
+    np.testing.assert_array_equal(first, second)
+    assert bounded.n_distances < views.n_objects * 5 and bounded.n_evaluated == 0
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        BoundedAssignment('foo')
+    with pytest.raises(ValueError):
+        engine.fit(build_views(make_blobs()[0]), 3, assignment='foo')
@@ -0,0 +1,101 @@
+"""
+Cache de matrizes de dissimilaridade: acertos, faltas e limite em disco.
+"""
+import os
+
+import numpy as np
+
+from mrdca.cache import DissimilarityCache, default_directory, fingerprint
+from mrdca.views import as_view_specs, build_views
+
+
+def test_memory_hit_returns_same_views(blobs):
+    cache = DissimilarityCache()
+    first = cache.get(blobs[0])
+    second = cache.get(blobs[0])
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_allclose(first[1], build_views(blobs[0])[1])
+    assert not first[0].flags.writeable
+
+
+def test_disk_hit_across_instances(blobs, tmp_path):
+    DissimilarityCache(directory=tmp_path).get(blobs[0])
+    cache = DissimilarityCache(directory=tmp_path)
+    views = cache.get(blobs[0])
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert isinstance(views[0], np.memmap)
+    np.testing.assert_allclose(views[0], build_views(blobs[0])[0])
+
+
+def test_other_data_or_metrics_miss(blobs, tmp_path):
+    cache = DissimilarityCache(directory=tmp_path)
+    cache.get(blobs[0])
+    cache.get(blobs[0] + 1.0)
+    cache.get(blobs[0], ('euclidean', 'chebyshev'))
+    cache.get(blobs[0], ('euclidean', 'cityblock'))
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert len(cache.entries()) == 3
+
+
+def test_size_cap_evicts_least_recently_used(blobs, tmp_path):
+    data = blobs[0]
+    # Cabem duas bases de uma visão, mas não três
+    cache = DissimilarityCache(directory=tmp_path, max_bytes=int(2.5 * data.shape[0] ** 2 * 8))
+    specs = as_view_specs(['euclidean'])
+    old, recent = fingerprint(data, specs), fingerprint(data + 1, specs)
+    cache.get(data, ['euclidean'])
+    cache.get(data + 1, ['euclidean'])
+    os.utime(tmp_path / old, (1, 1))
+    os.utime(tmp_path / recent, (2, 2))
+    cache.get(data + 2, ['euclidean'])
+    keys = [key for _, _, key in cache.entries()]
+    assert old not in keys and recent in keys and len(keys) == 2
+    assert cache.disk_usage() <= cache.max_bytes
+
+
+def test_clear_disk(blobs, tmp_path):
+    cache = DissimilarityCache(directory=tmp_path)
+    cache.get(blobs[0])
+    cache.clear(disk=True)
+    assert cache.entries() == [] and not cache.memory
+    cache.get(blobs[0])
+    assert cache.misses == 2
+
+
+def test_default_directory_is_per_user(monkeypatch, tmp_path):
+    monkeypatch.delenv('MRDCA_CACHE_DIR', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert default_directory() == os.path.join(str(tmp_path), 'mrdca')
+    monkeypatch.setenv('MRDCA_CACHE_DIR', str(tmp_path / 'outro'))
+    assert default_directory() == str(tmp_path / 'outro')
+
+
+def test_callable_metrics_are_keyed_by_content(blobs):
+    from sklearn.metrics.pairwise import euclidean_distances, manhattan_distances
+
+    def scaled(scale):
+        return lambda rows, cols: scale * euclidean_distances(rows, cols)
+
+    first = lambda rows, cols: euclidean_distances(rows, cols)  # noqa: E731
+    second = lambda rows, cols: manhattan_distances(rows, cols)  # noqa: E731
+    cache = DissimilarityCache()
+    views = cache.get(blobs[0], [first])
+    assert not np.allclose(cache.get(blobs[0], [second])[0], views[0])
+    cache.get(blobs[0], [scaled(2.0)])
+    cache.get(blobs[0], [scaled(2.0)])
+    cache.get(blobs[0], [scaled(3.0)])
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_edited_function_with_same_name_misses(blobs):
+    def metric(rows, cols):
+        return np.abs(rows[:, None, 0] - cols[None, :, 0])
+
+    def edited(rows, cols):
+        return np.abs(rows[:, None, 1] - cols[None, :, 1])
+
+    edited.__qualname__ = metric.__qualname__
+    assert repr(as_view_specs([metric])) != repr(as_view_specs([edited]))
+    assert fingerprint(blobs[0], as_view_specs([metric])) == fingerprint(
+        blobs[0], as_view_specs([metric]))
@@ -0,0 +1,144 @@
+"""
+engine.fit contra uma implementação de referência com laços Python.
+"""
+import numpy as np
+import pytest
+
+from mrdca import engine, pipeline
+from mrdca.backends import as_backend
+from mrdca.partition import Partition
+
+
+def reference_medoids(d_matrices, labels, n_clusters, lambdas):
+    """Medoide ponderado de cada cluster, objeto a objeto (empate: menor índice)"""
+    prototypes, objective = [], 0.0
+    for k in range(n_clusters):
+        cluster = [i for i in range(len(labels)) if labels[i] == k]
+        best, best_cost = None, float('inf')
+        for candidate in cluster:
+            cost = sum(lambdas[k][j] * d_matrix[i, candidate]
+                       for j, d_matrix in enumerate(d_matrices) for i in cluster)
+            if cost < best_cost:
+                best, best_cost = candidate, cost
+        prototypes.append(best)
+        objective += best_cost
+    return prototypes, objective
+
+
+def reference_fit(d_matrices, n_clusters, labels, max_iter=30, tol=1e-4):
+    """MRDCA-RWL com laços: pesos de produto 1, alocação e medoides ponderados"""
+    p, n = len(d_matrices), len(labels)
+    labels = list(labels)
+    prototypes, objective = reference_medoids(d_matrices, labels, n_clusters,
+                                              [[1.0] * p] * n_clusters)
+    iterations = 0
+    for iteration in range(max_iter):
+        iterations = iteration + 1
+        lambdas = []
+        for k in range(n_clusters):
+            totals = [sum(d_matrix[i, prototypes[k]] for i in range(n) if labels[i] == k)
+                      for d_matrix in d_matrices]
+            if min(totals) <= 0:
+                lambdas.append([1.0] * p)
+            else:
+                mean = np.prod(totals) ** (1 / p)
+                lambdas.append([mean / total for total in totals])
+        for i in range(n):
+            distances = [sum(lambdas[k][j] * d_matrices[j][i, prototypes[k]] for j in range(p))
+                         for k in range(n_clusters)]
+            labels[i] = distances.index(min(distances))
+        prototypes, new_objective = reference_medoids(d_matrices, labels, n_clusters, lambdas)
+        converged = objective - new_objective <= tol * abs(objective)
+        objective = new_objective
+        if converged:
+            break
+    return np.asarray(labels), np.asarray(prototypes), iterations, objective
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_fit_matches_reference_loop(d_matrices, seed):
+    init_labels = np.random.default_rng(seed).integers(0, 3, len(d_matrices[0]))
+    labels, lambdas, prototypes, iterations, objectives = engine.fit(
+        d_matrices, 3, init_labels=init_labels, use_kernel=False)
+    expected = reference_fit(d_matrices, 3, init_labels)
+
+    np.testing.assert_array_equal(labels, expected[0])
+    np.testing.assert_array_equal(prototypes, expected[1])
+    assert iterations == expected[2]
+    assert objectives[-1] == pytest.approx(expected[3])
+    np.testing.assert_allclose(lambdas.sum(axis=1), 1.0)
+
+
+def test_fit_recovers_blobs(blobs, d_matrices):
+    from sklearn.metrics import adjusted_rand_score
+
+    labels = engine.fit(d_matrices, 3, random_state=0)[0]
+    assert adjusted_rand_score(blobs[1], labels) == pytest.approx(1.0)
+
+
+def test_objective_does_not_increase(d_matrices):
+    objectives = engine.fit(d_matrices, 4, random_state=3, tol=0.0)[4]
+    assert np.all(np.diff(objectives) <= 1e-9 * objectives[0])
+
+
+def test_pipeline_steps_match_engine(d_matrices):
+    labels = np.random.default_rng(5).integers(0, 3, len(d_matrices[0]))
+    clusters = Partition(labels, 3)
+    prototypes = pipeline.select_prototypes(clusters, d_matrices)
+    lambdas = {k: pipeline.calculate_lambda(clusters[k], prototypes[k], d_matrices)
+               for k in clusters}
+
+    columns = engine.prototype_columns(as_backend(d_matrices),
+                                       [prototypes[k] for k in clusters])
+    expected = engine.compute_lambdas(columns, labels, 3)
+    np.testing.assert_allclose([lambdas[k] for k in clusters], expected)
+    assert pipeline.update_clusters(d_matrices, lambdas, prototypes) == Partition(
+        engine.assign_objects(columns, expected), 3)
+    # Pesos normalizados (soma 1, como os de mrdca_rwl) alocam igual
+    normalized = {k: engine.normalize_lambdas(np.array([lambdas[k]]))[0] for k in clusters}
+    assert pipeline.update_clusters(d_matrices, normalized, prototypes) == Partition(
+        engine.assign_objects(columns, expected), 3)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_step_api_reproduces_one_fit_iteration(d_matrices, seed):
+    init_labels = np.random.default_rng(seed).integers(0, 4, len(d_matrices[0]))
+    clusters = Partition(init_labels, 4)
+    prototypes = pipeline.select_prototypes(clusters, d_matrices)
+    lambdas = {k: pipeline.calculate_lambda(clusters[k], prototypes[k], d_matrices)
+               for k in clusters}
+    clusters = pipeline.update_clusters(d_matrices, lambdas, prototypes)
+    prototypes = pipeline.select_prototypes(clusters, d_matrices, lambdas)
+
+    labels, _, expected, _, _ = engine.fit(d_matrices, 4, max_iter=1, init_labels=init_labels,
+                                           use_kernel=False)
+    np.testing.assert_array_equal(clusters.labels, labels)
+    assert [prototypes[k] for k in clusters] == expected.tolist()
+
+
+def test_calculate_lambda_degenerate_cluster(d_matrices):
+    assert pipeline.calculate_lambda([7], 7, d_matrices) == [1.0, 1.0]
+
+
+def test_mrdca_rwl_returns_partition(d_matrices):
+    clusters, lambdas, iterations = pipeline.mrdca_rwl(d_matrices, 3, random_state=42)
+    assert isinstance(clusters, Partition)
+    assert sorted(np.concatenate(list(clusters.values())).tolist()) == list(
+        range(len(d_matrices[0])))
+    assert set(lambdas) == {1, 2, 3} and 1 <= iterations <= 30
+
+
+def test_run_single_test_uses_backend_view(monkeypatch, blobs, d_matrices):
+    import sklearn.metrics.pairwise
+
+    expected = pipeline.run_single_test(blobs[0], blobs[1], 3, 1, random_state=0,
+                                        d_matrices=d_matrices)
+
+    def forbidden(*args, **kwargs):
+        raise AssertionError("silhouette recalculou as distâncias")
+
+    monkeypatch.setattr(sklearn.metrics.pairwise, 'pairwise_distances', forbidden)
+    result = pipeline.run_single_test(blobs[0], blobs[1], 3, 1, random_state=0,
+                                      d_matrices=as_backend(d_matrices))
+    assert result['Silhouette'] == pytest.approx(expected['Silhouette'])
+    assert result['ARI'] == expected['ARI']
@@ -0,0 +1,90 @@
+"""
+Paridade entre os caminhos de engine.fit: NumPy (incremental ou não),
+núcleo compilado e alocação com limites de Elkan e Hamerly.
+"""
+import os
+import shutil
+
+import numpy as np
+import pytest
+from synthetic import make_blobs
+
+from mrdca import engine, kernel
+from mrdca.backends import DenseViews
+from mrdca.medoids import MedoidSearch
+from mrdca.views import build_views
+
+SEEDS = range(5)
+
+
+@pytest.fixture(scope='module')
+def compiled_kernel(tmp_path_factory):
+    """Núcleo já compilado ou, havendo compilador, compilado em um diretório temporário"""
+    previous = kernel._library
+    if not kernel.available():
+        if shutil.which(os.environ.get('CC', 'cc')) is None:
+            pytest.skip("sem compilador C para o núcleo")
+        output = tmp_path_factory.mktemp('kernel') / os.path.basename(kernel.LIBRARY)
+        if kernel.load(kernel.build_kernel(output=str(output))) is None:
+            pytest.skip("núcleo compilado não carregou")
+    yield kernel
+    kernel._library = previous
+
+
+@pytest.fixture(scope='module')
+def views():
+    return DenseViews(build_views(make_blobs(n_objects=150, n_clusters=4, seed=7)[0]))
+
+
+def fit_paths(views, n_clusters, seed, use_kernel):
+    """Ajuste pelo mesmo ponto de partida em cada caminho"""
+    paths = {
+        'numpy': {},
+        'numpy_sem_incremental': {'medoid_search': MedoidSearch(incremental=False)},
+        'elkan': {'assignment': 'elkan'},
+        'hamerly': {'assignment': 'hamerly'},
+    }
+    results = {name: engine.fit(views, n_clusters, random_state=seed, use_kernel=False,
+                                **params) for name, params in paths.items()}
+    if use_kernel:
+        results['nucleo'] = engine.fit(views, n_clusters, random_state=seed, use_kernel=True)
+        results['nucleo_elkan'] = engine.fit(views, n_clusters, random_state=seed,
+                                             use_kernel=True, assignment='elkan')
+    return results
+
+
+def assert_same_fit(results):
+    labels, lambdas, prototypes, iterations, objectives = results.pop('numpy')
+    for name, result in results.items():
+        np.testing.assert_array_equal(result[0], labels, err_msg=name)
+        np.testing.assert_array_equal(result[2], prototypes, err_msg=name)
+        assert result[3] == iterations, name
+        np.testing.assert_allclose(result[1], lambdas, rtol=1e-9, err_msg=name)
+        np.testing.assert_allclose(result[4], objectives, rtol=1e-9, err_msg=name)
+
+
+@pytest.mark.parametrize('n_clusters', [3, 6])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_numpy_paths_agree(views, n_clusters, seed):
+    assert_same_fit(fit_paths(views, n_clusters, seed, use_kernel=False))
+
+
+@pytest.mark.parametrize('n_clusters', [3, 6])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_kernel_matches_numpy(compiled_kernel, views, n_clusters, seed):
+    assert_same_fit(fit_paths(views, n_clusters, seed, use_kernel=True))
+
+
+def test_kernel_steps_parity(compiled_kernel):
+    data = make_blobs(n_objects=120, n_clusters=3, seed=2)[0]
+    report = kernel.check_parity({'Blobs': data}, {'Blobs': 3}, seeds=range(3), verbose=False)
+    assert all(result['OK'] for result in report)
+    assert max(result['Medoides'] for result in report) == 0
+
+
+def test_load_never_compiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(kernel, '_library', None)
+    monkeypatch.setenv('MRDCA_KERNEL_LIBRARY', str(tmp_path / 'ausente.so'))
+    assert kernel.load() is None
+    assert not any(tmp_path.iterdir())
+    assert engine.fit(build_views(make_blobs()[0]), 3, random_state=0)[3] >= 1
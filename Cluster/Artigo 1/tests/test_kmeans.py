@@ -0,0 +1,54 @@
+"""
+K-means multi-visão: estabilidade numérica dos pesos e do critério.
+"""
+import numpy as np
+import pytest
+
+from mrdca.kmeans import fit_kmeans
+
+
+@pytest.fixture
+def two_views():
+    """Duas visões com dois grupos e dispersões diferentes"""
+    rng = np.random.default_rng(0)
+    labels = np.arange(2000) % 2
+    shift = 6.0 * labels[:, None]
+    return [shift + rng.normal(size=(2000, 2)), shift + rng.normal(scale=1.2, size=(2000, 3))]
+
+
+@pytest.mark.parametrize('weights', ['cluster', 'global'])
+@pytest.mark.parametrize('offset, dtype', [(1e4, np.float64), (1e4, np.float32),
+                                           (1e6, np.float64)])
+def test_lambdas_stable_under_offset_and_float32(two_views, weights, offset, dtype):
+    reference = fit_kmeans(two_views, 2, weights=weights, random_state=0)
+    shifted = fit_kmeans([(view + offset).astype(dtype) for view in two_views], 2,
+                         weights=weights, random_state=0)
+    np.testing.assert_array_equal(shifted[0], reference[0])
+    np.testing.assert_allclose(shifted[1], reference[1], rtol=1e-4)
+    np.testing.assert_allclose(shifted[4][-1], reference[4][-1], rtol=1e-4)
+    for center, expected in zip(shifted[2], reference[2]):
+        np.testing.assert_allclose(center - offset, expected, atol=1e-2)
+
+
+def test_objective_does_not_increase(two_views):
+    objectives = fit_kmeans([(view + 1e4).astype(np.float32) for view in two_views], 4,
+                            tol=0.0, random_state=1)[4]
+    assert np.all(np.diff(objectives) <= 1e-6 * objectives[0])
+
+
+def test_chunks_and_threads_do_not_change_result(two_views):
+    reference = fit_kmeans(two_views, 3, random_state=2)
+    chunked = fit_kmeans(two_views, 3, random_state=2, chunk_rows=333, n_jobs=2)
+    np.testing.assert_array_equal(chunked[0], reference[0])
+    np.testing.assert_allclose(chunked[1], reference[1])
+
+
+@pytest.mark.parametrize('offset', [0.0, 3.3, 1e4])
+def test_zero_spread_cluster_gets_equal_weights(offset):
+    rng = np.random.default_rng(0)
+    first = np.vstack([np.full((50, 2), [5.3, -2.7]), rng.normal(size=(50, 2))])
+    second = np.vstack([rng.normal(size=(50, 3)) + 8, rng.normal(size=(50, 3))])
+    labels, lambdas = fit_kmeans([first + offset, second + offset], 2, random_state=0)[:2]
+    assert np.unique(labels[:50]).size == 1
+    np.testing.assert_array_equal(lambdas[labels[0], 0], lambdas[labels[0], 1])
+    assert lambdas[labels[-1], 0] != lambdas[labels[-1], 1]
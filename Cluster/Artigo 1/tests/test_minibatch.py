@@ -0,0 +1,38 @@
+"""
+Variante mini-batch: reservatórios e qualidade do ajuste.
+"""
+import numpy as np
+import pytest
+
+from mrdca.minibatch import fit_minibatch, reservoir_remove, reservoir_update
+
+
+def test_reservoir_fills_then_samples():
+    rng = np.random.default_rng(0)
+    reservoir, seen, filled = reservoir_update(np.empty(4, dtype=np.intp), 0, 0,
+                                               np.arange(3), rng)
+    assert (seen, filled) == (3, 3)
+    reservoir, seen, filled = reservoir_update(reservoir, seen, filled, np.arange(3, 50), rng)
+    assert (seen, filled) == (50, 4)
+    assert len(set(reservoir.tolist())) == 4 and reservoir.max() < 50
+
+
+def test_removed_objects_free_their_slots():
+    rng = np.random.default_rng(0)
+    reservoir, seen, filled = reservoir_update(np.empty(4, dtype=np.intp), 0, 0,
+                                               np.arange(4), rng)
+    filled = reservoir_remove(reservoir, filled, np.array([1, 3, 7]))
+    assert reservoir[:filled].tolist() == [0, 2]
+    # Vagas abertas pela remoção são ocupadas pelos próximos objetos
+    reservoir, seen, filled = reservoir_update(reservoir, seen, filled, np.array([8, 9]), rng)
+    assert reservoir[:filled].tolist() == [0, 2, 8, 9]
+
+
+def test_fit_minibatch_recovers_blobs(blobs, d_matrices):
+    from sklearn.metrics import adjusted_rand_score
+
+    labels, lambdas, prototypes, _, objectives = fit_minibatch(
+        d_matrices, 3, batch_size=30, reservoir_size=16, random_state=0)
+    assert adjusted_rand_score(blobs[1], labels) == pytest.approx(1.0)
+    assert len(set(prototypes.tolist())) == 3
+    np.testing.assert_allclose(lambdas.sum(axis=1), 1.0)
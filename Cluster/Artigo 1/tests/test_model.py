@@ -0,0 +1,45 @@
+"""
+Modelo ajustado: alocação de objetos novos e gravação em disco.
+"""
+import numpy as np
+import pytest
+from synthetic import half_cityblock
+
+from mrdca import pipeline
+from mrdca.cache import DissimilarityCache
+from mrdca.model import FittedModel
+from mrdca.views import ViewSpec
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    """Cache só em memória: os testes não gravam no diretório do usuário"""
+    monkeypatch.setattr(pipeline, 'dissimilarity_cache', DissimilarityCache())
+
+
+def test_predict_reproduces_training_partition(blobs):
+    model, clusters = pipeline.fit_model(blobs[0], 3, random_state=0)
+    np.testing.assert_array_equal(model.predict(blobs[0], batch_size=16), clusters.labels)
+    assert model.predict(blobs[0][0]).shape == (1,)
+
+
+def test_save_load_round_trip(blobs, tmp_path):
+    metrics = ['euclidean', ViewSpec(half_cityblock, features=[0, 2], name='meia')]
+    model, _ = pipeline.fit_model(blobs[0], 3, metrics=metrics, random_state=1)
+    path = tmp_path / 'modelo.npz'
+    model.save(path)
+    loaded = FittedModel.load(path)
+
+    np.testing.assert_array_equal(loaded.centers, model.centers)
+    np.testing.assert_allclose(loaded.lambdas, model.lambdas)
+    np.testing.assert_array_equal(loaded.prototypes, model.prototypes)
+    assert [spec.name for spec in loaded.metrics] == ['euclidean', 'meia']
+    assert loaded.metrics[1].metric is half_cityblock
+    new = blobs[0] + np.random.default_rng(0).normal(scale=0.1, size=blobs[0].shape)
+    np.testing.assert_allclose(loaded.transform(new), model.transform(new))
+
+
+def test_local_metric_is_not_saved(blobs, tmp_path):
+    model = FittedModel(blobs[0][:3], np.ones((3, 1)), [lambda rows, cols: rows @ cols.T])
+    with pytest.raises(ValueError):
+        model.save(tmp_path / 'modelo.npz')
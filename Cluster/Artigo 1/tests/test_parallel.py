@@ -0,0 +1,36 @@
+"""
+Execução multi-start em processos com visões em memória compartilhada.
+"""
+import os
+
+import numpy as np
+
+from mrdca import engine, parallel
+
+
+def fit_task(views, seed):
+    labels, _, _, _, objectives = engine.fit(views, 3, random_state=seed)
+    return {'Objetivo': float(objectives[-1]), 'Rotulos': labels,
+            'Threads': os.environ.get('OMP_NUM_THREADS')}
+
+
+def test_pool_matches_sequential(d_matrices):
+    pooled = parallel.run_seeds(fit_task, d_matrices, range(4), n_jobs=2, threads_per_worker=1)
+    sequential = parallel.run_seeds(fit_task, d_matrices, range(4), n_jobs=1)
+
+    assert [result['Objetivo'] for result in pooled] == [
+        result['Objetivo'] for result in sequential]
+    for pooled_result, sequential_result in zip(pooled, sequential):
+        np.testing.assert_array_equal(pooled_result['Rotulos'], sequential_result['Rotulos'])
+    assert all(result['Threads'] == '1' for result in pooled)
+
+
+def test_best_of_keeps_lowest_objective(d_matrices):
+    best = parallel.run_seeds(fit_task, d_matrices, range(3), n_jobs=2, best_of=True)
+    everyone = parallel.run_seeds(fit_task, d_matrices, range(3), n_jobs=1)
+    assert best['Objetivo'] == min(result['Objetivo'] for result in everyone)
+
+
+def test_views_shape_does_not_stack(d_matrices):
+    assert parallel.views_shape(d_matrices) == (2, 90, 90)
+    assert parallel.views_shape(np.stack(d_matrices)) == (2, 90, 90)
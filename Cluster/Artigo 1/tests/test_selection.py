@@ -0,0 +1,18 @@
+"""
+Varredura de K com partida a quente.
+"""
+from mrdca.selection import sweep
+
+
+def test_sweep_recommends_true_k(d_matrices):
+    result = sweep(d_matrices, k_max=6, n_init=3, patience=None)
+    assert result['K'] == 3
+    assert [entry['K'] for entry in result['Curva']] == [2, 3, 4, 5, 6]
+    assert result['Ajustes'] == 3 + 4
+
+
+def test_min_gain_prunes_small_splits(d_matrices):
+    result = sweep(d_matrices, k_max=8, n_init=1, min_gain=0.99, patience=2)
+    curve = result['Curva']
+    assert not curve[0]['Podado'] and all(entry['Podado'] for entry in curve[1:])
+    assert len(curve) == 3 and result['K'] == 2
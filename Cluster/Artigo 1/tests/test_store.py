@@ -0,0 +1,40 @@
+"""
+Armazenamento SQLite: agregação das métricas por execução e base.
+"""
+import math
+import statistics
+
+import pytest
+
+from mrdca.store import ResultsStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(str(tmp_path / 'resultados.sqlite')) as store:
+        yield store
+
+
+def test_aggregate_std_is_two_pass(store):
+    run_id = store.start_run('base')
+    # Desvio minúsculo perto de uma média grande: SUM(x^2) - SUM(x)^2 / n
+    # cancela quase todos os dígitos
+    objectives = [1e9 + 0.1, 1e9 + 0.2, 1e9 + 0.3, 1e9 + 0.4]
+    for test, objective in enumerate(objectives, 1):
+        store.add_restart(run_id, 'Iris', {'Teste': test, 'Objetivo': objective,
+                                           'ARI': 0.5 if test > 1 else None})
+    store.add_restart(run_id, 'Wine', {'Teste': 1, 'Objetivo': 7.0})
+    summary = store.aggregate(run_id, 'Iris', ('Objetivo', 'ARI', 'NMI'))
+    mean, std, low, high = summary['Objetivo']
+    assert mean == pytest.approx(statistics.mean(objectives), rel=1e-15)
+    assert std == pytest.approx(statistics.stdev(objectives), rel=1e-6)
+    assert (low, high) == (min(objectives), max(objectives))
+    assert summary['ARI'] == (0.5, 0.0, 0.5, 0.5)
+    assert summary['NMI'][0] is None and math.isnan(summary['NMI'][1])
+
+
+def test_aggregate_single_restart_has_nan_std(store):
+    run_id = store.start_run('base')
+    store.add_restart(run_id, 'Iris', {'Teste': 1, 'ARI': 0.7})
+    mean, std, low, high = store.aggregate(run_id, 'Iris', ('ARI',))['ARI']
+    assert (mean, low, high) == (0.7, 0.7, 0.7) and math.isnan(std)
@@ -0,0 +1,31 @@
+"""
+Índices de validação a partir das visões contra sklearn.metrics.
+"""
+import numpy as np
+import pytest
+from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score, silhouette_score
+
+from mrdca.monitor import IncrementalEvaluator
+from mrdca.validity import validity_indices
+
+
+@pytest.mark.parametrize('n_clusters', [2, 3, 5])
+def test_centroid_indices_match_sklearn(blobs, d_matrices, n_clusters):
+    data = blobs[0]
+    labels = np.random.default_rng(n_clusters).integers(n_clusters, size=len(data))
+    result = validity_indices(d_matrices[0], labels,
+                              ('Silhouette', 'Davies_Bouldin', 'Calinski_Harabasz'))
+    assert result['Davies_Bouldin'] == pytest.approx(davies_bouldin_score(data, labels), rel=1e-9)
+    assert result['Calinski_Harabasz'] == pytest.approx(calinski_harabasz_score(data, labels),
+                                                        rel=1e-9)
+    assert result['Silhouette'] == pytest.approx(silhouette_score(data, labels), rel=1e-9)
+
+
+def test_incremental_davies_bouldin_matches_full(blobs, d_matrices):
+    data, labels = blobs
+    evaluator = IncrementalEvaluator(d_matrices[0], labels)
+    moved = labels.copy()
+    moved[:10] = (moved[:10] + 1) % 3
+    evaluator.update(moved)
+    assert evaluator.davies_bouldin() == pytest.approx(davies_bouldin_score(data, moved),
+                                                       rel=1e-9)
@@ -1,3 +1,4 @@
+#include <algorithm>
 #include <iostream>
 #include <vector>
 #include <cmath>
@@ -12,55 +13,54 @@ double euclideanDistance(const std::vector<double>& a, const std::vector<double>
     return std::sqrt(sum);
 }
 
-// Calcular a média da distância intra-cluster
-double meanIntraClusterDistance(const std::vector<std::vector<double>>& data, 
-                                 const std::vector<int>& labels, int cluster, int pointIndex) {
-    double totalDistance = 0.0;
-    int count = 0;
+// Soma das distâncias de um ponto a cada cluster (uma única passada sobre os dados)
+void clusterDistanceSums(const std::vector<std::vector<double>>& data,
+                         const std::vector<int>& labels, int pointIndex, int k,
+                         std::vector<double>& sums, std::vector<int>& counts) {
+    sums.assign(k, 0.0);
+    counts.assign(k, 0);
 
     for (size_t i = 0; i < data.size(); ++i) {
-        if (labels[i] == cluster && i != pointIndex) {
-            totalDistance += euclideanDistance(data[pointIndex], data[i]);
-            count++;
+        if (static_cast<int>(i) != pointIndex) {
+            sums[labels[i]] += euclideanDistance(data[pointIndex], data[i]);
         }
+        counts[labels[i]]++;
     }
-
-    return count > 0 ? totalDistance / count : 0.0;
-}
-
-// Calcular a distância média para o cluster mais próximo
-double meanNearestClusterDistance(const std::vector<std::vector<double>>& data, 
-                                   const std::vector<int>& labels, int pointIndex, int currentCluster) {
-    double minDistance = std::numeric_limits<double>::max();
-
-    for (size_t c = 0; c < data.size(); ++c) {
-        if (labels[c] != currentCluster) {
-            double distance = euclideanDistance(data[pointIndex], data[c]);
-            if (distance < minDistance) {
-                minDistance = distance;
-            }
-        }
-    }
-
-    return minDistance;
 }
 
 // Calcular índice de Silhouette
 double silhouetteScore(const std::vector<std::vector<double>>& data, const std::vector<int>& labels) {
     double totalScore = 0.0;
     int n = data.size();
+    int k = 0;
+    for (int label : labels) {
+        k = std::max(k, label + 1);
+    }
 
+    std::vector<double> sums;
+    std::vector<int> counts;
     for (int i = 0; i < n; ++i) {
         int currentCluster = labels[i];
+        clusterDistanceSums(data, labels, i, k, sums, counts);
+
+        // Ponto isolado em seu cluster: silhouette 0
+        if (counts[currentCluster] == 1) {
+            continue;
+        }
 
-        // Coesão (a)
-        double a = meanIntraClusterDistance(data, labels, currentCluster, i);
+        // Coesão (a): distância média aos outros membros do cluster
+        double a = sums[currentCluster] / (counts[currentCluster] - 1);
 
-        // Separação (b)
-        double b = meanNearestClusterDistance(data, labels, i, currentCluster);
+        // Separação (b): menor distância média a outro cluster
+        double b = std::numeric_limits<double>::max();
+        for (int c = 0; c < k; ++c) {
+            if (c != currentCluster && counts[c] > 0) {
+                b = std::min(b, sums[c] / counts[c]);
+            }
+        }
 
         // Silhouette
-        double s = (b - a) / std::max(a, b);
+        double s = std::max(a, b) > 0 ? (b - a) / std::max(a, b) : 0.0;
         totalScore += s;
     }
 
@@ -8,14 +8,17 @@ partitions = [
     [[0, 2], [1, 3]]
 ]
 
-# Construir matriz de similaridade
-S = np.zeros((n, n))
-for partition in partitions:
-    for cluster in partition:
-        for i in cluster:
-            for j in cluster:
-                S[i, j] += 1
-S /= len(partitions)
+# Partições como array (m, n) de rótulos
+labels = np.zeros((len(partitions), n), dtype=int)
+for q, partition in enumerate(partitions):
+    for k, cluster in enumerate(partition):
+        labels[q, cluster] = k
+
+# Construir matriz de similaridade: S = H H^T / m, onde H (n x total de
+# clusters) indica a qual cluster de cada partição o objeto pertence.
+# Para n grande, ver mrdca.consensus (Artigo 1), que evita a matriz n x n.
+H = np.concatenate([np.eye(row.max() + 1)[row] for row in labels], axis=1)
+S = H @ H.T / len(partitions)
 
 # Aplicar k-means na matriz de similaridade
 kmeans = KMeans(n_clusters=2, random_state=0)